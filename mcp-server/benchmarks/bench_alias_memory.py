@@ -0,0 +1,121 @@
+"""Measure per-alias memory overhead of the parsed alias store.
+
+Compares the previous parser (plain dataclasses with a per-instance
+``__dict__``, reproduced below as it was) with the slotted records from
+``parse_aliases`` and the columnar ``AliasTable``. Each case runs in a
+fresh interpreter so strings interned or cached by one case can't be
+counted against, or shared with, another.
+
+Usage:
+    python benchmarks/bench_alias_memory.py [alias_count]
+"""
+
+import re
+import subprocess
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.alias_detector import AliasDetector  # noqa: E402
+
+COMMANDS = ["git status", "eza -la --icons", "rg --hidden", "docker ps", "bat --style=plain"]
+
+
+@dataclass
+class BaselineAlias:
+    """The pre-slots Alias record."""
+    name: str
+    command: str
+    category: Optional[str] = None
+    description: Optional[str] = None
+
+
+class BaselineDetector:
+    """The alias parser before slotted records, kept for comparison."""
+
+    def __init__(self, config_content: str):
+        self.config_content = config_content
+
+    def parse_aliases(self) -> Dict[str, BaselineAlias]:
+        aliases = {}
+        pattern = r"^alias\s+([a-zA-Z0-9_\-\.]+)=['\"](.+?)['\"]"
+        for line in self.config_content.split("\n"):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            match = re.match(pattern, line)
+            if match:
+                name, command = match.groups()
+                category = self._categorize_alias(name, command)
+                aliases[name] = BaselineAlias(name=name, command=command, category=category)
+        return aliases
+
+    def _categorize_alias(self, name: str, command: str) -> str:
+        name_lower = name.lower()
+        command_lower = command.lower()
+        for category, keywords in AliasDetector.CATEGORIES.items():
+            for keyword in keywords:
+                if keyword in name_lower or keyword in command_lower:
+                    return category
+        return "other"
+
+
+CASES = {
+    "baseline dataclass": lambda config: BaselineDetector(config).parse_aliases(),
+    "slotted records": lambda config: AliasDetector(config).parse_aliases(),
+    "columnar table": lambda config: AliasDetector(config).to_table(),
+}
+
+
+def make_config(count: int) -> str:
+    """Generate a config with ``count`` aliases."""
+    lines = []
+    for i in range(count):
+        lines.append(f"alias a{i}='{COMMANDS[i % len(COMMANDS)]} --opt{i}'")
+    return "\n".join(lines)
+
+
+def measure(case: str, count: int) -> int:
+    """Bytes still allocated by one case's result (run in this process)."""
+    config = make_config(count)
+    build = CASES[case]
+    # Warm up regex and category caches so only the result is counted
+    build(make_config(5))
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build(config)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del result
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+def main() -> None:
+    if sys.argv[1:2] == ["--case"]:
+        print(measure(sys.argv[2], int(sys.argv[3])))
+        return
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    results = []
+    for case in CASES:
+        out = subprocess.run(
+            [sys.executable, __file__, "--case", case, str(count)],
+            capture_output=True, text=True, check=True,
+        )
+        results.append((case, int(out.stdout)))
+
+    print(f"aliases: {count}")
+    baseline = results[0][1]
+    for label, size in results:
+        print(
+            f"{label:20s} {size / 1024:10.1f} KiB  {size / count:7.1f} B/alias  "
+            f"{100 * size / baseline:6.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
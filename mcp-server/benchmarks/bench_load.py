@@ -0,0 +1,383 @@
+"""Load-test the server by replaying MCP sessions over stdio.
+
+Two subcommands:
+
+  record  Sit between an assistant and the server as a stdio proxy and
+          save every request the assistant sends (method, params, time)
+          to a JSON-lines session file. Point the assistant's MCP config
+          at this command instead of simpleminded-mcp.
+
+  replay  Start --sessions server processes (one per simulated assistant)
+          and replay a recorded session against each, with --concurrency
+          requests in flight per session and an optional overall --rate
+          limit. With --timed the requests are instead sent at the times
+          they were recorded (scaled by --speed). Without --session a
+          built-in mix of translate_command, check_tool and resource reads
+          is used.
+
+The replay prints throughput, latency percentiles per request kind and
+the servers' resident memory over time, so leaks show up as growth
+between the first and last samples. Requests answered with a JSON-RPC
+error, isError or an {"error": ...} payload count as errors.
+
+Usage:
+    python benchmarks/bench_load.py record --out session.jsonl
+    python benchmarks/bench_load.py replay [--session session.jsonl]
+        [--sessions 4] [--concurrency 8] [--rate 200] [--repeat 20]
+        [--timed [--speed 2]] [--command "simpleminded-mcp-shim"]
+"""
+
+import argparse
+import asyncio
+import json
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+SERVER_COMMAND = [sys.executable, "-m", "src.server"]
+
+# Seconds between memory samples during a replay
+RSS_INTERVAL = 1.0
+
+DEFAULT_SESSION = [
+    {"method": "tools/call", "params": {"name": "translate_command", "arguments": {"command": "grep -rn TODO src"}}},
+    {"method": "tools/call", "params": {"name": "translate_command", "arguments": {"command": "find . -name '*.py' -mtime -1"}}},
+    {"method": "tools/call", "params": {"name": "translate_command", "arguments": {"command": "cat setup.py | grep -i version"}}},
+    {"method": "tools/call", "params": {"name": "check_tool", "arguments": {"tool_name": "rg"}}},
+    {"method": "tools/call", "params": {"name": "check_tool", "arguments": {"tool_name": "bat"}}},
+    {"method": "tools/call", "params": {"name": "search_examples", "arguments": {"query": "python files"}}},
+    {"method": "resources/read", "params": {"uri": "simpleminded://tools/status"}},
+    {"method": "resources/read", "params": {"uri": "simpleminded://aliases/page?limit=50"}},
+    {"method": "resources/read", "params": {"uri": "simpleminded://config/info"}},
+    {"method": "tools/list", "params": {}},
+]
+
+
+def request_kind(request: Dict) -> str:
+    """Label for grouping latencies: the tool name, resource URI or method."""
+    params = request.get("params") or {}
+    if request["method"] == "tools/call":
+        return f"tool {params.get('name')}"
+    if request["method"] == "resources/read":
+        return f"read {str(params.get('uri', '')).partition('?')[0]}"
+    return request["method"]
+
+
+def load_session(path: Optional[str]) -> List[Dict]:
+    """Requests of a recorded session, or the built-in mix."""
+    if not path:
+        return DEFAULT_SESSION
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def rss_kb(pid: int) -> Optional[int]:
+    """Resident set size of a process in KB."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        out = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)], capture_output=True, text=True)
+        return int(out.stdout.strip())
+    except (OSError, ValueError):
+        return None
+
+
+def record(out: str, command: List[str]) -> None:
+    """Proxy stdio to the server, saving the client's requests."""
+    server = subprocess.Popen(command, cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0)
+    start = time.monotonic()
+
+    def forward_responses():
+        for line in server.stdout:
+            sys.stdout.buffer.write(line)
+            sys.stdout.buffer.flush()
+
+    threading.Thread(target=forward_responses, daemon=True).start()
+    with open(out, "a") as log:
+        for line in sys.stdin.buffer:
+            server.stdin.write(line)
+            server.stdin.flush()
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            # The handshake is redone by replay; notifications get no response
+            if "id" in message and message.get("method") not in (None, "initialize"):
+                log.write(json.dumps({
+                    "t": round(time.monotonic() - start, 3),
+                    "method": message["method"],
+                    "params": message.get("params", {}),
+                }) + "\n")
+                log.flush()
+    server.stdin.close()
+    server.wait()
+
+
+class Session:
+    """One stdio connection to a server process."""
+
+    def __init__(self, command: List[str]):
+        self.command = command
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._reader: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the server and complete the MCP handshake."""
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            cwd=ROOT,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=64 * 1024 * 1024,
+        )
+        self._reader = asyncio.create_task(self._read())
+        await self.call("initialize", {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "bench_load", "version": "0"},
+        })
+        self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    def _send(self, message: Dict) -> None:
+        self.process.stdin.write(json.dumps(message).encode() + b"\n")
+
+    async def _read(self) -> None:
+        """Resolve pending requests as responses arrive."""
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            future = self._pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(message)
+        for future in self._pending.values():
+            future.set_exception(RuntimeError("server exited"))
+
+    async def call(self, method: str, params: Dict) -> Dict:
+        """Send a request and wait for its response."""
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        await self.process.stdin.drain()
+        return await future
+
+    async def close(self) -> None:
+        """Stop the server."""
+        self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), 5)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+        self._reader.cancel()
+
+
+class RateLimiter:
+    """Space request starts evenly at a fixed overall rate."""
+
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(self._next, now) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def is_error(response: Dict) -> bool:
+    """Whether a response is a failure, including tools' {"error": ...} payloads."""
+    if "error" in response:
+        return True
+    result = response.get("result") or {}
+    if result.get("isError"):
+        return True
+    for item in result.get("content") or result.get("contents") or []:
+        text = item.get("text")
+        if not text or not text.lstrip().startswith("{"):
+            continue
+        try:
+            payload = json.loads(text)
+        except ValueError:
+            continue
+        if isinstance(payload, dict) and "error" in payload:
+            return True
+    return False
+
+
+async def send(session: Session, request: Dict, latencies: Dict[str, List[float]],
+               errors: Dict[str, int]) -> None:
+    """Send one request and record its latency and outcome."""
+    kind = request_kind(request)
+    start = time.perf_counter()
+    response = await session.call(request["method"], request.get("params") or {})
+    latencies[kind].append(time.perf_counter() - start)
+    if is_error(response):
+        errors[kind] += 1
+
+
+async def replay_session(session: Session, requests: List[Dict], concurrency: int,
+                         limiter: RateLimiter, latencies: Dict[str, List[float]],
+                         errors: Dict[str, int]) -> None:
+    """Send requests with up to concurrency in flight."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    async def worker():
+        while not queue.empty():
+            request = queue.get_nowait()
+            await limiter.wait()
+            await send(session, request, latencies, errors)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def timeline(requests: List[Dict], repeat: int) -> List[Dict]:
+    """Recorded requests repeated back to back, with "t" offset per pass."""
+    length = max(request["t"] for request in requests) if requests else 0.0
+    return [
+        {**request, "t": request["t"] + n * length}
+        for n in range(repeat)
+        for request in requests
+    ]
+
+
+async def replay_timed(session: Session, requests: List[Dict], speed: float,
+                       latencies: Dict[str, List[float]], errors: Dict[str, int]) -> None:
+    """Send each request at its recorded time, divided by speed."""
+    start = time.monotonic()
+
+    async def at_recorded_time(request):
+        await asyncio.sleep(max(0.0, start + request["t"] / speed - time.monotonic()))
+        await send(session, request, latencies, errors)
+
+    await asyncio.gather(*(at_recorded_time(request) for request in requests))
+
+
+async def sample_memory(sessions: List[Session], samples: List[tuple], start: float) -> None:
+    """Record total server RSS every RSS_INTERVAL seconds."""
+    while True:
+        total = sum(rss_kb(s.process.pid) or 0 for s in sessions)
+        samples.append((time.monotonic() - start, total))
+        await asyncio.sleep(RSS_INTERVAL)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+async def replay(args) -> None:
+    """Replay a session against several servers and print a report."""
+    if args.timed:
+        requests = timeline(load_session(args.session), args.repeat)
+    else:
+        requests = load_session(args.session) * args.repeat
+    command = shlex.split(args.command) if args.command else SERVER_COMMAND
+    sessions = [Session(command) for _ in range(args.sessions)]
+    await asyncio.gather(*(s.start() for s in sessions))
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    samples: List[tuple] = []
+    limiter = RateLimiter(args.rate)
+    start = time.monotonic()
+    sampler = asyncio.create_task(sample_memory(sessions, samples, start))
+    try:
+        if args.timed:
+            await asyncio.gather(*(
+                replay_timed(s, requests, args.speed, latencies, errors) for s in sessions
+            ))
+        else:
+            await asyncio.gather(*(
+                replay_session(s, requests, args.concurrency, limiter, latencies, errors)
+                for s in sessions
+            ))
+    finally:
+        elapsed = time.monotonic() - start
+        samples.append((elapsed, sum(rss_kb(s.process.pid) or 0 for s in sessions)))
+        sampler.cancel()
+        await asyncio.gather(*(s.close() for s in sessions))
+
+    total = sum(len(v) for v in latencies.values())
+    pacing = (f"timed at {args.speed:g}x" if args.timed else
+              f"concurrency: {args.concurrency}  rate: {args.rate or 'unlimited'}/s")
+    print(f"sessions: {args.sessions}  {pacing}  requests: {total}")
+    print(f"throughput: {total / elapsed:.1f} req/s over {elapsed:.1f} s")
+    print(f"\n{'request':<40} {'count':>6} {'errors':>6} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    everything = [v for values in latencies.values() for v in values]
+    errors["all"] = sum(errors.values())
+    for kind, values in sorted(latencies.items()) + [("all", everything)]:
+        if not values:
+            continue
+        print(f"{kind[:40]:<40} {len(values):6d} {errors.get(kind, 0):6d} "
+              f"{percentile(values, 50) * 1000:8.2f} {percentile(values, 90) * 1000:8.2f} "
+              f"{percentile(values, 99) * 1000:8.2f} {max(values) * 1000:8.2f}")
+
+    print("\nserver RSS (all sessions):")
+    for elapsed_at, kb in samples:
+        print(f"  {elapsed_at:6.1f} s  {kb / 1024:8.1f} MB")
+    if len(samples) >= 2 and samples[0][1]:
+        growth = samples[-1][1] - samples[0][1]
+        print(f"growth: {growth / 1024:+.1f} MB ({growth / samples[0][1] * 100:+.1f}%)")
+    if errors["all"]:
+        print(f"\n{errors['all']} requests returned errors")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="mode", required=True)
+
+    record_parser = commands.add_parser("record", help="proxy stdio and save the client's requests")
+    record_parser.add_argument("--out", required=True, help="session file to append to")
+    record_parser.add_argument("--command", help="server command (default: python -m src.server)")
+
+    replay_parser = commands.add_parser("replay", help="replay a session against fresh servers")
+    replay_parser.add_argument("--session", help="recorded session (default: built-in mix)")
+    replay_parser.add_argument("--sessions", type=int, default=4, help="server processes / simulated assistants")
+    replay_parser.add_argument("--concurrency", type=int, default=8, help="requests in flight per session")
+    replay_parser.add_argument("--rate", type=float, help="overall requests per second (default: unlimited)")
+    replay_parser.add_argument("--timed", action="store_true",
+                               help="send requests at their recorded times (needs --session)")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="time scale for --timed")
+    replay_parser.add_argument("--repeat", type=int, default=20, help="times to replay the session")
+    replay_parser.add_argument("--command", help="server command (default: python -m src.server)")
+    args = parser.parse_args()
+    if args.mode == "replay" and args.timed and not args.session:
+        parser.error("--timed needs a recorded --session")
+    if args.mode == "replay" and args.speed <= 0:
+        parser.error("--speed must be positive")
+
+    if args.mode == "record":
+        record(args.out, shlex.split(args.command) if args.command else SERVER_COMMAND)
+    else:
+        asyncio.run(replay(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Measure per-call logging overhead on the request path.
+
+Compares, for a tool call whose arguments hold a script of --arg-kb KB:
+  - eager: the old setup, logging.basicConfig and an f-string with the
+    full arguments, written to stderr in the calling thread
+  - queued: setup_logging() with extra= fields and short() arguments;
+    formatting and the write happen in the listener thread
+  - sampled: queued, with SIMPLEMINDED_LOG_SAMPLE=tools=100
+  - disabled: queued, with the tools category at WARNING
+
+Output goes to /dev/null so only the logging cost is measured. Times are
+for the calling thread; "drain" is how long the listener then takes to
+write out what was queued.
+
+Usage:
+    python benchmarks/bench_logging.py [--calls N] [--arg-kb KB]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.structured_logging import get_logger, setup_logging, short  # noqa: E402
+
+
+def reset_logging() -> None:
+    """Remove root handlers and category settings left by the previous case."""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    tools = get_logger("tools")
+    tools.setLevel(logging.NOTSET)
+    for log_filter in list(tools.filters):
+        tools.removeFilter(log_filter)
+
+
+def bench_eager(devnull, arguments: dict, calls: int) -> float:
+    """Seconds per call with basicConfig and an eager f-string."""
+    reset_logging()
+    logging.basicConfig(level=logging.INFO, stream=devnull)
+    logger = logging.getLogger("src.server")
+    name = "translate_command"
+    start = time.perf_counter()
+    for _ in range(calls):
+        logger.info(f"Calling tool: {name} with arguments: {arguments}")
+    return (time.perf_counter() - start) / calls
+
+
+def bench_queued(devnull, arguments: dict, calls: int, env: dict) -> tuple:
+    """(seconds per call, drain seconds) through the queue listener."""
+    reset_logging()
+    os.environ.update(env)
+    try:
+        listener = setup_logging(devnull)
+    finally:
+        for key in env:
+            del os.environ[key]
+    tool_log = get_logger("tools")
+    name = "translate_command"
+    start = time.perf_counter()
+    for _ in range(calls):
+        tool_log.info("Calling tool", extra={"tool": name, "arguments": short(arguments)})
+    per_call = (time.perf_counter() - start) / calls
+    drain_start = time.perf_counter()
+    listener.stop()
+    return per_call, time.perf_counter() - drain_start
+
+
+def main():
+    """Run each case and print per-call times."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--arg-kb", type=int, default=16)
+    args = parser.parse_args()
+
+    script = ("grep -rn pattern . | sort | uniq -c\n" * (args.arg_kb * 1024 // 36 + 1))
+    arguments = {"command": script[:args.arg_kb * 1024]}
+
+    with open(os.devnull, "w") as devnull:
+        results = [("eager", bench_eager(devnull, arguments, args.calls), None)]
+        for label, env in [
+            ("queued", {}),
+            ("sampled", {"SIMPLEMINDED_LOG_SAMPLE": "tools=100"}),
+            ("disabled", {"SIMPLEMINDED_LOG_LEVELS": "tools=warning"}),
+        ]:
+            per_call, drain = bench_queued(devnull, arguments, args.calls, env)
+            results.append((label, per_call, drain))
+
+    print(f"{args.calls} calls, {args.arg_kb} KB of arguments each")
+    print(f"{'case':<10} {'us/call':>9} {'drain ms':>9}")
+    for label, per_call, drain in results:
+        drain_text = f"{drain * 1000:9.1f}" if drain is not None else f"{'-':>9}"
+        print(f"{label:<10} {per_call * 1e6:9.2f} {drain_text}")
+
+
+if __name__ == "__main__":
+    main()
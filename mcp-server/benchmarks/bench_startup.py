@@ -0,0 +1,125 @@
+"""Measure server time-to-first-response over stdio.
+
+Starts ``python -m src.server`` repeatedly and times:
+  - initialize: process spawn until the initialize response arrives
+  - first call: process spawn until the first tools/call response arrives
+
+With --record, the medians are appended to startup_history.jsonl together
+with the package version so regressions show up across releases.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--record]
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HISTORY = Path(__file__).resolve().parent / "startup_history.jsonl"
+
+
+def package_version() -> str:
+    """Read the version from pyproject.toml."""
+    match = re.search(r'^version = "([^"]+)"', (ROOT / "pyproject.toml").read_text(), re.M)
+    return match.group(1) if match else "unknown"
+
+
+def send(proc: subprocess.Popen, message: dict) -> None:
+    """Write one JSON-RPC message."""
+    proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+
+
+def read_response(proc: subprocess.Popen, request_id: int) -> dict:
+    """Read messages until the response to ``request_id``."""
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError("server exited before responding")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def run_once() -> tuple:
+    """Start the server once; returns (initialize_ms, first_call_ms)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.server"],
+        cwd=ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        send(proc, {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "bench_startup", "version": "0"},
+            },
+        })
+        read_response(proc, 1)
+        initialized = time.perf_counter()
+
+        send(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        send(proc, {
+            "jsonrpc": "2.0",
+            "id": 2,
+            "method": "tools/call",
+            "params": {"name": "translate_command", "arguments": {"command": "grep -r foo ."}},
+        })
+        read_response(proc, 2)
+        first_call = time.perf_counter()
+    finally:
+        proc.stdin.close()
+        proc.terminate()
+        proc.wait()
+
+    return (initialized - start) * 1000, (first_call - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--record", action="store_true", help=f"append results to {HISTORY.name}")
+    args = parser.parse_args()
+
+    run_once()  # warm the filesystem cache and .pyc files
+    results = [run_once() for _ in range(args.runs)]
+    initialize = statistics.median(r[0] for r in results)
+    first_call = statistics.median(r[1] for r in results)
+
+    print(f"runs: {args.runs}")
+    print(f"initialize response: {initialize:8.1f} ms (median)")
+    print(f"first tool response: {first_call:8.1f} ms (median)")
+
+    if args.record:
+        entry = {
+            "version": package_version(),
+            "python": platform.python_version(),
+            "platform": sys.platform,
+            "timestamp": int(time.time()),
+            "runs": args.runs,
+            "initialize_ms": round(initialize, 1),
+            "first_call_ms": round(first_call, 1),
+        }
+        with open(HISTORY, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        print(f"recorded in {os.path.relpath(HISTORY)}")
+
+
+if __name__ == "__main__":
+    main()
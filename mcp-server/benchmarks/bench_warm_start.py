@@ -0,0 +1,63 @@
+"""Compare cold (parse) and warm (snapshot cache) config loading.
+
+Usage:
+    python benchmarks/bench_warm_start.py [alias_count] [repeat]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.alias_detector import AliasDetector  # noqa: E402
+from src.snapshot_cache import SnapshotCache  # noqa: E402
+
+
+def make_config(count: int) -> str:
+    """Generate a config with ``count`` aliases and count/10 functions."""
+    lines = [f"alias a{i}='git log --oneline -n {i}'" for i in range(count)]
+    for i in range(count // 10):
+        lines += [f"fn{i}() {{", f'    echo "{i}" "$@"', "}"]
+    return "\n".join(lines) + "\n"
+
+
+def best_of(repeat: int, fn) -> float:
+    """Best wall time of ``repeat`` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / ".zshrc"
+        config_path.write_text(make_config(count))
+        cache = SnapshotCache(Path(tmp) / "cache")
+
+        def cold():
+            detector = AliasDetector(config_path.read_text(), source=str(config_path))
+            detector.parse_aliases()
+            detector.parse_functions()
+
+        def warm():
+            cache.get_detector(config_path, config_path.read_text())
+
+        cache.get_detector(config_path, config_path.read_text())
+        cold_ms = best_of(repeat, cold)
+        warm_ms = best_of(repeat, warm)
+
+    print(f"aliases: {count}, functions: {count // 10}")
+    print(f"cold (parse):          {cold_ms:8.2f} ms")
+    print(f"warm (snapshot cache): {warm_ms:8.2f} ms  ({cold_ms / warm_ms:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
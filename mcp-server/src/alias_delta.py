@@ -0,0 +1,156 @@
+"""Track alias changes between consecutive detector snapshots."""
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .alias_detector import AliasDetector
+
+
+@dataclass(slots=True)
+class AliasDelta:
+    """Changes from one generation to the next.
+
+    Aliases carry their new command; functions only report names, since
+    clients can fetch the bodies they care about.
+    """
+    generation: int
+    added: Dict[str, str] = field(default_factory=dict)
+    removed: List[str] = field(default_factory=list)
+    changed: Dict[str, str] = field(default_factory=dict)
+    functions_added: List[str] = field(default_factory=list)
+    functions_removed: List[str] = field(default_factory=list)
+    functions_changed: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        """Check whether nothing changed."""
+        return not (self.added or self.removed or self.changed or self.functions_added
+                    or self.functions_removed or self.functions_changed)
+
+
+def _diff(old: Dict[str, str], new: Dict[str, str]) -> Tuple[Dict[str, str], List[str], Dict[str, str]]:
+    """Diff two name -> value maps into added, removed and changed."""
+    added = {name: value for name, value in new.items() if name not in old}
+    removed = sorted(name for name in old if name not in new)
+    changed = {
+        name: value
+        for name, value in new.items()
+        if name in old and old[name] != value
+    }
+    return added, removed, changed
+
+
+def compute_delta(
+    old: Optional[AliasDetector],
+    new: Optional[AliasDetector],
+    generation: int,
+) -> AliasDelta:
+    """Compute the delta between two detector snapshots."""
+    old_aliases = {n: a.command for n, a in old.parse_aliases().items()} if old else {}
+    new_aliases = {n: a.command for n, a in new.parse_aliases().items()} if new else {}
+    old_functions = {n: f.body for n, f in old.parse_functions().items()} if old else {}
+    new_functions = {n: f.body for n, f in new.parse_functions().items()} if new else {}
+
+    added, removed, changed = _diff(old_aliases, new_aliases)
+    functions_added, functions_removed, functions_changed = _diff(old_functions, new_functions)
+    return AliasDelta(
+        generation=generation,
+        added=added,
+        removed=removed,
+        changed=changed,
+        functions_added=sorted(functions_added),
+        functions_removed=functions_removed,
+        functions_changed=sorted(functions_changed),
+    )
+
+
+class AliasChangeTracker:
+    """Number alias snapshots by generation and keep recent deltas.
+
+    Safe to share between threads: updates and reads hold the same lock.
+    """
+
+    def __init__(self, detector: Optional[AliasDetector] = None, history: int = 64):
+        """Start at generation 0 with an optional initial snapshot."""
+        self.generation = 0
+        self._detector = detector
+        self._deltas: Deque[AliasDelta] = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def update(self, detector: Optional[AliasDetector]) -> Optional[AliasDelta]:
+        """Record a new snapshot; returns its delta, or None if nothing changed."""
+        with self._lock:
+            delta = compute_delta(self._detector, detector, self.generation + 1)
+            self._detector = detector
+            if delta.is_empty():
+                return None
+
+            self.generation = delta.generation
+            self._deltas.append(delta)
+            return delta
+
+    def changes_since(self, generation: int) -> Dict:
+        """Get the net changes after a generation.
+
+        When the requested generation is older than the retained history, or
+        newer than the current one (it came from before a server restart),
+        the result has ``reset`` set and the client should re-read the full list.
+        """
+        with self._lock:
+            return self._changes_since(generation)
+
+    def _changes_since(self, generation: int) -> Dict:
+        """Fold the retained deltas; the caller holds the lock."""
+        result = {
+            "generation": self.generation,
+            "since": generation,
+            "reset": False,
+            "added": {},
+            "removed": [],
+            "changed": {},
+            "functions": {"added": [], "removed": [], "changed": []},
+        }
+        if generation == self.generation:
+            return result
+        if generation > self.generation or generation < 0 or not self._deltas or self._deltas[0].generation > generation + 1:
+            result["reset"] = True
+            return result
+
+        # Fold consecutive deltas into one net change per name
+        aliases: Dict[str, Tuple[str, Optional[str]]] = {}
+        functions: Dict[str, str] = {}
+        for delta in self._deltas:
+            if delta.generation <= generation:
+                continue
+            for name, command in delta.added.items():
+                state = aliases.get(name, ("",))[0]
+                aliases[name] = ("changed" if state == "removed" else "added", command)
+            for name in delta.removed:
+                if aliases.get(name, ("",))[0] == "added":
+                    del aliases[name]
+                else:
+                    aliases[name] = ("removed", None)
+            for name, command in delta.changed.items():
+                state = aliases.get(name, ("",))[0]
+                aliases[name] = ("added" if state == "added" else "changed", command)
+
+            for name in delta.functions_added:
+                functions[name] = "changed" if functions.get(name) == "removed" else "added"
+            for name in delta.functions_removed:
+                if functions.get(name) == "added":
+                    del functions[name]
+                else:
+                    functions[name] = "removed"
+            for name in delta.functions_changed:
+                if functions.get(name) != "added":
+                    functions[name] = "changed"
+
+        for name, (state, command) in sorted(aliases.items()):
+            if state == "removed":
+                result["removed"].append(name)
+            else:
+                result[state][name] = command
+        for name, state in sorted(functions.items()):
+            result["functions"][state].append(name)
+        return result
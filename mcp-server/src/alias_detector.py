@@ -1,25 +1,40 @@
 """Detect and parse shell aliases from configuration."""
 
 import re
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+import sys
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+from dataclasses import dataclass, field
 
 
-@dataclass
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a short, frequently repeated string (category, command word)."""
+    return sys.intern(value) if value else value
+
+
+def command_word(command: str) -> str:
+    """Return the interned leading word of a command string."""
+    parts = command.split(maxsplit=1)
+    return sys.intern(parts[0]) if parts else ""
+
+
+@dataclass(slots=True)
 class Alias:
     """Represents a shell alias."""
     name: str
     command: str
     category: Optional[str] = None
     description: Optional[str] = None
+    source: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ShellFunction:
     """Represents a shell function."""
     name: str
     body: str
     description: Optional[str] = None
+    source: Optional[str] = None
 
 
 class AliasDetector:
@@ -40,56 +55,105 @@ class AliasDetector:
         "utility": ["extract", "backup", "sizeof", "trash", "rm"],
     }
 
-    def __init__(self, config_content: str):
-        """Initialize with configuration content."""
+    # Match: alias name='command' or alias name="command"
+    ALIAS_PATTERN = r"^[ \t]*alias[ \t]+([a-zA-Z0-9_\-\.]+)=['\"](.+?)['\"]"
+
+    # Match function definition: function_name() { or function function_name {
+    FUNCTION_PATTERN = r"^(?:function\s+)?([a-zA-Z0-9_\-]+)\s*\(\)\s*\{?"
+
+    # Compiled on first parse rather than at import
+    _compiled: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def _patterns(cls) -> Dict[str, Any]:
+        """Get the compiled alias, function and per-category patterns."""
+        if cls._compiled is None:
+            cls._compiled = {
+                "alias": re.compile(cls.ALIAS_PATTERN, re.M),
+                "function": re.compile(cls.FUNCTION_PATTERN),
+                # One alternation per category, checked in CATEGORIES order
+                "categories": [
+                    (category, re.compile("|".join(re.escape(keyword) for keyword in keywords)))
+                    for category, keywords in cls.CATEGORIES.items()
+                ],
+            }
+        return cls._compiled
+
+    def __init__(self, config_content: str, source: Optional[str] = None):
+        """Initialize with configuration content and optional source file path."""
         self.config_content = config_content
+        self.source = _intern(source)
         self._aliases: Optional[Dict[str, Alias]] = None
         self._functions: Optional[Dict[str, ShellFunction]] = None
+        self._alias_names: Optional[List[str]] = None
+        self._function_names: Optional[List[str]] = None
+        # Parsing happens once per detector even when threads race to it
+        self._parse_lock = threading.Lock()
+
+    @classmethod
+    def from_parsed(
+        cls,
+        aliases: Dict[str, Alias],
+        functions: Dict[str, ShellFunction],
+    ) -> "AliasDetector":
+        """Create a detector over already parsed aliases and functions.
+
+        Aliases without a category are categorized in place.
+        """
+        detector = cls("")
+        for alias in aliases.values():
+            if alias.category is None:
+                alias.category = _intern(detector._categorize_alias(alias.name, alias.command))
+        detector._aliases = aliases
+        detector._functions = functions
+        return detector
 
     def parse_aliases(self) -> Dict[str, Alias]:
         """Parse all aliases from configuration."""
         if self._aliases is not None:
             return self._aliases
+        with self._parse_lock:
+            if self._aliases is None:
+                self._aliases = self._parse_aliases()
+        return self._aliases
 
+    def _parse_aliases(self) -> Dict[str, Alias]:
+        """Scan the config content for aliases."""
         aliases = {}
 
-        # Match: alias name='command' or alias name="command"
-        pattern = r"^alias\s+([a-zA-Z0-9_\-\.]+)=['\"](.+?)['\"]"
-
-        for line in self.config_content.split("\n"):
-            line = line.strip()
-
-            # Skip comments and empty lines
-            if not line or line.startswith("#"):
-                continue
-
-            match = re.match(pattern, line)
-            if match:
-                name, command = match.groups()
-                category = self._categorize_alias(name, command)
-                aliases[name] = Alias(
-                    name=name,
-                    command=command,
-                    category=category
-                )
+        # A single multiline scan; comment lines never match the anchored pattern
+        for match in self._patterns()["alias"].finditer(self.config_content):
+            name, command = match.groups()
+            category = self._categorize_alias(name, command)
+            aliases[name] = Alias(
+                name=name,
+                command=command,
+                category=_intern(category),
+                source=self.source,
+            )
 
-        self._aliases = aliases
         return aliases
 
     def parse_functions(self) -> Dict[str, ShellFunction]:
         """Parse shell functions from configuration."""
         if self._functions is not None:
             return self._functions
+        with self._parse_lock:
+            if self._functions is None:
+                self._functions = self._parse_functions()
+        return self._functions
 
+    def _parse_functions(self) -> Dict[str, ShellFunction]:
+        """Scan the config content for function definitions."""
         functions = {}
+        function_pattern = self._patterns()["function"]
         lines = self.config_content.split("\n")
         i = 0
 
         while i < len(lines):
             line = lines[i].strip()
 
-            # Match function definition: function_name() { or function function_name {
-            func_match = re.match(r"^(?:function\s+)?([a-zA-Z0-9_\-]+)\s*\(\)\s*\{?", line)
+            func_match = "(" in line and function_pattern.match(line)
 
             if func_match:
                 name = func_match.group(1)
@@ -106,12 +170,12 @@ class AliasDetector:
 
                 functions[name] = ShellFunction(
                     name=name,
-                    body="\n".join(body_lines)
+                    body="\n".join(body_lines),
+                    source=self.source,
                 )
             else:
                 i += 1
 
-        self._functions = functions
         return functions
 
     def _categorize_alias(self, name: str, command: str) -> str:
@@ -119,10 +183,9 @@ class AliasDetector:
         name_lower = name.lower()
         command_lower = command.lower()
 
-        for category, keywords in self.CATEGORIES.items():
-            for keyword in keywords:
-                if keyword in name_lower or keyword in command_lower:
-                    return category
+        for category, pattern in self._patterns()["categories"]:
+            if pattern.search(name_lower) or pattern.search(command_lower):
+                return category
 
         return "other"
 
@@ -151,6 +214,18 @@ class AliasDetector:
         functions = self.parse_functions()
         return functions.get(name)
 
+    def get_sorted_alias_names(self) -> List[str]:
+        """Get alias names in sorted order (for cursor pagination)."""
+        if self._alias_names is None:
+            self._alias_names = sorted(self.parse_aliases())
+        return self._alias_names
+
+    def get_sorted_function_names(self) -> List[str]:
+        """Get function names in sorted order (for cursor pagination)."""
+        if self._function_names is None:
+            self._function_names = sorted(self.parse_functions())
+        return self._function_names
+
     def search_aliases(self, query: str) -> Dict[str, Alias]:
         """Search aliases by name or command."""
         all_aliases = self.parse_aliases()
@@ -162,6 +237,10 @@ class AliasDetector:
             if query_lower in name.lower() or query_lower in alias.command.lower()
         }
 
+    def to_table(self) -> "AliasTable":
+        """Build a columnar table of all parsed aliases."""
+        return AliasTable.from_aliases(self.parse_aliases().values())
+
     def to_dict(self) -> Dict:
         """Convert all parsed data to dictionary format."""
         return {
@@ -170,6 +249,7 @@ class AliasDetector:
                     "name": alias.name,
                     "command": alias.command,
                     "category": alias.category,
+                    "source": alias.source,
                 }
                 for name, alias in self.parse_aliases().items()
             },
@@ -177,8 +257,66 @@ class AliasDetector:
                 name: {
                     "name": func.name,
                     "body": func.body,
+                    "source": func.source,
                 }
                 for name, func in self.parse_functions().items()
             },
             "categories": self.get_all_categories(),
         }
+
+
+@dataclass(slots=True)
+class AliasTable:
+    """Columnar alias storage: parallel arrays instead of one object per alias.
+
+    Categories and command words are interned, so for large configs each row
+    costs a few list slots plus the unique name and command strings.
+    """
+    names: List[str] = field(default_factory=list)
+    commands: List[str] = field(default_factory=list)
+    categories: List[Optional[str]] = field(default_factory=list)
+    words: List[str] = field(default_factory=list)
+    _index: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_aliases(cls, aliases: Iterable[Alias]) -> "AliasTable":
+        """Build a table from alias records."""
+        table = cls()
+        for alias in aliases:
+            table.add(alias.name, alias.command, alias.category)
+        return table
+
+    def add(self, name: str, command: str, category: Optional[str] = None) -> None:
+        """Append or replace a row."""
+        row = self._index.get(name)
+        if row is None:
+            self._index[name] = len(self.names)
+            self.names.append(name)
+            self.commands.append(command)
+            self.categories.append(_intern(category))
+            self.words.append(command_word(command))
+        else:
+            self.commands[row] = command
+            self.categories[row] = _intern(category)
+            self.words[row] = command_word(command)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def get(self, name: str) -> Optional[Alias]:
+        """Materialize a single row as an Alias."""
+        row = self._index.get(name)
+        if row is None:
+            return None
+        return Alias(
+            name=self.names[row],
+            command=self.commands[row],
+            category=self.categories[row],
+        )
+
+    def rows_with_word(self, word: str) -> List[str]:
+        """Names of aliases whose command starts with the given word."""
+        return [name for name, w in zip(self.names, self.words) if w == word]
@@ -0,0 +1,229 @@
+"""Suggest new aliases for command prefixes that recur in shell history."""
+
+import heapq
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from .history_analyzer import default_history_files, iter_history
+
+# Prefixes tracked by the sketch; bounds memory whatever the history size
+SKETCH_CAPACITY = 4096
+
+# Longest prefix considered, in words
+MAX_PREFIX_WORDS = 3
+
+# Shorter prefixes aren't worth an alias
+MIN_PREFIX_LENGTH = 5
+
+# A prefix is dropped in favor of a longer one that follows it this often
+EXTENSION_SHARE = 0.8
+
+# Words that end a command prefix: operators and arguments unlikely to repeat
+_STOP_CHARS = set("|&;<>'\"$`(){}")
+
+
+class SpaceSaving:
+    """Approximate counts of the most frequent keys in fixed memory.
+
+    The Space-Saving algorithm: at most ``capacity`` keys are tracked, and a
+    new key replaces the one with the smallest count, inheriting that count
+    as its possible overestimate. Any key seen more than n/capacity times is
+    guaranteed to be tracked. The smallest counter is found through a heap
+    whose entries may lag behind their true counts; a stale entry is re-pushed
+    when it surfaces, so each add is O(log capacity) amortized.
+    """
+
+    def __init__(self, capacity: int = SKETCH_CAPACITY):
+        """Initialize with the number of keys to track."""
+        self.capacity = capacity
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self._heap: List[Tuple[int, Hashable]] = []
+
+    def add(self, key: Hashable) -> None:
+        """Count one occurrence of a key."""
+        counts = self.counts
+        if key in counts:
+            counts[key] += 1
+            return
+        if len(counts) < self.capacity:
+            counts[key] = 1
+            self.errors[key] = 0
+            heapq.heappush(self._heap, (1, key))
+            return
+
+        heap = self._heap
+        while True:
+            count, smallest = heap[0]
+            if counts[smallest] == count:
+                break
+            heapq.heapreplace(heap, (counts[smallest], smallest))
+        del counts[smallest]
+        del self.errors[smallest]
+        counts[key] = count + 1
+        self.errors[key] = count
+        heapq.heapreplace(heap, (count + 1, key))
+
+    def guaranteed(self, key: Hashable) -> int:
+        """Lower bound on a key's true count (0 if untracked)."""
+        return self.counts.get(key, 0) - self.errors.get(key, 0)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+
+def command_prefixes(command: str, max_words: int = MAX_PREFIX_WORDS) -> List[str]:
+    """Leading word sequences of a command's first stage, shortest first.
+
+    The prefix stops before operators, quoted strings and expansions, so
+    ``git commit -m "fix"`` yields ``git``, ``git commit`` and ``git commit -m``.
+    """
+    words: List[str] = []
+    for word in command.split(None, max_words)[:max_words]:
+        if _STOP_CHARS.intersection(word) or "\n" in word:
+            break
+        words.append(word)
+    return [" ".join(words[:n]) for n in range(1, len(words) + 1)]
+
+
+def suggest_name(prefix: str, taken: Set[str]) -> Optional[str]:
+    """Short name for a prefix: its word initials, lengthened until it's free."""
+    words = [word.lstrip("-") or word for word in prefix.split()]
+    base = "".join(word[0] for word in words)
+    last = words[-1]
+    candidates = [base] + [base[:-1] + last[:n] for n in range(2, len(last) + 1)]
+    candidates += [f"{base}{n}" for n in range(2, 10)]
+    for name in candidates:
+        if len(name) >= len(prefix):
+            break
+        if name.isidentifier() and name not in taken and not shutil.which(name):
+            return name
+    return None
+
+
+class AliasMiner:
+    """Mine shell history for frequent command prefixes without an alias.
+
+    Prefixes of up to three words are counted in a Space-Saving sketch while
+    the history files are streamed, so memory stays bounded however long the
+    history is. Like the history analyzer, the offset reached in each file
+    is kept, so appended entries are added to the sketch without rereading
+    the rest; a sketch can't forget counts, so it is rebuilt only when a file
+    is replaced, truncated or removed.
+    """
+
+    def __init__(self, paths: Optional[List[Path]] = None, capacity: int = SKETCH_CAPACITY):
+        """Initialize with history files (default: detected) and sketch size."""
+        self.paths = [Path(path) for path in paths] if paths is not None else default_history_files()
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._sketch: Optional[SpaceSaving] = None
+        self._entries = 0
+        # path -> (inode, offset read up to)
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+
+    def _file_states(self) -> Dict[str, Tuple[int, int]]:
+        """(inode, size) of each history file that exists."""
+        states = {}
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            states[str(path)] = (stat.st_ino, stat.st_size)
+        return states
+
+    def count(self) -> Tuple[SpaceSaving, int]:
+        """Sketch of prefix counts and the number of entries read."""
+        with self._lock:
+            states = self._file_states()
+            rewritten = self._sketch is None or any(
+                path not in states
+                or states[path][0] != inode
+                or states[path][1] < offset
+                for path, (inode, offset) in self._offsets.items()
+            )
+            if rewritten:
+                self._sketch, self._entries, self._offsets = SpaceSaving(self.capacity), 0, {}
+
+            sketch = self._sketch
+            for path, (inode, size) in states.items():
+                offset = self._offsets.get(path, (inode, 0))[1]
+                if offset == size:
+                    continue
+                for command, offset in iter_history(Path(path), offset):
+                    self._entries += 1
+                    for prefix in command_prefixes(command):
+                        sketch.add(prefix)
+                    self._offsets[path] = (inode, offset)
+                self._offsets.setdefault(path, (inode, 0))
+            return sketch, self._entries
+
+    def suggest(self, detector=None, limit: int = 10, min_count: int = 3) -> Dict:
+        """Rank new aliases by the keystrokes they would have saved.
+
+        Prefixes already covered by an alias in the detector's config (an
+        alias whose command is the prefix or a leading part of it), or typed
+        through an alias, are skipped.
+        """
+        sketch, entries = self.count()
+
+        taken: Set[str] = set()
+        covered: Set[str] = set()
+        if detector is not None:
+            table = detector.to_table()
+            taken.update(table.names)
+            taken.update(detector.parse_functions())
+            covered.update(" ".join(command.split()) for command in table.commands)
+
+        counts = {
+            prefix: sketch.guaranteed(prefix)
+            for prefix in sketch.counts
+            if len(prefix) >= MIN_PREFIX_LENGTH
+        }
+        # Prefer "git commit -m" over "git commit" when one nearly always
+        # leads to the other
+        extended = set()
+        for prefix, count in counts.items():
+            parent = prefix.rpartition(" ")[0]
+            if parent in counts and count >= counts[parent] * EXTENSION_SHARE:
+                extended.add(parent)
+
+        ranked = []
+        for prefix, count in counts.items():
+            if count < min_count or prefix in extended:
+                continue
+            words = prefix.split()
+            if words[0] in taken:
+                continue
+            if any(" ".join(words[:n]) in covered for n in range(1, len(words) + 1)):
+                continue
+            ranked.append((count * (len(prefix) - len(words)), count, prefix))
+        ranked.sort(reverse=True)
+
+        suggestions = []
+        for _, count, prefix in ranked:
+            if len(suggestions) >= limit:
+                break
+            name = suggest_name(prefix, taken)
+            if name is None:
+                continue
+            taken.add(name)
+            suggestions.append({
+                "name": name,
+                "command": prefix,
+                "count": count,
+                "keystrokes_saved": count * (len(prefix) - len(name)),
+                "definition": f"alias {name}='{prefix}'",
+            })
+        suggestions.sort(key=lambda s: s["keystrokes_saved"], reverse=True)
+
+        return {
+            "files": [str(path) for path in self.paths],
+            "entries": entries,
+            "prefixes_tracked": len(sketch),
+            "suggestions": suggestions,
+        }
@@ -0,0 +1,225 @@
+"""Check aliases and functions against the executables actually installed."""
+
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .translation_engine import Token, split_stages, tokenize, wrapped_command
+
+# Commands the shell provides itself, so they need no executable
+SHELL_BUILTINS = frozenset("""
+    . : [ alias autoload bg bind bindkey builtin cd command compdef declare dirs disown echo
+    emulate enable eval exec exit export false fc fg functions getopts hash help history jobs
+    kill let local logout popd print printf pushd pwd read readonly rehash return set setopt
+    shift shopt source suspend test times trap true type typeset ulimit umask unalias unset
+    unsetopt wait whence where which zle zmodload zstyle
+""".split())
+
+
+# Builtins that only set variables; a function's real command comes after them
+DECLARATIONS = frozenset({"declare", "export", "local", "readonly", "typeset"})
+
+
+def _command_word(words: List[Token]) -> Optional[str]:
+    """The command a stage's words run, or None if it can't be known statically."""
+    i = wrapped_command([token.value for token in words])
+    if i >= len(words):
+        return None
+    token = words[i]
+    if not token.value or token.raw[0] in "$`({!" or token.value[0] in "$`":
+        return None
+    return token.value
+
+
+def leading_command(command: str) -> Optional[str]:
+    """The command a shell line runs first, or None if it can't be known statically.
+
+    The line is split with the translator's tokenizer, so quoted and escaped
+    words stay whole and lose their quotes. Variable assignments and wrappers
+    like ``sudo -u root`` or ``noglob`` are skipped, option values included.
+    """
+    try:
+        tokens = tokenize(command)
+    except ValueError:
+        return None
+    return _command_word(split_stages(tokens)[0][0])
+
+
+def function_command(body: str) -> Optional[str]:
+    """The first command in a function body (after ``name() {``).
+
+    Stages that only assign or declare variables (``x=1``, ``local dir=$1``)
+    are passed over, so the command the function is built around is found.
+    """
+    _, brace, rest = body.partition("{")
+    for line in (rest if brace else body).splitlines():
+        try:
+            tokens = tokenize(line)
+        except ValueError:
+            # A quoted string spanning lines: what follows isn't code
+            return None
+        for words, _ in split_stages(tokens):
+            values = [token.value for token in words]
+            i = wrapped_command(values)
+            if i >= len(values) or values[i] in DECLARATIONS or values[i] == "}":
+                continue
+            return _command_word(words)
+    return None
+
+
+class PathIndex:
+    """Executables on $PATH by name, listed once per $PATH change.
+
+    Each PATH directory is read with a single scandir; the first directory
+    that has a name wins, as in the shell. The listing is redone only when
+    $PATH or one of its directories' mtimes changes.
+    """
+
+    def __init__(self):
+        self._signature: Optional[Tuple] = None
+        self._names: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _current_signature() -> Tuple:
+        """$PATH directories and their mtimes."""
+        signature = []
+        for directory in os.environ.get("PATH", "").split(os.pathsep):
+            try:
+                signature.append((directory, os.stat(directory).st_mtime_ns))
+            except OSError:
+                signature.append((directory, None))
+        return tuple(signature)
+
+    def refresh(self) -> None:
+        """Re-list $PATH if it changed."""
+        signature = self._current_signature()
+        with self._lock:
+            if signature == self._signature:
+                return
+            names: Dict[str, str] = {}
+            for directory, mtime in signature:
+                if mtime is None:
+                    continue
+                try:
+                    with os.scandir(directory) as it:
+                        for entry in it:
+                            if entry.name not in names:
+                                names[entry.name] = entry.path
+                except OSError:
+                    continue
+            self._names = names
+            self._signature = signature
+
+    def lookup(self, name: str) -> Optional[str]:
+        """Path of an executable, or None."""
+        if "/" in name:
+            path = os.path.expanduser(name)
+            return path if os.path.isfile(path) and os.access(path, os.X_OK) else None
+        path = self._names.get(name)
+        if path and os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+        return None
+
+
+class AliasValidator:
+    """Find aliases and functions that are broken, shadowing or redundant.
+
+    Every alias and function is reduced to the command it runs first, and all
+    of them are resolved in one pass against shell builtins, the config's own
+    aliases and functions, the PATH index, and ToolChecker's status for the
+    tools it tracks. No process is started per alias.
+    """
+
+    # Alias chains longer than this are treated as loops
+    MAX_ALIAS_DEPTH = 10
+
+    def __init__(self, tool_checker, path_index: Optional[PathIndex] = None):
+        """Initialize with a ToolChecker."""
+        self.tool_checker = tool_checker
+        self.path_index = path_index or PathIndex()
+
+    def _resolve(self, target: str, name: str, aliases: Dict[str, str],
+                 functions: Dict, tools: Dict) -> Optional[str]:
+        """Where target comes from after following aliases, or None if it is missing."""
+        seen = {name}
+        while target in aliases and target not in seen and len(seen) < self.MAX_ALIAS_DEPTH:
+            seen.add(target)
+            next_target = leading_command(aliases[target])
+            if next_target is None:
+                return f"alias {target}"
+            target = next_target
+        if target in SHELL_BUILTINS:
+            return "builtin"
+        if target in functions and target != name:
+            return f"function {target}"
+        info = tools.get(target)
+        if info is not None and info.installed:
+            return info.path
+        return self.path_index.lookup(target)
+
+    def validate(self, detector) -> Dict:
+        """Report broken, shadowing and redundant aliases and functions."""
+        self.path_index.refresh()
+        aliases = {name: alias.command for name, alias in detector.parse_aliases().items()}
+        functions = detector.parse_functions()
+
+        targets: Dict[Tuple[str, str], Optional[str]] = {}
+        for name, command in aliases.items():
+            targets[("alias", name)] = leading_command(command)
+        for name, function in functions.items():
+            targets[("function", name)] = function_command(function.body)
+
+        # One batched ToolChecker probe covers every tracked tool that is used
+        tracked = set(self.tool_checker.SIMPLEMINDED_TOOLS)
+        tools = self.tool_checker.check_all_tools() if tracked & set(targets.values()) else {}
+
+        broken, shadowing, redundant, unchecked = [], [], [], []
+        for (kind, name), target in sorted(targets.items()):
+            command = aliases[name] if kind == "alias" else None
+            if target is None:
+                unchecked.append(name)
+                continue
+
+            resolved = self._resolve(target, name, aliases, functions, tools)
+            if resolved is None:
+                entry = {"name": name, "kind": kind, "target": target}
+                if command is not None:
+                    entry["command"] = command
+                install = self.tool_checker.get_installation_command(target)
+                if install:
+                    entry["install_command"] = install
+                broken.append(entry)
+
+            if kind == "alias":
+                shadowed = self.path_index.lookup(name)
+                if shadowed and target != name:
+                    shadowing.append({
+                        "name": name,
+                        "command": command,
+                        "shadows": shadowed,
+                        "target_installed": resolved is not None,
+                    })
+                if command.strip() == name:
+                    redundant.append({"name": name, "reason": f"expands to itself ({command!r})"})
+                if name in functions:
+                    redundant.append({"name": name, "reason": "function of the same name is hidden by this alias"})
+
+        by_command: Dict[str, List[str]] = {}
+        for name, command in aliases.items():
+            by_command.setdefault(" ".join(command.split()), []).append(name)
+        for command, names in sorted(by_command.items()):
+            if len(names) > 1:
+                for name in sorted(names)[1:]:
+                    redundant.append({
+                        "name": name,
+                        "reason": f"same command as alias {sorted(names)[0]} ({command!r})",
+                    })
+
+        return {
+            "checked": len(targets) - len(unchecked),
+            "broken": broken,
+            "shadowing": shadowing,
+            "redundant": redundant,
+            "unchecked": unchecked,
+        }
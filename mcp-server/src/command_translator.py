@@ -1,17 +1,28 @@
 """Translate traditional Unix commands to modern simpleminded-shell equivalents."""
 
 import re
-from typing import Dict, Optional, List, Tuple
-from dataclasses import dataclass
+from typing import Dict, Optional, List, Sequence, Tuple
+from dataclasses import dataclass, field
 
+from .translation_engine import (
+    Token,
+    TranslationEngine,
+    UntranslatableError,
+    split_stages,
+    tokenize,
+    wrapped_command,
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class Translation:
     """Represents a command translation."""
     original: str
     modern: str
     explanation: str
     tool: str
+    unsupported_flags: List[str] = field(default_factory=list)
+    rules: List[str] = field(default_factory=list)
 
 
 class CommandTranslator:
@@ -25,36 +36,185 @@ class CommandTranslator:
         "ls": "eza",
     }
 
-    # Flag translations for common patterns
+    # Flag translations per source command, compiled into the translation
+    # engine. Templates: "" drops the flag, "{}" is the flag's value as
+    # written, "{name}" converts the value (see translation_engine.CONVERTERS).
+    # find's -name/-iname/-exec are handled by the engine itself.
     FLAG_TRANSLATIONS = {
         "cat": {
-            "-n": "--number",  # bat uses --number for line numbers
+            "-n": "--number",
+            "--number": "--number",
+            "-A": "--show-all",
+            "--show-all": "--show-all",
+            "-s": "--squeeze-blank",
+            "--squeeze-blank": "--squeeze-blank",
+            "-u": "",  # unbuffered is the default
         },
         "grep": {
             "-r": "",  # rg is recursive by default
-            "-i": "-i",  # case insensitive
-            "-v": "-v",  # invert match
+            "-R": "",
+            "--recursive": "",
+            "--dereference-recursive": "-L",
+            "-i": "-i",
+            "--ignore-case": "-i",
+            "-v": "-v",
+            "--invert-match": "-v",
             "-c": "--count",
+            "--count": "--count",
             "-l": "--files-with-matches",
-            "-n": "-n",  # line numbers (default in rg)
-            "-w": "-w",  # word regexp
-            "-E": "",  # rg uses regex by default
-            "--include": "--type",  # Different syntax
+            "--files-with-matches": "--files-with-matches",
+            "-L": "--files-without-match",
+            "--files-without-match": "--files-without-match",
+            "-n": "-n",
+            "--line-number": "-n",
+            "-w": "-w",
+            "--word-regexp": "-w",
+            "-x": "-x",
+            "--line-regexp": "-x",
+            "-o": "-o",
+            "--only-matching": "-o",
+            "-q": "-q",
+            "--quiet": "-q",
+            "-s": "--no-messages",
+            "--no-messages": "--no-messages",
+            "-h": "--no-filename",  # rg -h is --help
+            "--no-filename": "--no-filename",
+            "-H": "--with-filename",
+            "--with-filename": "--with-filename",
+            "-a": "-a",
+            "--text": "-a",
+            "-I": "",  # rg skips binary files by default
+            "-E": "",  # rg uses extended regex by default
+            "--extended-regexp": "",
+            "-F": "-F",
+            "--fixed-strings": "-F",
+            "-P": "-P",
+            "--perl-regexp": "-P",
+            "-e": "-e {}",
+            "--regexp": "-e {}",
+            "-f": "-f {}",
+            "--file": "-f {}",
+            "-m": "-m {}",
+            "--max-count": "-m {}",
+            "-A": "-A {}",
+            "--after-context": "-A {}",
+            "-B": "-B {}",
+            "--before-context": "-B {}",
+            "-C": "-C {}",
+            "--context": "-C {}",
+            "--color": "--color {}",
+            "--colour": "--color {}",
+            "--include": "-g {}",
+            "--exclude": "{negglob}",
+            "--exclude-dir": "{negdir}",
         },
         "find": {
-            "-name": "",  # fd doesn't need -name
-            "-type f": "-t f",
-            "-type d": "-t d",
-            "-iname": "-i",  # case insensitive
+            "-type": "-t {}",
+            "-maxdepth": "-d {}",
+            "-mindepth": "--min-depth {}",
+            "-mtime": "{days}",
+            "-mmin": "{minutes}",
+            "-size": "{size}",
+            "-empty": "-t e",
+            "-executable": "-t x",
+            "-follow": "-L",
+            "-L": "-L",
+            "-print": "",
+            "-print0": "-0",
         },
         "ls": {
-            "-la": "ll",  # Common alias
             "-l": "-l",
             "-a": "-a",
-            "-h": "-h",
-        }
+            "--all": "-a",
+            "-A": "-A",
+            "--almost-all": "-A",
+            "-h": "",  # eza shows human-readable sizes by default
+            "--human-readable": "",
+            "-1": "-1",
+            "-d": "-d",
+            "--directory": "-d",
+            "-R": "-R",
+            "--recursive": "-R",
+            "-r": "-r",
+            "--reverse": "-r",
+            # ls lists newest and largest first; eza sorts ascending
+            "-t": "--sort=modified --reverse",
+            "-S": "--sort=size --reverse",
+            "-X": "--sort=extension",
+            "-F": "-F",
+            "--classify": "-F",
+            "-i": "--inode",
+            "--inode": "--inode",
+        },
+    }
+
+    # Binary each source command becomes, and the tool name reported
+    TARGETS = {
+        "cat": ("bat", "bat"),
+        "find": ("fd", "fd"),
+        "grep": ("rg", "ripgrep"),
+        "ls": ("eza", "eza"),
+    }
+
+    # Explanations for translation rules, by rule id ("<command> <flag>")
+    RULE_NOTES = {
+        "grep -r": "ripgrep is recursive by default",
+        "grep -R": "ripgrep is recursive by default",
+        "grep --recursive": "ripgrep is recursive by default",
+        "grep -i": "Case-insensitive ripgrep search",
+        "grep --include": "Filter files with a glob (-g)",
+        "grep --exclude": "Exclude files with a negated glob",
+        "grep --exclude-dir": "Exclude directories with a negated glob",
+        "grep -h": "rg -h is help, use --no-filename",
+        "find -name": "Match the whole file name with a glob (-g)",
+        "find -iname": "Use -i for case-insensitive names",
+        "find -type": "Specify file type with -t",
+        "find -mtime": "Filter by modification time with --changed-within/--changed-before",
+        "find -mmin": "Filter by modification time with --changed-within/--changed-before",
+        "find -exec": "Run a command per result with -x (-X for batches)",
+        "find -maxdepth": "Limit depth with -d",
+        "cat -n": "bat shows line numbers with --number",
+        "ls ll": "Use ll alias for detailed listing",
+    }
+
+    # Rules whose target only approximates the source: different output
+    # columns or formatting, parallel (unordered) -exec, other rounding
+    APPROXIMATE_RULES = {
+        "cat -n", "cat --number", "cat -A", "cat --show-all",
+        "grep -c", "grep --count",  # rg prints nothing for files without matches
+        "find -exec", "find -execdir",  # fd runs commands in parallel, in the search root
+        "find -size",
+        "ls -l", "ls ll", "ls -i", "ls --inode", "ls -F", "ls --classify",
+    }
+
+    # Flags that make targets see the files the source command would, and
+    # print plainly; added when translating for exact use (scripts)
+    EXACT_FLAGS = {
+        "grep": ["-uu"],
+        "find": ["--hidden", "--no-ignore"],
+        "cat": ["-pp"],
+    }
+
+    # Equivalent spellings to fall back to when the installed version of a
+    # tool doesn't list a flag
+    FLAG_FALLBACKS = {
+        "rg": {
+            "--count": "-c",
+            "--files-with-matches": "-l",
+            "--type": "-t",
+        },
+        "fd": {
+            "--type": "-t",
+            "--extension": "-e",
+        },
+        "bat": {
+            "--number": "-n",
+        },
     }
 
+    # fd flags whose following words are a command run per result
+    EXEC_FLAGS = {"-x", "--exec", "-X", "--exec-batch"}
+
     COMMON_PATTERNS = [
         # grep patterns
         (
@@ -79,8 +239,8 @@ class CommandTranslator:
         # find patterns
         (
             r"find\s+\.\s+-name\s+['\"](.+?)['\"]",
-            r'fd "\1"',
-            "fd doesn't need -name flag",
+            r'fd -g "\1"',
+            "Match the whole file name with a glob (-g)",
             "fd"
         ),
         (
@@ -91,7 +251,7 @@ class CommandTranslator:
         ),
         (
             r"find\s+\.\s+-name\s+['\"](.+?)['\"].*-type\s+f",
-            r'fd -t f "\1"',
+            r'fd -t f -g "\1"',
             "Specify file type with -t",
             "fd"
         ),
@@ -119,12 +279,102 @@ class CommandTranslator:
         ),
     ]
 
+    def __init__(self, flag_index=None, use_aliases: bool = True, exact: bool = False):
+        """Initialize with an optional FlagIndex to validate translated flags.
+
+        Set use_aliases to False when translating scripts, where aliases
+        such as ``ll`` aren't available, and exact to add EXACT_FLAGS so
+        hidden and ignored files are still searched.
+        """
+        self.flag_index = flag_index
+        self.engine = TranslationEngine(
+            self.FLAG_TRANSLATIONS, self.TARGETS, self.RULE_NOTES, use_aliases=use_aliases,
+            approximate=self.APPROXIMATE_RULES, exact_flags=self.EXACT_FLAGS if exact else None,
+        )
+
     def translate(self, command: str) -> Optional[Translation]:
-        """Translate a traditional command to modern equivalent."""
+        """Translate a traditional command to modern equivalent.
+
+        With a flag index, flags the installed tools don't accept are
+        swapped for a listed equivalent or reported in unsupported_flags.
+        """
+        translation = self._translate(command)
+        if translation and self.flag_index is not None:
+            self._check_flags(translation)
+        return translation
+
+    def _check_flags(self, translation: Translation) -> None:
+        """Validate the flags of each pipeline stage against the flag index."""
+        modern = translation.modern
+        try:
+            tokens = tokenize(modern)
+        except ValueError:
+            return
+        edits: List[Tuple[int, int, str]] = []
+        for words, _ in split_stages(tokens):
+            while words:
+                start = wrapped_command([token.value for token in words])
+                words = words[start:]
+                if not words:
+                    break
+                words = self._check_command_flags(translation, words, edits)
+
+        for start, end, replacement in reversed(edits):
+            modern = modern[:start] + replacement + modern[end:]
+        translation.modern = modern
+
+    def _check_command_flags(self, translation: Translation, words: Sequence[Token],
+                             edits: List[Tuple[int, int, str]]) -> Sequence[Token]:
+        """Check one command's flags; returns the words of a command it runs, if any."""
+        tool = words[0].value
+        for index, token in enumerate(words[1:], 1):
+            word = token.value
+            if word == "--":
+                break
+            if tool == "fd" and word in self.EXEC_FLAGS:
+                return words[index + 1:]
+            if not word.startswith("-") or word == "-":
+                continue
+            if word in translation.unsupported_flags:
+                continue
+            if self.flag_index.supports(tool, word) is not False:
+                continue
+            flag = word.split("=", 1)[0]
+            fallback = self.FLAG_FALLBACKS.get(tool, {}).get(flag)
+            if fallback and self.flag_index.supports(tool, fallback):
+                # Short flags take their value as the next word, not after "="
+                if "=" in word and not fallback.startswith("--"):
+                    replacement = f"{fallback} {token.raw.split('=', 1)[1]}"
+                else:
+                    replacement = fallback + token.raw[len(flag):]
+                edits.append((token.start, token.end, replacement))
+            else:
+                translation.unsupported_flags.append(word)
+        return []
+
+    def _translate(self, command: str) -> Optional[Translation]:
+        """Translate with the flag engine, falling back to whole-command patterns."""
         command = command.strip()
 
-        # Try pattern matching first
-        for pattern, replacement, explanation, tool in self.COMMON_PATTERNS:
+        try:
+            result = self.engine.translate(command)
+        except UntranslatableError:
+            # A rewrite would change what the command does
+            return None
+        except ValueError:
+            # Unbalanced quotes; the regex patterns may still apply
+            result = None
+        if result is not None:
+            return Translation(
+                original=command,
+                modern=result.modern,
+                explanation="; ".join(result.notes),
+                tool=result.tool,
+                unsupported_flags=list(result.unsupported),
+                rules=result.rules,
+            )
+
+        for index, (pattern, replacement, explanation, tool) in enumerate(self.COMMON_PATTERNS):
             match = re.match(pattern, command)
             if match:
                 modern_cmd = re.sub(pattern, replacement, command)
@@ -132,7 +382,8 @@ class CommandTranslator:
                     original=command,
                     modern=modern_cmd,
                     explanation=explanation,
-                    tool=tool
+                    tool=tool,
+                    rules=[f"pattern {index}"],
                 )
 
         # Try simple command replacement
@@ -145,7 +396,8 @@ class CommandTranslator:
                     original=command,
                     modern=modern_cmd,
                     explanation=f"Use {self.REPLACEMENTS[cmd]} instead of {cmd}",
-                    tool=self.REPLACEMENTS[cmd]
+                    tool=self.REPLACEMENTS[cmd],
+                    rules=[f"replace {cmd}"],
                 )
 
         return None
@@ -0,0 +1,148 @@
+"""Discover aliases across every shell config file and merge them."""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .alias_detector import Alias, AliasDetector, ShellFunction
+from .config_parser import ShellConfigParser
+from .snapshot_cache import SnapshotCache
+
+
+@dataclass(slots=True)
+class ConfigSource:
+    """Aliases and functions parsed from a single config file."""
+    path: str
+    aliases: Dict[str, Alias]
+    functions: Dict[str, ShellFunction]
+    is_simpleminded: bool = False
+    size: int = 0
+    parser: Optional[ShellConfigParser] = None
+
+
+@dataclass(slots=True)
+class MergedConfig:
+    """Aliases and functions merged from several config files.
+
+    Precedence follows the order of the searched paths: a definition from an
+    earlier file wins, and the files it shadowed are listed in
+    ``overridden_aliases`` / ``overridden_functions``.
+    """
+    sources: List[ConfigSource] = field(default_factory=list)
+    aliases: Dict[str, Alias] = field(default_factory=dict)
+    functions: Dict[str, ShellFunction] = field(default_factory=dict)
+    overridden_aliases: Dict[str, List[str]] = field(default_factory=dict)
+    overridden_functions: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def primary_path(self) -> Optional[str]:
+        """Path of the highest-precedence simpleminded config, if any."""
+        for source in self.sources:
+            if source.is_simpleminded:
+                return source.path
+        return self.sources[0].path if self.sources else None
+
+    @property
+    def primary_parser(self) -> ShellConfigParser:
+        """Parser for the simpleminded config, reusing the content already read.
+
+        Matches what ``ShellConfigParser()`` would detect, without reading
+        every candidate file a second time.
+        """
+        for source in self.sources:
+            if source.is_simpleminded and source.parser is not None:
+                return source.parser
+        return ShellConfigParser.from_content(None, "")
+
+    def detector(self) -> AliasDetector:
+        """Get an AliasDetector over the merged aliases and functions."""
+        return AliasDetector.from_parsed(self.aliases, self.functions)
+
+    def get_sources_info(self) -> List[Dict]:
+        """Describe every config file that contributed definitions."""
+        return [
+            {
+                "path": source.path,
+                "is_simpleminded": source.is_simpleminded,
+                "alias_count": len(source.aliases),
+                "function_count": len(source.functions),
+                "config_size": source.size,
+            }
+            for source in self.sources
+        ]
+
+
+def _load_source(path: Path, cache: Optional[SnapshotCache] = None) -> Optional[ConfigSource]:
+    """Read and parse one config file; None if it is missing or unreadable."""
+    parser = ShellConfigParser(str(path))
+    if not parser.config_path:
+        return None
+
+    content = parser.get_raw_config()
+    if cache is not None:
+        detector = cache.get_detector(path, content)
+    else:
+        detector = AliasDetector(content, source=str(path))
+    return ConfigSource(
+        path=str(path),
+        aliases=detector.parse_aliases(),
+        functions=detector.parse_functions(),
+        is_simpleminded=parser.is_simpleminded_shell(),
+        size=len(content),
+        parser=parser,
+    )
+
+
+def merge_sources(sources: Sequence[ConfigSource]) -> MergedConfig:
+    """Merge parsed sources, earlier sources taking precedence."""
+    merged = MergedConfig(sources=list(sources))
+
+    for source in sources:
+        for name, alias in source.aliases.items():
+            if name in merged.aliases:
+                merged.overridden_aliases.setdefault(name, []).append(source.path)
+            else:
+                merged.aliases[name] = alias
+        for name, func in source.functions.items():
+            if name in merged.functions:
+                merged.overridden_functions.setdefault(name, []).append(source.path)
+            else:
+                merged.functions[name] = func
+
+    return merged
+
+
+def discover_configs(
+    paths: Optional[Sequence[str]] = None,
+    max_workers: Optional[int] = None,
+    cache: Optional[SnapshotCache] = None,
+) -> MergedConfig:
+    """Scan all candidate config files concurrently and merge their aliases.
+
+    Candidates default to ``ShellConfigParser.CONFIG_PATHS``. Duplicate paths
+    (e.g. a symlinked ``~/.config/zsh/.zshrc``) are only parsed once. With a
+    snapshot cache, unchanged files are loaded from it instead of re-parsed.
+    """
+    candidates: List[Path] = []
+    seen = set()
+    for raw in paths if paths is not None else ShellConfigParser.CONFIG_PATHS:
+        path = Path(raw).expanduser()
+        try:
+            key = path.resolve()
+        except OSError:
+            key = path
+        if key not in seen:
+            seen.add(key)
+            candidates.append(path)
+
+    if len(candidates) <= 1:
+        loaded = [_load_source(path, cache) for path in candidates]
+    else:
+        # File reads release the GIL, so the candidates overlap their I/O;
+        # results keep the candidate order so precedence stays deterministic.
+        workers = max_workers or len(candidates)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            loaded = list(executor.map(lambda path: _load_source(path, cache), candidates))
+
+    return merge_sources([source for source in loaded if source is not None])
@@ -25,6 +25,14 @@ class ShellConfigParser:
         self.config_path = self._detect_config(config_path)
         self.config_content = self._read_config()
 
+    @classmethod
+    def from_content(cls, config_path: Optional[Path], content: str) -> "ShellConfigParser":
+        """Create a parser over a config that was already read."""
+        parser = cls.__new__(cls)
+        parser.config_path = config_path
+        parser.config_content = content
+        return parser
+
     def _detect_config(self, provided_path: Optional[str]) -> Optional[Path]:
         """Auto-detect shell config file."""
         if provided_path:
@@ -0,0 +1,243 @@
+"""Serve MCP sessions from one long-lived process over a Unix socket.
+
+Every stdio session normally starts a fresh server that rebuilds its caches.
+The daemon keeps a single server (tool status, parsed configs, indexes) warm
+and runs each socket connection as its own MCP session; ``simpleminded-mcp-shim``
+bridges an assistant's stdio to it. The wire format is the same as stdio:
+one JSON-RPC message per line, optionally preceded by a ``{"cwd": ...}``
+line giving the client's working directory, which tools resolve relative
+paths against.
+"""
+
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .snapshot_cache import default_cache_dir
+from .structured_logging import get_logger, setup_logging
+
+logger = get_logger("daemon")
+
+# Longest line accepted from a client (a JSON-RPC message)
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+def default_socket_path() -> Path:
+    """Socket path: $SIMPLEMINDED_SOCKET, else under $XDG_RUNTIME_DIR or the cache dir."""
+    if os.environ.get("SIMPLEMINDED_SOCKET"):
+        return Path(os.environ["SIMPLEMINDED_SOCKET"]).expanduser()
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "simpleminded-shell.sock"
+    return default_cache_dir() / "daemon.sock"
+
+
+async def read_preamble(buffered) -> Tuple[Optional[str], Optional[bytes]]:
+    """Read a connection's first line: (client cwd, None) if it is the shim's
+    preamble, else (None, the line) so it is handled as a message."""
+    import anyio
+
+    try:
+        line = await buffered.receive_until(b"\n", MAX_MESSAGE_BYTES)
+    except (anyio.EndOfStream, anyio.IncompleteRead):
+        return None, None
+    try:
+        preamble = json.loads(line)
+    except ValueError:
+        return None, line
+    if isinstance(preamble, dict) and "jsonrpc" not in preamble and isinstance(preamble.get("cwd"), str):
+        return preamble["cwd"], None
+    return None, line
+
+
+@asynccontextmanager
+async def socket_streams(stream, buffered=None, first_line: Optional[bytes] = None):
+    """Adapt a byte stream to the message streams ``Server.run`` expects.
+
+    Mirrors ``mcp.server.stdio.stdio_server`` with the socket in place of
+    stdin/stdout. ``buffered`` and ``first_line`` carry on from a preamble
+    already read from the stream.
+    """
+    import anyio
+    import anyio.lowlevel
+    import mcp.types as types
+    from anyio.streams.buffered import BufferedByteReceiveStream
+    from mcp.shared.message import SessionMessage
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+    if buffered is None:
+        buffered = BufferedByteReceiveStream(stream)
+
+    async def socket_reader():
+        line = first_line
+        try:
+            async with read_stream_writer:
+                while True:
+                    if line is None:
+                        try:
+                            line = await buffered.receive_until(b"\n", MAX_MESSAGE_BYTES)
+                        except (anyio.EndOfStream, anyio.IncompleteRead):
+                            break
+                    line, pending = None, line
+                    if not pending.strip():
+                        continue
+                    try:
+                        message = types.JSONRPCMessage.model_validate_json(pending)
+                    except Exception as exc:
+                        await read_stream_writer.send(exc)
+                        continue
+                    await read_stream_writer.send(SessionMessage(message))
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            await anyio.lowlevel.checkpoint()
+
+    async def socket_writer():
+        try:
+            async with write_stream_reader:
+                async for session_message in write_stream_reader:
+                    data = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
+                    await stream.send(data.encode() + b"\n")
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            await anyio.lowlevel.checkpoint()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(socket_reader)
+        tg.start_soon(socket_writer)
+        yield read_stream, write_stream
+
+
+class Daemon:
+    """Accept socket connections and run an MCP session for each.
+
+    With an idle timeout the daemon exits once no session has been connected
+    for that many seconds, so an auto-started daemon doesn't linger forever.
+    """
+
+    def __init__(self, socket_path: Optional[Path] = None, idle_timeout: float = 0):
+        """Initialize with a socket path and idle timeout in seconds (0 = never)."""
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.idle_timeout = idle_timeout
+        self.sessions = 0
+        self.total_sessions = 0
+        self._last_active = time.monotonic()
+
+    def _remove_stale_socket(self) -> None:
+        """Remove a socket file left behind by a daemon that died."""
+        import socket
+
+        if not self.socket_path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except OSError:
+            self.socket_path.unlink()
+        else:
+            raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+    async def _handle(self, stream) -> None:
+        """Run one MCP session over a connection."""
+        from anyio.streams.buffered import BufferedByteReceiveStream
+
+        from . import server
+
+        self.sessions += 1
+        self.total_sessions += 1
+        try:
+            async with stream:
+                buffered = BufferedByteReceiveStream(stream)
+                cwd, first_line = await read_preamble(buffered)
+                # Each connection is its own task, so this is per session
+                server.client_cwd.set(cwd or "")
+                async with socket_streams(stream, buffered, first_line) as (read_stream, write_stream):
+                    await server.app.run(read_stream, write_stream, server.get_initialization_options())
+        except Exception as e:
+            logger.warning("Session ended with error: %s", e)
+        finally:
+            self.sessions -= 1
+            self._last_active = time.monotonic()
+
+    async def _exit_when_idle(self, cancel_scope) -> None:
+        """Stop serving after idle_timeout seconds without sessions."""
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 30))
+            idle = time.monotonic() - self._last_active
+            if self.sessions == 0 and idle >= self.idle_timeout:
+                logger.info("Idle for %.0fs, exiting", idle)
+                cancel_scope.cancel()
+                return
+
+    async def _stop_on_signal(self, cancel_scope) -> None:
+        """Stop serving on SIGTERM or SIGINT so the socket gets removed."""
+        import signal
+
+        import anyio
+
+        with anyio.open_signal_receiver(signal.SIGTERM, signal.SIGINT) as signals:
+            async for signum in signals:
+                logger.info("Received signal %d, exiting", signum)
+                cancel_scope.cancel()
+                return
+
+    async def serve(self) -> None:
+        """Listen on the socket until cancelled or idle."""
+        import anyio
+
+        from . import server
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_socket()
+        # Sessions can read aliases and run searches, so only the owner may
+        # connect; the umask makes the socket 0600 from the moment it's bound
+        umask = os.umask(0o077)
+        try:
+            listener = await anyio.create_unix_listener(self.socket_path)
+        finally:
+            os.umask(umask)
+        logger.info("Simpleminded Shell MCP daemon listening on %s", self.socket_path)
+
+        watcher = asyncio.create_task(server.watch_for_changes())
+        try:
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(self._stop_on_signal, tg.cancel_scope)
+                if self.idle_timeout > 0:
+                    tg.start_soon(self._exit_when_idle, tg.cancel_scope)
+                await listener.serve(self._handle, task_group=tg)
+        finally:
+            watcher.cancel()
+            await listener.aclose()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+
+def main():
+    """Entry point for the daemon."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="simpleminded-mcp-daemon", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--socket", type=Path, help="socket path (default: %(default)s)",
+                        default=default_socket_path())
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=float(os.environ.get("SIMPLEMINDED_DAEMON_IDLE", "0")),
+        help="exit after this many seconds without sessions (0 = never)",
+    )
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(Daemon(args.socket, args.idle_timeout).serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Bounded pool of parsed configs, keyed by path."""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .alias_detector import AliasDetector
+from .config_parser import ShellConfigParser
+from .single_flight import SingleFlight
+from .snapshot_cache import SnapshotCache
+
+# Rough per-record overhead of an Alias/ShellFunction plus its dict slot
+RECORD_OVERHEAD = 200
+
+
+@dataclass(frozen=True, slots=True)
+class PoolEntry:
+    """A parsed config and the file state it was parsed from."""
+    parser: ShellConfigParser
+    detector: AliasDetector
+    stat_key: Tuple[int, int]
+    size: int
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it can't be stat'ed."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def estimate_size(content: str, detector: AliasDetector) -> int:
+    """Approximate memory held by a pool entry, in bytes."""
+    size = len(content)
+    for alias in detector.parse_aliases().values():
+        size += len(alias.name) + len(alias.command) + RECORD_OVERHEAD
+    for func in detector.parse_functions().values():
+        size += len(func.name) + len(func.body) + RECORD_OVERHEAD
+    return size
+
+
+class DetectorPool:
+    """Parsers and detectors for any number of config files.
+
+    Entries are looked up by resolved path and re-parsed when the file's
+    mtime or size changes. The least recently used entries are evicted once
+    the pool holds more than ``max_entries`` configs or its estimated size
+    exceeds ``max_bytes``; the most recent entry is always kept.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 32,
+        max_bytes: int = 64 * 1024 * 1024,
+        cache: Optional[SnapshotCache] = None,
+    ):
+        """Initialize with entry and memory limits and an optional snapshot cache."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Path, PoolEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight("config_pool")
+
+    def get(self, config_path: str) -> Optional[PoolEntry]:
+        """Get the parsed config at a path; None if it doesn't exist."""
+        path = Path(config_path).expanduser().resolve()
+        stat_key = _stat_key(path)
+        if stat_key is None:
+            self.discard(path)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.stat_key == stat_key:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+
+        return self._flight.do(path, self._load, path)
+
+    def _load(self, path: Path) -> Optional[PoolEntry]:
+        """Parse a config file and add it to the pool."""
+        # Stat before reading: a write in between makes the next get re-parse
+        stat_key = _stat_key(path)
+        parser = ShellConfigParser(str(path))
+        if stat_key is None or not parser.config_path:
+            return None
+
+        content = parser.get_raw_config()
+        if self.cache is not None:
+            detector = self.cache.get_detector(path, content)
+        else:
+            detector = AliasDetector(content, source=str(path))
+            detector.parse_aliases()
+            detector.parse_functions()
+        entry = PoolEntry(parser, detector, stat_key, estimate_size(content, detector))
+
+        with self._lock:
+            self.misses += 1
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self.total_bytes -= old.size
+            self._entries[path] = entry
+            self.total_bytes += entry.size
+            self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        """Drop least recently used entries over the limits; caller holds the lock."""
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self.total_bytes -= entry.size
+            self.evictions += 1
+
+    def discard(self, config_path) -> None:
+        """Forget a config, e.g. after it was deleted."""
+        path = Path(config_path).expanduser().resolve()
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self.total_bytes -= entry.size
+
+    def get_stats(self) -> Dict:
+        """Describe pool usage."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "paths": [str(path) for path in self._entries],
+            }
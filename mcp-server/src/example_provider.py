@@ -1,208 +1,177 @@
-"""Provide context-aware usage examples for tools and aliases."""
+"""Provide context-aware usage examples for tools and aliases.
 
-from typing import List, Dict, Optional
+Examples and workflows live in data files, not in this module. Each pack
+root holds ``examples/<tool>.json`` (a list of examples) and
+``workflows/*.json`` (workflows by name). The bundled packs come first, then
+site and user packs, which can add tools or replace bundled examples by
+``use_case``.
+"""
+
+import json
+import logging
+import marshal
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, List, Dict, Optional, Tuple
+
+from .snapshot_cache import temp_path
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_DIR = Path(__file__).parent / "data"
+
+# Bump when the compiled cache layout changes
+FORMAT_VERSION = 1
+
+
+def pack_roots() -> List[Path]:
+    """Directories holding example packs, lowest precedence first.
+
+    Bundled packs, then $XDG_CONFIG_DIRS and $XDG_CONFIG_HOME under
+    ``simpleminded-shell``, then any directories in $SIMPLEMINDED_EXAMPLE_PATH.
+    """
+    roots = [BUNDLED_DIR]
+    config_dirs = os.environ.get("XDG_CONFIG_DIRS") or "/etc/xdg"
+    # The first XDG config dir is the most important, so it goes last
+    roots += [
+        Path(d) / "simpleminded-shell" for d in reversed(config_dirs.split(os.pathsep)) if d
+    ]
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    roots.append(Path(config_home) / "simpleminded-shell")
+    extra = os.environ.get("SIMPLEMINDED_EXAMPLE_PATH", "")
+    roots += [Path(p).expanduser() for p in extra.split(os.pathsep) if p]
+    return roots
+
+
+class PackCache:
+    """Parsed pack files kept in one marshal file.
+
+    A pack is re-parsed only when its size or mtime changed, so a large set
+    of packs costs a stat per file and one read of the cache. New entries
+    are written back by flush().
+    """
+
+    def __init__(self, path: Path):
+        """Initialize with the cache file path; it is read on first use."""
+        self.path = Path(path)
+        self._entries: Optional[Dict[str, Tuple[int, int, Any]]] = None
+        self._dirty = False
+
+    def _load_entries(self) -> Dict[str, Tuple[int, int, Any]]:
+        """Read the cache file, or start empty if it is missing or stale."""
+        if self._entries is None:
+            try:
+                header, entries = marshal.loads(self.path.read_bytes())
+                if tuple(header) != (FORMAT_VERSION, *sys.version_info[:2]):
+                    entries = {}
+            except (OSError, EOFError, ValueError, TypeError):
+                entries = {}
+            self._entries = entries
+        return self._entries
+
+    def parse(self, pack: Path) -> Any:
+        """Parsed JSON of a pack file, from the cache when it is unchanged."""
+        stat = pack.stat()
+        entries = self._load_entries()
+        key = str(pack)
+        cached = entries.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        data = json.loads(pack.read_text(encoding="utf-8"))
+        entries[key] = (stat.st_size, stat.st_mtime_ns, data)
+        self._dirty = True
+        return data
+
+    def flush(self) -> None:
+        """Atomically write new entries; failures are ignored."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = temp_path(self.path)
+            tmp.write_bytes(marshal.dumps(((FORMAT_VERSION, *sys.version_info[:2]), self._entries)))
+            os.replace(tmp, self.path)
+        except (OSError, ValueError):
+            pass
 
 
 class ExampleProvider:
-    """Provide usage examples for simpleminded-shell tools."""
-
-    EXAMPLES = {
-        "bat": [
-            {
-                "use_case": "view_file",
-                "command": "bat script.py",
-                "description": "View file with syntax highlighting"
-            },
-            {
-                "use_case": "with_paging",
-                "command": "bat long-file.log",
-                "description": "View long file with automatic paging"
-            },
-            {
-                "use_case": "plain",
-                "command": "bat --style=plain config.txt",
-                "description": "View without line numbers and decorations"
-            },
-            {
-                "use_case": "show_changes",
-                "command": "bat --diff modified.py",
-                "description": "Show git changes with syntax highlighting"
-            },
-        ],
-        "fd": [
-            {
-                "use_case": "find_by_name",
-                "command": 'fd "config"',
-                "description": "Find files named config"
-            },
-            {
-                "use_case": "find_by_extension",
-                "command": "fd -e py",
-                "description": "Find all Python files"
-            },
-            {
-                "use_case": "include_hidden",
-                "command": "fd -H .env",
-                "description": "Find including hidden files"
-            },
-            {
-                "use_case": "directories_only",
-                "command": "fd -t d node_modules",
-                "description": "Find directories only"
-            },
-            {
-                "use_case": "execute_on_results",
-                "command": 'fd -e js -x wc -l',
-                "description": "Count lines in all JavaScript files"
-            },
-        ],
-        "rg": [
-            {
-                "use_case": "basic_search",
-                "command": 'rg "TODO"',
-                "description": "Search for TODO in all files"
-            },
-            {
-                "use_case": "case_insensitive",
-                "command": 'rg -i "error"',
-                "description": "Case-insensitive search"
-            },
-            {
-                "use_case": "by_type",
-                "command": 'rg --type py "import"',
-                "description": "Search only Python files"
-            },
-            {
-                "use_case": "count_matches",
-                "command": 'rg --count "FIXME"',
-                "description": "Count matches per file"
-            },
-            {
-                "use_case": "list_files",
-                "command": 'rg -l "class"',
-                "description": "List files containing matches"
-            },
-        ],
-        "eza": [
-            {
-                "use_case": "basic_list",
-                "command": "eza",
-                "description": "List files with colors and icons"
-            },
-            {
-                "use_case": "detailed",
-                "command": "ll",
-                "description": "Detailed list with git status"
-            },
-            {
-                "use_case": "tree_view",
-                "command": "lt",
-                "description": "Tree view (2 levels deep)"
-            },
-            {
-                "use_case": "directories_only",
-                "command": "eza -D",
-                "description": "List directories only"
-            },
-        ],
-        "fzf": [
-            {
-                "use_case": "find_file",
-                "command": "ff",
-                "description": "Fuzzy find and edit files"
-            },
-            {
-                "use_case": "search_history",
-                "command": "Ctrl+R",
-                "description": "Search command history"
-            },
-            {
-                "use_case": "change_directory",
-                "command": "cdf",
-                "description": "Change directory with preview"
-            },
-        ],
-        "lazygit": [
-            {
-                "use_case": "visual_git",
-                "command": "lg",
-                "description": "Visual Git interface for all operations"
-            },
-        ],
-        "mise": [
-            {
-                "use_case": "show_versions",
-                "command": "mise current",
-                "description": "Show current tool versions"
-            },
-            {
-                "use_case": "install_tool",
-                "command": "mise install python@3.12",
-                "description": "Install Python 3.12"
-            },
-            {
-                "use_case": "use_version",
-                "command": "mise use python@3.12",
-                "description": "Use Python 3.12 in current project"
-            },
-        ],
-        "jq": [
-            {
-                "use_case": "pretty_print",
-                "command": "cat data.json | jq",
-                "description": "Pretty print JSON"
-            },
-            {
-                "use_case": "extract_field",
-                "command": "jq '.users[].name' data.json",
-                "description": "Extract specific field"
-            },
-            {
-                "use_case": "show_keys",
-                "command": "jq 'keys' data.json",
-                "description": "Show all keys"
-            },
-        ],
-    }
-
-    WORKFLOWS = {
-        "search_and_edit": {
-            "description": "Search for pattern and edit matching files",
-            "steps": [
-                'rg "TODO" -l  # List files with TODOs',
-                'ff  # Fuzzy find and open in editor',
-            ],
-        },
-        "find_and_view": {
-            "description": "Find files and view with syntax highlighting",
-            "steps": [
-                'fd -e py  # Find Python files',
-                'bat $(fd -e py | fzf)  # Preview and select to view',
-            ],
-        },
-        "git_workflow": {
-            "description": "Quick git workflow",
-            "steps": [
-                'lg  # Open lazygit',
-                '# Or use commands:',
-                'gs  # Check status',
-                'ga .  # Stage all',
-                'gc -m "message"  # Commit',
-                'gp  # Push',
-            ],
-        },
-        "search_replace": {
-            "description": "Search and replace across files",
-            "steps": [
-                'rg "old_function" -l  # Find files',
-                'fd -e py | xargs sed -i "" "s/old_function/new_function/g"',
-            ],
-        },
-    }
+    """Provide usage examples for simpleminded-shell tools.
+
+    Only the list of tool names is read up front. A tool's packs are parsed
+    the first time its examples are requested and then added to the search
+    index; searching loads whatever tools haven't been loaded yet.
+
+    With a TldrIndex, commands without a pack fall back to their tldr page,
+    and searches also return matching tldr examples after the curated ones.
+    """
+
+    # tldr examples returned per search
+    TLDR_SEARCH_LIMIT = 20
+
+    def __init__(self, roots: Optional[List[Path]] = None, cache_path: Optional[Path] = None,
+                 tldr=None):
+        """Initialize with pack roots (default: pack_roots()), an optional compiled cache and TldrIndex."""
+        self.roots = [Path(root) for root in roots] if roots is not None else pack_roots()
+        self._cache = PackCache(cache_path) if cache_path else None
+        self.tldr = tldr
+        self._tools: Optional[List[str]] = None
+        self._examples: Dict[str, List[Dict]] = {}
+        # tool -> (lowercased "command description tool" text, example)
+        self._index: Dict[str, List[Tuple[str, Dict]]] = {}
+        self._workflows: Optional[Dict[str, Dict]] = None
+        self._lock = threading.RLock()
+
+    def _parse(self, pack: Path) -> Any:
+        """Parse a pack file, or None if it is unreadable or malformed."""
+        try:
+            if self._cache:
+                return self._cache.parse(pack)
+            return json.loads(pack.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("Skipping example pack %s: %s", pack, e)
+            return None
+
+    def _load_tool(self, tool: str) -> List[Dict]:
+        """Merge a tool's examples from every root; later roots win per use_case."""
+        with self._lock:
+            if tool in self._examples:
+                return self._examples[tool]
+
+            merged: Dict[str, Dict] = {}
+            for root in self.roots:
+                pack = root / "examples" / f"{tool}.json"
+                if not pack.is_file():
+                    continue
+                data = self._parse(pack)
+                if not isinstance(data, list):
+                    continue
+                for example in data:
+                    if isinstance(example, dict) and "command" in example:
+                        example.setdefault("use_case", example["command"])
+                        example.setdefault("description", "")
+                        merged[example["use_case"]] = example
+            if self._cache:
+                self._cache.flush()
+
+            examples = list(merged.values())
+            self._examples[tool] = examples
+            self._index[tool] = [
+                (f"{ex['command']}\n{ex['description']}\n{tool}".lower(), ex) for ex in examples
+            ]
+            return examples
 
     def get_examples(self, tool: str, use_case: Optional[str] = None) -> List[Dict]:
-        """Get examples for a tool."""
-        tool_examples = self.EXAMPLES.get(tool, [])
+        """Get examples for a tool, from its tldr page if it has no pack."""
+        if tool in self.get_all_tools():
+            tool_examples = self._load_tool(tool)
+        elif self.tldr is not None:
+            tool_examples = self.tldr.get_examples(tool)
+        else:
+            return []
 
         if use_case:
             return [ex for ex in tool_examples if ex["use_case"] == use_case]
@@ -211,37 +180,73 @@ class ExampleProvider:
 
     def get_workflow(self, workflow_name: str) -> Optional[Dict]:
         """Get a specific workflow."""
-        return self.WORKFLOWS.get(workflow_name)
+        return self.get_all_workflows().get(workflow_name)
 
     def get_all_workflows(self) -> Dict[str, Dict]:
         """Get all available workflows."""
-        return self.WORKFLOWS
+        with self._lock:
+            if self._workflows is None:
+                workflows: Dict[str, Dict] = {}
+                for root in self.roots:
+                    for pack in sorted((root / "workflows").glob("*.json")):
+                        data = self._parse(pack)
+                        if isinstance(data, dict):
+                            workflows.update(data)
+                if self._cache:
+                    self._cache.flush()
+                self._workflows = workflows
+            return self._workflows
 
     def search_examples(self, query: str) -> List[Dict]:
         """Search examples by description or command."""
         query_lower = query.lower()
         results = []
 
-        for tool, examples in self.EXAMPLES.items():
-            for example in examples:
-                if (query_lower in example["command"].lower() or
-                    query_lower in example["description"].lower() or
-                    query_lower in tool.lower()):
+        for tool in self.get_all_tools():
+            self._load_tool(tool)
+            for text, example in self._index[tool]:
+                if query_lower in text:
                     results.append({
                         "tool": tool,
                         **example
                     })
 
+        if self.tldr is not None:
+            curated = set(self.get_all_tools())
+            results += [
+                example for example in self.tldr.search(query, self.TLDR_SEARCH_LIMIT)
+                if example["tool"] not in curated
+            ]
+
         return results
 
     def get_use_cases(self, tool: str) -> List[str]:
         """Get available use cases for a tool."""
-        tool_examples = self.EXAMPLES.get(tool, [])
-        return [ex["use_case"] for ex in tool_examples]
+        return [ex["use_case"] for ex in self.get_examples(tool)]
 
     def get_all_tools(self) -> List[str]:
         """Get list of tools with examples."""
-        return list(self.EXAMPLES.keys())
+        with self._lock:
+            if self._tools is None:
+                tools = set()
+                for root in self.roots:
+                    try:
+                        with os.scandir(root / "examples") as it:
+                            tools.update(
+                                entry.name[:-5] for entry in it if entry.name.endswith(".json")
+                            )
+                    except OSError:
+                        pass
+                self._tools = sorted(tools)
+            return self._tools
+
+    def reload(self) -> None:
+        """Forget loaded packs so added or edited files are picked up."""
+        with self._lock:
+            self._tools = None
+            self._workflows = None
+            self._examples.clear()
+            self._index.clear()
 
     def get_recommendations(self, task_description: str) -> List[Dict]:
         """Get tool recommendations based on task description."""
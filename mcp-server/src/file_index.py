@@ -0,0 +1,357 @@
+"""Per-project file name index, kept fresh by re-scanning changed directories."""
+
+import bisect
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern, Tuple
+
+# Ignore files read in each directory, as fd does
+IGNORE_FILES = [".gitignore", ".ignore", ".fdignore"]
+
+# Stop indexing a project past this many files
+MAX_FILES = 500_000
+
+# Don't stat every directory again within this many seconds
+REFRESH_INTERVAL = 1.0
+
+
+@dataclass(frozen=True, slots=True)
+class IgnoreRule:
+    """One line of an ignore file, relative to the directory that holds it."""
+    base: str
+    regex: Pattern
+    negate: bool
+    dir_only: bool
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob to a regex body."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end].replace("\\", "\\\\")
+            out.append("[^" + body[1:] + "]" if body[:1] == "!" else "[" + body + "]")
+            i = end + 1
+        else:
+            if pattern[i] == "\\" and i + 1 < len(pattern):
+                i += 1
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+def parse_ignore_file(text: str, base: str = "") -> List[IgnoreRule]:
+    """Parse gitignore syntax into rules for paths under base ("" or "dir/")."""
+    rules = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        # A slash anywhere but the end anchors the pattern to base
+        anchored = "/" in line
+        body = _glob_to_regex(line.lstrip("/"))
+        regex = re.compile(("^" if anchored else "^(?:.*/)?") + body + "$")
+        rules.append(IgnoreRule(base, regex, negate, dir_only))
+    return rules
+
+
+def is_ignored(rules: List[IgnoreRule], path: str, is_dir: bool) -> bool:
+    """Apply rules to a project-relative path; the last matching rule wins."""
+    for rule in reversed(rules):
+        if rule.dir_only and not is_dir:
+            continue
+        if not path.startswith(rule.base):
+            continue
+        if rule.regex.match(path[len(rule.base):]):
+            return not rule.negate
+    return False
+
+
+@dataclass(slots=True)
+class DirEntry:
+    """A scanned directory: its mtime, files and subdirectories."""
+    mtime_ns: int
+    files: List[str] = field(default_factory=list)
+    subdirs: List[str] = field(default_factory=list)
+    rules: List[IgnoreRule] = field(default_factory=list)
+
+
+def fuzzy_score(query: str, path: str) -> Optional[int]:
+    """Score a path for a fuzzy query (its characters in order), or None.
+
+    Consecutive characters and matches in the file name score higher, so
+    ``srvpy`` ranks ``src/server.py`` above ``src/sub/very/deep.py``.
+    """
+    position = 0
+    score = 0
+    previous = -2
+    name_start = path.rfind("/") + 1
+    lowered = path.lower()
+    for char in query.lower():
+        position = lowered.find(char, position)
+        if position < 0:
+            return None
+        score += 1
+        if position == previous + 1:
+            score += 3
+        if position >= name_start:
+            score += 2
+        if position == 0 or path[position - 1] in "/._-":
+            score += 2
+        previous = position
+        position += 1
+    return score * 100 - len(path)
+
+
+class FileIndex:
+    """File names under a project root, honoring ignore files like fd.
+
+    The index is a sorted array of project-relative paths, plus each
+    directory's mtime. A directory's mtime changes when entries are added,
+    removed or renamed in it, so a refresh stats every directory and
+    re-scans only those whose mtime moved; the sorted array is rebuilt only
+    when something changed. Hidden entries and ``.git`` are skipped.
+
+    Scanning stops descending once ``max_files`` files are indexed, so a huge
+    tree isn't walked in full only to be cut down; directories left out are
+    picked up by a later refresh if files are removed.
+    """
+
+    def __init__(self, root, max_files: int = MAX_FILES,
+                 refresh_interval: float = REFRESH_INTERVAL):
+        """Initialize for a project root; nothing is scanned until first use."""
+        self.root = Path(root).resolve()
+        self.max_files = max_files
+        self.refresh_interval = refresh_interval
+        self._dirs: Dict[str, DirEntry] = {}
+        self._paths: List[str] = []
+        self._file_count = 0
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.truncated = False
+
+    def _abs(self, rel: str) -> str:
+        """Absolute path of a project-relative directory ("" or "dir/")."""
+        return os.path.join(self.root, rel) if rel else str(self.root)
+
+    def _scan(self, rel: str, parent_rules: List[IgnoreRule]) -> int:
+        """Scan a directory and any new subdirectories; returns directories scanned."""
+        path = self._abs(rel)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            with os.scandir(path) as it:
+                entries = [(entry.name, entry.is_dir(follow_symlinks=False)) for entry in it]
+        except OSError:
+            self._drop(rel)
+            return 0
+
+        # Directories without ignore files share their parent's rule list
+        rules = parent_rules
+        names = {name for name, _ in entries}
+        for ignore_file in IGNORE_FILES:
+            if ignore_file in names:
+                try:
+                    with open(os.path.join(path, ignore_file), encoding="utf-8", errors="replace") as f:
+                        rules = rules + parse_ignore_file(f.read(), rel)
+                except OSError:
+                    pass
+
+        entry = DirEntry(mtime_ns, rules=rules)
+        for name, is_dir in sorted(entries):
+            if name.startswith("."):
+                continue
+            child = rel + name
+            if is_ignored(rules, child, is_dir):
+                continue
+            (entry.subdirs if is_dir else entry.files).append(name)
+
+        old = self._dirs.get(rel)
+        self._dirs[rel] = entry
+        self._file_count += len(entry.files) - (len(old.files) if old else 0)
+        scanned = 1
+        if old:
+            # Subdirectories are re-scanned in full if the rules they inherit changed
+            kept = set(entry.subdirs) if old.rules == rules else set()
+            for name in old.subdirs:
+                if name not in kept:
+                    self._drop(rel + name + "/")
+        for name in entry.subdirs:
+            child = rel + name + "/"
+            if child not in self._dirs:
+                if self._file_count >= self.max_files:
+                    break
+                scanned += self._scan(child, rules)
+        return scanned
+
+    def _drop(self, rel: str) -> None:
+        """Forget a directory and everything below it."""
+        entry = self._dirs.pop(rel, None)
+        if entry:
+            self._file_count -= len(entry.files)
+            for name in entry.subdirs:
+                self._drop(rel + name + "/")
+
+    def _rebuild(self) -> None:
+        """Rebuild the sorted path array from the directory table."""
+        paths = []
+        for rel, entry in self._dirs.items():
+            paths.extend(rel + name for name in entry.files)
+        paths.sort()
+        self.truncated = len(paths) > self.max_files or any(
+            rel + name + "/" not in self._dirs
+            for rel, entry in self._dirs.items()
+            for name in entry.subdirs
+        )
+        self._paths = paths[:self.max_files]
+
+    def refresh(self, force: bool = False) -> int:
+        """Re-scan directories whose mtime changed; returns how many were scanned."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._dirs and now - self._checked < self.refresh_interval:
+                return 0
+            self._checked = now
+
+            if not self._dirs:
+                scanned = self._scan("", [])
+            else:
+                scanned = 0
+                # Parents sort before children, so a re-scanned parent has
+                # already dropped or added its subdirectories when they come up
+                for rel in sorted(self._dirs):
+                    entry = self._dirs.get(rel)
+                    if entry is None:
+                        continue
+                    try:
+                        mtime_ns = os.stat(self._abs(rel)).st_mtime_ns
+                    except OSError:
+                        mtime_ns = None
+                    if mtime_ns != entry.mtime_ns:
+                        parent_rules = self._parent_rules(rel)
+                        scanned += self._scan(rel, parent_rules)
+                if self.truncated and self._file_count < self.max_files:
+                    scanned += self._scan_skipped()
+            if scanned:
+                self._rebuild()
+            return scanned
+
+    def _scan_skipped(self) -> int:
+        """Scan directories left out at the file limit, while under it."""
+        scanned = 0
+        for rel in sorted(self._dirs):
+            entry = self._dirs[rel]
+            for name in entry.subdirs:
+                child = rel + name + "/"
+                if child in self._dirs:
+                    continue
+                if self._file_count >= self.max_files:
+                    return scanned
+                scanned += self._scan(child, entry.rules)
+        return scanned
+
+    def _parent_rules(self, rel: str) -> List[IgnoreRule]:
+        """Ignore rules in effect for a directory's entries, minus its own file."""
+        if not rel:
+            return []
+        parent = rel[:-1].rpartition("/")[0]
+        entry = self._dirs.get(parent + "/" if parent else "")
+        return entry.rules if entry else []
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def find(self, query: Optional[str] = None, glob: Optional[str] = None,
+             extension: Optional[str] = None, under: Optional[str] = None,
+             limit: int = 50) -> Tuple[List[str], int]:
+        """Find paths; returns (up to limit paths, total matches).
+
+        ``under`` restricts to a subdirectory (a range of the sorted array),
+        ``glob`` matches the file name or, if it has a slash, the whole path,
+        and ``query`` is a fuzzy match that also orders the results.
+        """
+        self.refresh()
+        paths = self._paths
+        start, end = 0, len(paths)
+        if under:
+            prefix = under.strip("/") + "/"
+            start = bisect.bisect_left(paths, prefix)
+            end = bisect.bisect_left(paths, prefix[:-1] + "0")  # "0" sorts right after "/"
+
+        glob_regex = re.compile("^" + _glob_to_regex(glob) + "$") if glob else None
+        glob_path = bool(glob and "/" in glob)
+        suffix = "." + extension.lstrip(".") if extension else None
+
+        scored: List[Tuple[int, str]] = []
+        for i in range(start, end):
+            path = paths[i]
+            if suffix and not path.endswith(suffix):
+                continue
+            if glob_regex and not glob_regex.match(path if glob_path else path[path.rfind("/") + 1:]):
+                continue
+            if query:
+                score = fuzzy_score(query, path)
+                if score is None:
+                    continue
+                scored.append((-score, path))
+            else:
+                scored.append((0, path))
+
+        if query:
+            scored.sort()
+        return [path for _, path in scored[:limit]], len(scored)
+
+
+def project_root(path) -> Path:
+    """Nearest ancestor holding .git, else the path itself."""
+    path = Path(path).expanduser().resolve()
+    for candidate in [path, *path.parents]:
+        if (candidate / ".git").exists():
+            return candidate
+    return path
+
+
+class ProjectIndexes:
+    """File indexes for the most recently used projects."""
+
+    def __init__(self, max_projects: int = 8):
+        """Initialize with how many project indexes to keep."""
+        self.max_projects = max_projects
+        self._indexes: "OrderedDict[Path, FileIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path) -> FileIndex:
+        """Index for the project containing path, created on first use."""
+        root = project_root(path)
+        with self._lock:
+            index = self._indexes.get(root)
+            if index is None:
+                index = self._indexes[root] = FileIndex(root)
+                while len(self._indexes) > self.max_projects:
+                    self._indexes.popitem(last=False)
+            else:
+                self._indexes.move_to_end(root)
+            return index
@@ -0,0 +1,125 @@
+"""Index the flags each installed tool accepts, parsed from its --help."""
+
+import json
+import os
+import re
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional
+
+from .single_flight import SingleFlight
+from .snapshot_cache import default_cache_dir, temp_path
+
+# Flags at the start of an option line, e.g. "-i, --ignore-case" or
+# "-e PATTERN, --regexp=PATTERN"; the description after two spaces is ignored.
+_OPTION_LINE = re.compile(r"^\s*(-.*?)(?:\s{2,}|\t|$)")
+_FLAG = re.compile(r"(?<![\w-])(--?[A-Za-z0-9][\w-]*)")
+
+
+def parse_help_flags(help_text: str) -> FrozenSet[str]:
+    """Collect the short and long flags listed in a tool's --help output."""
+    flags = set()
+    for line in help_text.splitlines():
+        match = _OPTION_LINE.match(line)
+        if match:
+            flags.update(_FLAG.findall(match.group(1)))
+    return frozenset(flags)
+
+
+class FlagIndex:
+    """Flags supported by the installed version of each tool.
+
+    Each tool's ``--help`` is run once per version and the parsed flag set is
+    stored under the cache directory as ``<tool>-<version>.json``; lookups
+    after that are set membership tests. Tools that aren't installed have no
+    entry, and callers should treat their flags as unknown rather than invalid.
+    """
+
+    def __init__(self, tool_checker, cache_dir: Optional[Path] = None, timeout: float = 5.0):
+        """Initialize with a ToolChecker for paths and versions."""
+        self.tool_checker = tool_checker
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / "flags"
+        self.timeout = timeout
+        self._flags: Dict[str, Optional[FrozenSet[str]]] = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight("flag_index")
+
+    def _version_key(self, info) -> str:
+        """Version to key the cache by; the binary's mtime if it has none."""
+        if info.version:
+            return info.version
+        try:
+            return f"mtime{os.stat(info.path).st_mtime_ns}"
+        except OSError:
+            return "unknown"
+
+    def get_flags(self, tool: str) -> Optional[FrozenSet[str]]:
+        """Get a tool's flag set, or None if it isn't installed or has no --help."""
+        with self._lock:
+            if tool in self._flags:
+                return self._flags[tool]
+        return self._flight.do(tool, self._load, tool)
+
+    def _load(self, tool: str) -> Optional[FrozenSet[str]]:
+        """Load a tool's flags from disk, or parse --help and store them."""
+        info = self.tool_checker.check_tool(tool)
+        flags = None
+        if info.installed and info.path:
+            entry = self.cache_dir / f"{tool}-{self._version_key(info)}.json"
+            try:
+                flags = frozenset(json.loads(entry.read_text()))
+            except (OSError, ValueError):
+                flags = self._parse_help(info.path)
+                if flags:
+                    self._write(entry, flags)
+
+        with self._lock:
+            self._flags[tool] = flags
+        return flags
+
+    def _parse_help(self, path: str) -> Optional[FrozenSet[str]]:
+        """Run a tool's --help and parse the flags it lists."""
+        try:
+            result = subprocess.run(
+                [path, "--help"],
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        # Some tools print usage on stderr
+        return parse_help_flags(result.stdout or result.stderr) or None
+
+    def _write(self, entry: Path, flags: FrozenSet[str]) -> None:
+        """Atomically store a flag set; failures are ignored."""
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp = temp_path(entry)
+            tmp.write_text(json.dumps(sorted(flags)))
+            os.replace(tmp, entry)
+        except OSError:
+            pass
+
+    def supports(self, tool: str, flag: str) -> Optional[bool]:
+        """Check whether a tool accepts a flag; None when that is unknown.
+
+        ``--flag=value`` is checked as ``--flag``, and a bundle of short flags
+        such as ``-il`` is supported if each of its letters is.
+        """
+        flags = self.get_flags(tool)
+        if flags is None:
+            return None
+        flag = flag.split("=", 1)[0]
+        if flag in flags:
+            return True
+        if not flag.startswith("--") and len(flag) > 2:
+            return all(f"-{letter}" in flags for letter in flag[1:])
+        return False
+
+    def clear(self) -> None:
+        """Forget in-memory flag sets, e.g. after tools were (re)installed."""
+        with self._lock:
+            self._flags.clear()
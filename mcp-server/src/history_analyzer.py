@@ -0,0 +1,245 @@
+"""Find commands in shell history that could use modern tools."""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .snapshot_cache import default_cache_dir, temp_path
+
+HISTORY_FILES = ["~/.zsh_history", "~/.bash_history"]
+
+# zsh escapes bytes that collide with its tokens as META, byte ^ 32
+ZSH_META = 0x83
+
+# zsh history file names besides ones containing "zsh"
+ZSH_HISTORY_NAMES = {".zhistory", ".histfile"}
+
+# Distinct commands kept with their counts in the persisted state
+MAX_TOP_COMMANDS = 500
+
+# Translations memoized per analyzer run
+MEMO_SIZE = 65536
+
+
+def default_history_files() -> List[Path]:
+    """$HISTFILE if set, else the zsh and bash history files that exist."""
+    if os.environ.get("HISTFILE"):
+        candidates = [os.environ["HISTFILE"]]
+    else:
+        candidates = HISTORY_FILES
+    return [Path(path).expanduser() for path in candidates if Path(path).expanduser().is_file()]
+
+
+def unmetafy(data: bytes) -> bytes:
+    """Undo zsh's metafication of history bytes."""
+    if ZSH_META not in data:
+        return data
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        byte = data[i]
+        if byte == ZSH_META and i + 1 < len(data):
+            out.append(data[i + 1] ^ 32)
+            i += 2
+        else:
+            out.append(byte)
+            i += 1
+    return bytes(out)
+
+
+def is_zsh_history(path: Path) -> bool:
+    """Whether a history file is named like zsh's, whose bytes are metafied."""
+    name = path.name.lower()
+    return "zsh" in name or name in ZSH_HISTORY_NAMES
+
+
+def _parse_entry(raw: bytes, zsh: bool = False) -> Optional[str]:
+    """Decode one history entry, dropping zsh extended-history metadata.
+
+    Only zsh entries are unmetafied: in other histories 0x83 is an ordinary
+    UTF-8 continuation byte.
+    """
+    if raw.startswith(b": "):
+        # zsh EXTENDED_HISTORY: ": <start>:<elapsed>;<command>"
+        _, sep, command = raw.partition(b";")
+        if sep:
+            raw = command
+            zsh = True
+    elif raw.startswith(b"#") and raw[1:].isdigit():
+        # bash HISTTIMEFORMAT timestamp line
+        return None
+    if zsh:
+        raw = unmetafy(raw)
+    text = raw.decode("utf-8", errors="replace").strip()
+    return text or None
+
+
+def iter_history(path: Path, start: int = 0) -> Iterator[Tuple[str, int]]:
+    """Yield (command, offset after it) for each complete entry from start.
+
+    The file is memory-mapped and scanned for newlines, so large histories
+    aren't loaded as Python lines. Multi-line zsh entries (continued with a
+    trailing backslash) are joined; an unterminated last line is left for
+    the next run.
+    """
+    zsh = is_zsh_history(path)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= start:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = start
+            entry_start = start
+            while position < size:
+                newline = data.find(b"\n", position)
+                if newline < 0:
+                    return
+                position = newline + 1
+                if newline > entry_start and data[newline - 1] == 0x5C:  # backslash
+                    continue
+                command = _parse_entry(data[entry_start:newline].replace(b"\\\n", b"\n"), zsh)
+                entry_start = position
+                if command:
+                    yield command, position
+
+
+class HistoryAnalyzer:
+    """Count history entries the translator could modernize.
+
+    Each file is analyzed incrementally: the offset reached and the counts so
+    far are stored under the cache directory, and the next run only reads
+    what was appended. A file that shrank or was replaced is re-read.
+    """
+
+    def __init__(self, translator, paths: Optional[List[Path]] = None,
+                 state_dir: Optional[Path] = None):
+        """Initialize with a CommandTranslator and history files (default: detected)."""
+        self.translator = translator
+        self.paths = [Path(path) for path in paths] if paths is not None else default_history_files()
+        self.state_dir = Path(state_dir) if state_dir else default_cache_dir() / "history"
+        self._lock = threading.Lock()
+
+    def _state_path(self, path: Path) -> Path:
+        """State file for a history file."""
+        digest = hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:16]
+        return self.state_dir / f"{path.name.lstrip('.')}-{digest}.json"
+
+    def _load_state(self, path: Path) -> Dict:
+        """Load the stored state, or a fresh one if the file was replaced or truncated."""
+        fresh = {"inode": None, "offset": 0, "entries": 0, "translatable": 0,
+                 "commands": {}, "rules": {}, "top": {}}
+        try:
+            stat = path.stat()
+            state = json.loads(self._state_path(path).read_text())
+        except (OSError, ValueError):
+            return fresh
+        if state.get("inode") != stat.st_ino or state.get("offset", 0) > stat.st_size:
+            return fresh
+        return state
+
+    def _save_state(self, path: Path, state: Dict) -> None:
+        """Store state atomically; failures are ignored."""
+        entry = self._state_path(path)
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp = temp_path(entry)
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, entry)
+        except OSError:
+            pass
+
+    def analyze_file(self, path: Path) -> Dict:
+        """Bring one file's counts up to date and return its state."""
+        state = self._load_state(path)
+        try:
+            state["inode"] = path.stat().st_ino
+        except OSError:
+            return state
+
+        commands = Counter(state["commands"])
+        rules = Counter(state["rules"])
+        top = Counter(state["top"])
+        # command -> (source commands, rules), or None if not translatable
+        memo: Dict[str, Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]]] = {}
+
+        for command, offset in iter_history(path, state["offset"]):
+            state["entries"] += 1
+            state["offset"] = offset
+            if command in memo:
+                result = memo[command]
+            else:
+                result = self._classify(command)
+                if len(memo) < MEMO_SIZE:
+                    memo[command] = result
+            if result is None:
+                continue
+
+            state["translatable"] += 1
+            commands.update(result[0])
+            rules.update(result[1])
+            top[command] += 1
+
+        state["commands"] = dict(commands)
+        state["rules"] = dict(rules)
+        state["top"] = dict(top.most_common(MAX_TOP_COMMANDS))
+        self._save_state(path, state)
+        return state
+
+    def _classify(self, command: str) -> Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+        """Source commands and rules of a translatable command, else None."""
+        translation = self.translator.translate(command)
+        if translation is None:
+            return None
+        # Stage rules are bare command names ("grep"); flag rules have a space
+        sources = tuple(rule for rule in translation.rules if " " not in rule)
+        return sources or (command.split()[0],), tuple(translation.rules)
+
+    def analyze(self, top: int = 20) -> Dict:
+        """Analyze new history and aggregate counts over every file."""
+        with self._lock:
+            states = [(path, self.analyze_file(path)) for path in self.paths]
+
+        commands: Counter = Counter()
+        rules: Counter = Counter()
+        top_commands: Counter = Counter()
+        for _, state in states:
+            commands.update(state["commands"])
+            rules.update(state["rules"])
+            top_commands.update(state["top"])
+
+        entries = sum(state["entries"] for _, state in states)
+        translatable = sum(state["translatable"] for _, state in states)
+        return {
+            "files": [
+                {"path": str(path), "entries": state["entries"], "offset": state["offset"]}
+                for path, state in states
+            ],
+            "entries": entries,
+            "translatable": translatable,
+            "translatable_percent": round(100 * translatable / entries, 1) if entries else 0.0,
+            "by_command": dict(commands.most_common()),
+            "by_rule": dict(rules.most_common()),
+            "top": [
+                {"command": command, "count": count,
+                 "modern": self._modern(command)}
+                for command, count in top_commands.most_common(top)
+            ],
+        }
+
+    def _modern(self, command: str) -> Optional[str]:
+        """Translation of a top command for display."""
+        translation = self.translator.translate(command)
+        return translation.modern if translation else None
+
+    def reset(self) -> None:
+        """Forget stored offsets and counts."""
+        for path in self.paths:
+            try:
+                self._state_path(path).unlink()
+            except OSError:
+                pass
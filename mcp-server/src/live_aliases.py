@@ -0,0 +1,189 @@
+"""Snapshot aliases and functions from a live interactive shell."""
+
+import os
+import re
+import shlex
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .alias_detector import Alias, AliasDetector, ShellFunction
+from .single_flight import SingleFlight
+
+
+ALIASES_MARKER = "__SIMPLEMINDED_ALIASES__"
+FUNCTIONS_MARKER = "__SIMPLEMINDED_FUNCTIONS__"
+
+_FUNCTION_HEADER = re.compile(r"^(?:function\s+)?([^\s()=]+)\s*\(\)\s*\{?\s*$")
+
+
+def parse_alias_output(output: str) -> Dict[str, Alias]:
+    """Parse `alias` output from zsh (name=value) or bash (alias name='value')."""
+    aliases = {}
+    for line in output.splitlines():
+        if line.startswith("alias "):
+            line = line[6:]
+        name, sep, value = line.partition("=")
+        if not sep or not name or " " in name:
+            continue
+        try:
+            # Both shells quote with '...' and escape embedded quotes as '\''
+            parts = shlex.split(value)
+            command = parts[0] if len(parts) == 1 else value
+        except ValueError:
+            command = value
+        aliases[name] = Alias(name=name, command=command)
+    return aliases
+
+
+def parse_function_output(output: str) -> Dict[str, ShellFunction]:
+    """Parse `functions` (zsh) or `declare -f` (bash) output.
+
+    Both shells print a ``name () {`` header (bash puts the brace on the
+    next line) and close each definition with a ``}`` in column zero.
+    """
+    functions = {}
+    name: Optional[str] = None
+    body: List[str] = []
+
+    for line in output.splitlines():
+        if name is None:
+            match = _FUNCTION_HEADER.match(line)
+            if match:
+                name = match.group(1)
+                body = [line]
+            continue
+
+        body.append(line)
+        if line.rstrip() == "}":
+            functions[name] = ShellFunction(name=name, body="\n".join(body))
+            name = None
+
+    return functions
+
+
+class LiveAliasSnapshot:
+    """Aliases and functions as an interactive shell sees them.
+
+    Plugins, conditionals and sourced files only show up after the shell has
+    actually started, so one ``<shell> -ic`` run is captured and cached. The
+    cache is keyed by the modification times of the shell's rc files and is
+    refreshed on a background thread; readers get the last snapshot (or None)
+    and never wait on shell startup.
+    """
+
+    SHELL_COMMANDS = {
+        "zsh": f"print -r -- {ALIASES_MARKER}; alias; print -r -- {FUNCTIONS_MARKER}; functions",
+        "bash": f"echo {ALIASES_MARKER}; alias; echo {FUNCTIONS_MARKER}; declare -f",
+    }
+
+    RC_FILES = {
+        "zsh": ["~/.zshenv", "~/.zprofile", "~/.zshrc", "~/.config/zsh/.zshrc"],
+        "bash": ["~/.bashrc", "~/.bash_profile", "~/.profile", "~/.bash_aliases"],
+    }
+
+    def __init__(self, shell: Optional[str] = None, timeout: float = 10.0):
+        """Initialize for a shell name; defaults to the basename of $SHELL."""
+        if shell is None:
+            shell = Path(os.environ.get("SHELL", "bash")).name
+        self.shell = shell if shell in self.SHELL_COMMANDS else "bash"
+        self.timeout = timeout
+        self._flight = SingleFlight("live_snapshot")
+        self._detector: Optional[AliasDetector] = None
+        self._key: Optional[Tuple] = None
+        self._last_refresh: Optional[float] = None
+        self._last_duration: Optional[float] = None
+        self._error: Optional[str] = None
+
+    def _cache_key(self) -> Tuple:
+        """Modification times of the shell's rc files (None when missing)."""
+        key = []
+        for rc_file in self.RC_FILES[self.shell]:
+            try:
+                key.append(Path(rc_file).expanduser().stat().st_mtime_ns)
+            except OSError:
+                key.append(None)
+        return tuple(key)
+
+    def get(self) -> Optional[AliasDetector]:
+        """Get the latest snapshot, scheduling a refresh if the rc files changed."""
+        if self._key != self._cache_key():
+            self.refresh()
+        return self._detector
+
+    def refresh(self, wait: bool = False) -> Optional[AliasDetector]:
+        """Start a background refresh unless one is already running.
+
+        With wait, block until the running (or a new) refresh finishes.
+        """
+        if wait:
+            self._flight.do(self.shell, self._refresh)
+        elif not self._flight.in_flight(self.shell):
+            threading.Thread(
+                target=self._flight.do,
+                args=(self.shell, self._refresh),
+                name="live-alias-snapshot",
+                daemon=True,
+            ).start()
+        return self._detector
+
+    def _refresh(self) -> None:
+        """Run the shell once and swap in the parsed snapshot."""
+        key = self._cache_key()
+        started = time.monotonic()
+        try:
+            output = self._run_shell()
+            aliases_part, _, functions_part = output.partition(FUNCTIONS_MARKER)
+            detector = AliasDetector.from_parsed(
+                parse_alias_output(aliases_part),
+                parse_function_output(functions_part),
+            )
+            source = f"live:{self.shell}"
+            for record in (*detector.parse_aliases().values(),
+                           *detector.parse_functions().values()):
+                record.source = source
+
+            self._detector = detector
+            self._key = key
+            self._error = None
+        except Exception as e:
+            self._error = str(e)
+            # Don't retry on every read; wait for the rc files to change.
+            self._key = key
+        finally:
+            self._last_refresh = time.time()
+            self._last_duration = time.monotonic() - started
+
+    def _run_shell(self) -> str:
+        """Run one interactive shell and return everything after the marker."""
+        result = subprocess.run(
+            [self.shell, "-ic", self.SHELL_COMMANDS[self.shell]],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            timeout=self.timeout,
+            # Detach from our terminal so job control doesn't grab it
+            start_new_session=True,
+            env={**os.environ, "TERM": "dumb"},
+        )
+        # rc files may print banners before our marker
+        _, found, output = result.stdout.partition(ALIASES_MARKER)
+        if not found:
+            raise RuntimeError(f"{self.shell} exited with {result.returncode} before listing aliases")
+        return output
+
+    def get_status(self) -> Dict:
+        """Describe the snapshot state."""
+        detector = self._detector
+        return {
+            "shell": self.shell,
+            "ready": detector is not None,
+            "refreshing": self._flight.in_flight(self.shell),
+            "last_refresh": self._last_refresh,
+            "last_duration": self._last_duration,
+            "error": self._error,
+            "alias_count": len(detector.parse_aliases()) if detector else 0,
+            "function_count": len(detector.parse_functions()) if detector else 0,
+        }
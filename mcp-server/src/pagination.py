@@ -0,0 +1,77 @@
+"""Cursor-based pagination over sorted keys."""
+
+import base64
+import binascii
+from bisect import bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(key: str) -> str:
+    """Encode the last key of a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Decode a cursor back into the key it points after."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return base64.b64decode(padded.encode(), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    """Clamp a requested page size to [1, MAX_PAGE_SIZE]."""
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
+
+
+def paginate(
+    sorted_keys: Sequence[str],
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    predicate: Optional[Callable[[str], bool]] = None,
+) -> Tuple[List[str], Optional[str]]:
+    """Get one page of keys and the cursor for the next page.
+
+    Cursors record the last key returned rather than an offset, so a page
+    boundary stays put when entries are added or removed in between requests.
+    Only the keys on the requested page are visited (plus any the predicate
+    skips over).
+    """
+    limit = clamp_limit(limit)
+    start = bisect_right(sorted_keys, decode_cursor(cursor)) if cursor else 0
+
+    page: List[str] = []
+    index = start
+    while index < len(sorted_keys) and len(page) < limit:
+        key = sorted_keys[index]
+        index += 1
+        if predicate is None or predicate(key):
+            page.append(key)
+
+    next_cursor = encode_cursor(page[-1]) if page and index < len(sorted_keys) else None
+    return page, next_cursor
+
+
+def parse_fields(
+    fields: Optional[Union[str, Iterable[str]]],
+    allowed: Sequence[str],
+    default: Sequence[str],
+) -> List[str]:
+    """Normalize a field selection (list or comma-separated string)."""
+    if not fields:
+        return list(default)
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    selected = [field.strip() for field in fields if field.strip() in allowed]
+    return selected or list(default)
+
+
+def select_fields(record: Dict, fields: Sequence[str]) -> Dict:
+    """Keep only the selected fields of a record."""
+    return {field: record.get(field) for field in fields}
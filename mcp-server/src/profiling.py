@@ -0,0 +1,178 @@
+"""Opt-in profiling of individual tool calls and resource reads."""
+
+import cProfile
+import itertools
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from .snapshot_cache import default_cache_dir
+from .structured_logging import get_logger
+
+logger = get_logger("profiling")
+
+MODES = ("cprofile", "sample")
+
+# Seconds between stack samples in sample mode
+SAMPLE_INTERVAL = 0.002
+
+
+class StackSampler:
+    """Sample one thread's Python stack on a timer.
+
+    Stacks are counted in the folded format used by flamegraph.pl and
+    speedscope: one ``root;caller;callee count`` line per distinct stack.
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        """Initialize for a thread id (threading.get_ident())."""
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        """Take samples until stopped."""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        """Collected stacks in folded format."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RequestProfiler:
+    """Profile selected handlers, one request in ``every``.
+
+    In ``cprofile`` mode a handler runs under cProfile and its stats are
+    written as ``.pstats`` (open with ``python -m pstats`` or snakeviz). Only
+    one cProfile session can be active at a time, so a request that comes up
+    while another is being profiled runs unprofiled. In ``sample`` mode the
+    worker thread's stack is sampled every few milliseconds and written as a
+    ``.folded`` flame graph input; samplers don't conflict, and the overhead
+    stays low enough to leave on under load with a large ``every``.
+    """
+
+    def __init__(self, mode: Optional[str] = None, output_dir: Optional[Path] = None,
+                 every: int = 1, handlers: Optional[Set[str]] = None):
+        """Initialize; mode None leaves profiling off."""
+        self.output_dir = Path(output_dir) if output_dir else default_cache_dir() / "profiles"
+        self.configure(mode, every, handlers)
+        self._requests = itertools.count()
+        self._sequence = itertools.count()
+        self._cprofile_lock = threading.Lock()
+        self.written: List[str] = []
+
+    @classmethod
+    def from_env(cls) -> "RequestProfiler":
+        """Configure from the environment.
+
+        SIMPLEMINDED_PROFILE sets the mode, SIMPLEMINDED_PROFILE_DIR the output
+        directory, SIMPLEMINDED_PROFILE_EVERY the sampling rate and
+        SIMPLEMINDED_PROFILE_HANDLERS a comma-separated list of tool names and
+        resource URIs (default: all). A mistyped mode or rate logs a warning
+        and leaves profiling off rather than stopping the server.
+        """
+        handlers = os.environ.get("SIMPLEMINDED_PROFILE_HANDLERS")
+        profiler = cls(output_dir=os.environ.get("SIMPLEMINDED_PROFILE_DIR") or None)
+        try:
+            profiler.configure(
+                mode=os.environ.get("SIMPLEMINDED_PROFILE") or None,
+                every=int(os.environ.get("SIMPLEMINDED_PROFILE_EVERY", "1")),
+                handlers={h.strip() for h in handlers.split(",") if h.strip()} if handlers else None,
+            )
+        except ValueError as e:
+            logger.warning("Profiling disabled: %s", e)
+        return profiler
+
+    def configure(self, mode: Optional[str], every: int = 1,
+                  handlers: Optional[Set[str]] = None) -> None:
+        """Change the mode ("cprofile", "sample" or None for off), rate and handlers."""
+        if mode is not None and mode not in MODES:
+            raise ValueError(f"Unknown profiling mode: {mode} (expected one of {', '.join(MODES)})")
+        self.mode = mode
+        self.every = max(1, int(every))
+        self.handlers = set(handlers) if handlers else None
+
+    def status(self) -> Dict:
+        """Current settings and the most recent output files."""
+        return {
+            "mode": self.mode or "off",
+            "every": self.every,
+            "handlers": sorted(self.handlers) if self.handlers else "all",
+            "output_dir": str(self.output_dir),
+            "recent": self.written[-10:],
+        }
+
+    def _selected(self, name: str) -> bool:
+        """Whether this request should be profiled."""
+        if self.handlers is not None and name not in self.handlers:
+            return False
+        return next(self._requests) % self.every == 0
+
+    def _output_path(self, kind: str, name: str, suffix: str) -> Path:
+        """Unique output file for one request."""
+        safe = re.sub(r"[^\w.-]+", "_", name).strip("_")
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return self.output_dir / f"{stamp}-{kind}-{safe}-{next(self._sequence)}{suffix}"
+
+    def run(self, kind: str, name: str, func, *args):
+        """Call func(*args), profiling it if this request is selected."""
+        mode = self.mode
+        if mode is None or not self._selected(name):
+            return func(*args)
+        if mode == "cprofile":
+            if not self._cprofile_lock.acquire(blocking=False):
+                return func(*args)
+            try:
+                profile = cProfile.Profile()
+                try:
+                    return profile.runcall(func, *args)
+                finally:
+                    self._write(kind, name, ".pstats", profile=profile)
+            finally:
+                self._cprofile_lock.release()
+
+        sampler = StackSampler(threading.get_ident())
+        sampler.start()
+        try:
+            return func(*args)
+        finally:
+            sampler.stop()
+            self._write(kind, name, ".folded", folded=sampler.folded())
+
+    def _write(self, kind: str, name: str, suffix: str, profile=None, folded: str = "") -> None:
+        """Write one request's profile; failures are ignored."""
+        path = self._output_path(kind, name, suffix)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if profile is not None:
+                profile.dump_stats(str(path))
+            else:
+                path.write_text(folded)
+        except OSError:
+            return
+        self.written.append(str(path))
+        del self.written[:-100]
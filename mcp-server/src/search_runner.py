@@ -0,0 +1,200 @@
+"""Run rg and fd searches with bounded output."""
+
+import asyncio
+import base64
+import json
+import shutil
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Names some distributions install fd under
+FD_ALIASES = ["fdfind"]
+
+# Longest line an rg --json message may be; longer messages are skipped
+LINE_LIMIT = 1024 * 1024
+
+# Matched line text kept per hit
+HIT_TEXT_CHARS = 200
+
+
+def _text(data: Dict) -> str:
+    """Text of an rg JSON string field, which is base64 when not UTF-8."""
+    if "text" in data:
+        return data["text"]
+    return base64.b64decode(data.get("bytes", "")).decode("utf-8", errors="replace")
+
+
+async def stream_lines(argv: List[str], on_line: Callable[[bytes], bool],
+                       max_bytes: int, timeout: float,
+                       cwd: Optional[str] = None) -> Tuple[Optional[str], Optional[int]]:
+    """Feed a command's stdout to on_line until it returns True or a limit is hit.
+
+    Returns (reason the output was cut short, or None; exit status, or None
+    if the process was killed). The command runs in cwd if given. The process is killed as soon as a limit is
+    reached so large searches don't keep running after the answer is known.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *argv,
+        cwd=cwd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        limit=LINE_LIMIT,
+    )
+
+    async def consume() -> Optional[str]:
+        read = 0
+        while True:
+            try:
+                line = await process.stdout.readline()
+            except ValueError:
+                # Line over LINE_LIMIT; the rest of it was discarded
+                continue
+            if not line:
+                return None
+            read += len(line)
+            if on_line(line):
+                return "max_results"
+            if read >= max_bytes:
+                return "max_bytes"
+
+    try:
+        reason = await asyncio.wait_for(consume(), timeout)
+        if reason is None:
+            return None, await process.wait()
+    except asyncio.TimeoutError:
+        reason = "timeout"
+    finally:
+        # Also reached when the calling request is cancelled
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+    return reason, None
+
+
+class SearchRunner:
+    """Run ripgrep content searches and fd file searches for the assistant.
+
+    Output is parsed as it streams and the child is killed once max_results
+    hits, max_bytes of output or the timeout is reached, so a broad search
+    returns a compact summary instead of its whole output.
+    """
+
+    def __init__(self, tool_checker, max_results: int = 200,
+                 max_bytes: int = 4 * 1024 * 1024, timeout: float = 10.0):
+        """Initialize with a ToolChecker and default limits."""
+        self.tool_checker = tool_checker
+        self.max_results = max_results
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+
+    def resolve(self, tool: str) -> Optional[str]:
+        """Path of rg or fd, or None if it isn't installed."""
+        info = self.tool_checker.check_tool(tool)
+        if info.installed and info.path:
+            return info.path
+        if tool == "fd":
+            for name in FD_ALIASES:
+                path = shutil.which(name)
+                if path:
+                    return path
+        return None
+
+    async def search_content(self, rg: str, pattern: str, path: str = ".",
+                             globs: Optional[List[str]] = None, ignore_case: bool = False,
+                             fixed_strings: bool = False, max_results: Optional[int] = None,
+                             hits_shown: int = 20, cwd: Optional[str] = None) -> Dict:
+        """Search file contents with rg --json, from cwd if given.
+
+        Returns match counts per file and the first hits_shown matches.
+        """
+        max_results = max_results or self.max_results
+        argv = [rg, "--json", "--max-columns", "1000"]
+        if ignore_case:
+            argv.append("--ignore-case")
+        if fixed_strings:
+            argv.append("--fixed-strings")
+        for glob in globs or []:
+            argv += ["--glob", glob]
+        argv += ["--", pattern, path]
+
+        files: Dict[str, int] = {}
+        hits: List[Dict] = []
+        total = 0
+
+        def on_line(line: bytes) -> bool:
+            nonlocal total
+            try:
+                message = json.loads(line)
+            except ValueError:
+                return False
+            if message.get("type") != "match":
+                return False
+            data = message["data"]
+            file_path = _text(data["path"])
+            files[file_path] = files.get(file_path, 0) + 1
+            total += 1
+            if len(hits) < hits_shown:
+                submatches = data.get("submatches") or [{}]
+                hits.append({
+                    "path": file_path,
+                    "line": data.get("line_number"),
+                    "column": submatches[0].get("start", 0) + 1,
+                    "text": _text(data["lines"]).rstrip("\n")[:HIT_TEXT_CHARS],
+                })
+            return total >= max_results
+
+        start = time.perf_counter()
+        reason, return_code = await stream_lines(argv, on_line, self.max_bytes, self.timeout, cwd)
+        return {
+            "tool": "rg",
+            "pattern": pattern,
+            "path": path,
+            "total_matches": total,
+            "files_matched": len(files),
+            "files": [
+                {"path": file_path, "matches": count}
+                for file_path, count in sorted(files.items(), key=lambda item: -item[1])
+            ],
+            "hits": hits,
+            "truncated": reason is not None,
+            "reason": reason,
+            # rg exits 1 when nothing matched and 2 on errors such as a bad pattern
+            "error": "rg failed (bad pattern or path?)" if return_code == 2 and not total else None,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+    async def search_files(self, fd: str, pattern: Optional[str] = None, path: str = ".",
+                           extension: Optional[str] = None, file_type: Optional[str] = None,
+                           hidden: bool = False, max_results: Optional[int] = None,
+                           cwd: Optional[str] = None) -> Dict:
+        """List files with fd from cwd if given, up to max_results paths."""
+        max_results = max_results or self.max_results
+        argv = [fd, "--color", "never"]
+        if file_type:
+            argv += ["--type", file_type]
+        if extension:
+            argv += ["--extension", extension.lstrip(".")]
+        if hidden:
+            argv.append("--hidden")
+        argv += ["--", pattern or ".", path]
+
+        paths: List[str] = []
+
+        def on_line(line: bytes) -> bool:
+            paths.append(line.decode("utf-8", errors="replace").rstrip("\n"))
+            return len(paths) >= max_results
+
+        start = time.perf_counter()
+        reason, return_code = await stream_lines(argv, on_line, self.max_bytes, self.timeout, cwd)
+        return {
+            "tool": "fd",
+            "pattern": pattern,
+            "path": path,
+            "count": len(paths),
+            "paths": paths,
+            "truncated": reason is not None,
+            "reason": reason,
+            "error": "fd failed (bad pattern or path?)" if return_code and not paths else None,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
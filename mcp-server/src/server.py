@@ -5,10 +5,18 @@ Provides resources and tools for AI assistants to understand and work
 with simpleminded-shell environments.
 """
 
+import asyncio
+import contextvars
+import functools
 import json
-import logging
-from typing import Any, Dict
-from mcp.server import Server
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+from mcp.server import NotificationOptions, Server
 from mcp.types import (
     Resource,
     Tool,
@@ -19,32 +27,447 @@ from mcp.types import (
 
 from .config_parser import ShellConfigParser
 from .alias_detector import AliasDetector
-from .command_translator import CommandTranslator
-from .tool_checker import ToolChecker
-from .example_provider import ExampleProvider
+from .single_flight import SingleFlight, get_flight_stats
+from .pagination import paginate, parse_fields, select_fields
+from .structured_logging import get_logger, setup_logging, short
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+logger = get_logger("server")
+tool_log = get_logger("tools")
+resource_log = get_logger("resources")
+watch_log = get_logger("watch")
 
 # Initialize server
 app = Server("simpleminded-shell")
 
-# Initialize components
-config_parser = ShellConfigParser()
-tool_checker = ToolChecker()
-translator = CommandTranslator()
-example_provider = ExampleProvider()
+# Working directory of the client a session serves. Unset (None) for the
+# stdio server, which runs in the client's directory; the daemon sets it per
+# connection from the shim, or to "" when the client didn't send one.
+client_cwd: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("client_cwd", default=None)
 
-# Initialize alias detector if config is available
-alias_detector = None
-if config_parser.config_path:
-    alias_detector = AliasDetector(config_parser.get_raw_config())
+
+def client_dir(path: Optional[str]) -> str:
+    """Directory a client's relative path (or no path) resolves against.
+
+    Raises ValueError for a daemon session whose client's working directory
+    is unknown, unless path is absolute: the daemon's own directory is
+    never the user's project.
+    """
+    cwd = client_cwd.get()
+    if cwd:
+        return cwd
+    if cwd is None:
+        return os.getcwd()
+    if path and os.path.isabs(path):
+        return path if os.path.isdir(path) else os.path.dirname(path)
+    raise ValueError("An absolute path is required: the client's working directory is unknown")
+
+
+def _component(factory):
+    """Create a component on first call, exactly once even across threads."""
+    lock = threading.Lock()
+    instance = []
+
+    @functools.wraps(factory)
+    def get():
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+
+    return get
+
+
+# Components are created on first use so startup only pays for the MCP
+# handshake; modules they need are imported inside the factories.
+@_component
+def get_tool_checker():
+    """Get the shared ToolChecker."""
+    from .tool_checker import ToolChecker
+    return ToolChecker()
+
+
+@_component
+def get_translator():
+    """Get the shared CommandTranslator."""
+    from .command_translator import CommandTranslator
+    return CommandTranslator(flag_index=get_flag_index())
+
+
+@_component
+def get_flag_index():
+    """Get the index of flags each installed tool accepts."""
+    from .flag_index import FlagIndex
+    return FlagIndex(get_tool_checker())
+
+
+@_component
+def get_example_provider():
+    """Get the shared ExampleProvider."""
+    from .example_provider import ExampleProvider
+    from .snapshot_cache import default_cache_dir
+    from .tldr_index import TldrIndex
+    if os.environ.get("SIMPLEMINDED_NO_CACHE"):
+        return ExampleProvider()
+    return ExampleProvider(cache_path=default_cache_dir() / "examples.marshal", tldr=TldrIndex())
+
+
+@_component
+def get_live_snapshot():
+    """Get the shared LiveAliasSnapshot."""
+    from .live_aliases import LiveAliasSnapshot
+    return LiveAliasSnapshot()
+
+
+@_component
+def get_snapshot_cache():
+    """Get the parsed-config cache, or None if SIMPLEMINDED_NO_CACHE is set."""
+    if os.environ.get("SIMPLEMINDED_NO_CACHE"):
+        return None
+    from .snapshot_cache import SnapshotCache
+    return SnapshotCache()
+
+
+@_component
+def get_history_analyzer():
+    """Get the shell history analyzer."""
+    from .history_analyzer import HistoryAnalyzer
+    return HistoryAnalyzer(get_translator())
+
+
+@_component
+def get_alias_miner():
+    """Get the shell history alias miner."""
+    from .alias_miner import AliasMiner
+    return AliasMiner()
+
+
+@_component
+def get_alias_validator():
+    """Get the alias target validator."""
+    from .alias_validator import AliasValidator
+    return AliasValidator(get_tool_checker())
+
+
+@_component
+def get_search_runner():
+    """Get the rg/fd search runner."""
+    from .search_runner import SearchRunner
+    return SearchRunner(get_tool_checker())
+
+
+@_component
+def get_project_indexes():
+    """Get the file indexes of recently searched projects."""
+    from .file_index import ProjectIndexes
+    return ProjectIndexes()
+
+
+@_component
+def get_profiler():
+    """Get the request profiler (off unless SIMPLEMINDED_PROFILE is set)."""
+    from .profiling import RequestProfiler
+    return RequestProfiler.from_env()
+
+
+@_component
+def get_detector_pool():
+    """Get the pool of configs requested by path (config_path / ?config=)."""
+    from .detector_pool import DetectorPool
+    return DetectorPool(
+        max_entries=int(os.environ.get("SIMPLEMINDED_POOL_SIZE", "32")),
+        max_bytes=int(os.environ.get("SIMPLEMINDED_POOL_MB", "64")) * 1024 * 1024,
+        cache=get_snapshot_cache(),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigState:
+    """The detected config and its parsed aliases.
+
+    States are immutable: reloads build a new one and swap the module
+    reference in a single assignment, so a handler running on a worker
+    thread always sees a parser and detector from the same read.
+    """
+    parser: ShellConfigParser
+    merged: Any
+    detector: Optional[AliasDetector]
+
+
+def _load_config_state() -> ConfigState:
+    """Build the config state for the current config files.
+
+    With SIMPLEMINDED_DISCOVER_ALL set, aliases from every known config file
+    are merged.
+    """
+    snapshot_cache = get_snapshot_cache()
+    merged = None
+    detector = None
+    if os.environ.get("SIMPLEMINDED_DISCOVER_ALL"):
+        from .config_discovery import discover_configs
+        merged = discover_configs(cache=snapshot_cache)
+        # Every candidate was just read; don't read them again to detect
+        parser = merged.primary_parser
+        if merged.sources:
+            detector = merged.detector()
+        return ConfigState(parser, merged, detector)
+
+    parser = ShellConfigParser()
+    if parser.config_path and snapshot_cache:
+        detector = snapshot_cache.get_detector(parser.config_path, parser.get_raw_config())
+    elif parser.config_path:
+        detector = AliasDetector(parser.get_raw_config(), source=str(parser.config_path))
+    return ConfigState(parser, merged, detector)
+
+
+_config_state: Optional[ConfigState] = None
+_change_tracker = None
+
+# Serializes loading and reloading; readers never take it
+_config_lock = threading.Lock()
+
+# Requests arriving during the first load wait on it instead of the lock
+_config_flight = SingleFlight("config_parse")
+
+
+def _load_first_config_state() -> ConfigState:
+    """Load the config state unless a reload got there first."""
+    global _config_state, _change_tracker
+    with _config_lock:
+        if _config_state is None:
+            from .alias_delta import AliasChangeTracker
+            loaded = _load_config_state()
+            _change_tracker = AliasChangeTracker(loaded.detector)
+            _config_state = loaded
+        return _config_state
+
+
+def get_config_state() -> ConfigState:
+    """Get the current config state, loading it on first use."""
+    state = _config_state
+    if state is None:
+        state = _config_flight.do("config", _load_first_config_state)
+    return state
+
+
+def get_alias_detector(config_path: Optional[str] = None) -> Optional[AliasDetector]:
+    """Get the detector for a config path, or the detected config by default.
+
+    Returns None when no config was detected or the path doesn't exist.
+    """
+    if config_path:
+        entry = get_detector_pool().get(config_path)
+        return entry.detector if entry else None
+    return get_config_state().detector
+
+
+def _no_config_error(config_path: Optional[str] = None) -> Dict:
+    """Error result for a missing config."""
+    if config_path:
+        return {"error": f"Config not found: {config_path}"}
+    return {"error": "No simpleminded-shell configuration detected"}
+
+
+def get_change_tracker():
+    """Get the alias change tracker."""
+    get_config_state()
+    return _change_tracker
+
+
+# Resource URI -> sessions subscribed to it
+subscriptions: Dict[str, "weakref.WeakSet"] = {}
+
+# Seconds between checks of the config files and $PATH for subscribers
+WATCH_INTERVAL = float(os.environ.get("SIMPLEMINDED_WATCH_INTERVAL", "2"))
+
+ALIAS_FIELDS = ["name", "command", "category", "source"]
+FUNCTION_FIELDS = ["name", "body", "source"]
+EXAMPLE_FIELDS = ["tool", "use_case", "command", "description"]
+
+
+def _query_params(uri: str) -> Dict[str, str]:
+    """Get the query parameters of a resource URI."""
+    return {key: values[-1] for key, values in parse_qs(urlsplit(uri).query).items()}
+
+
+def _alias_page(params: Dict[str, Any]) -> Dict:
+    """Build one page of aliases or functions.
+
+    Only the records on the requested page are serialized. Function bodies
+    are left out unless explicitly selected with ``fields``.
+    """
+    config_path = params.get("config_path")
+    detector = get_alias_detector(config_path)
+    if not detector:
+        return _no_config_error(config_path)
+
+    kind = params.get("kind") or "aliases"
+    category = params.get("category")
+    if kind == "functions":
+        records = detector.parse_functions()
+        keys = detector.get_sorted_function_names()
+        fields = parse_fields(params.get("fields"), FUNCTION_FIELDS, ["name", "source"])
+        predicate = None
+    else:
+        records = detector.parse_aliases()
+        keys = detector.get_sorted_alias_names()
+        fields = parse_fields(params.get("fields"), ALIAS_FIELDS, ["name", "command", "category"])
+        predicate = (lambda name: records[name].category == category) if category else None
+
+    page, next_cursor = paginate(keys, params.get("cursor"), params.get("limit"), predicate)
+    return {
+        "kind": kind,
+        "total": sum(1 for name in keys if predicate(name)) if predicate else len(keys),
+        "fields": fields,
+        "items": [
+            {field: getattr(records[name], field) for field in fields}
+            for name in page
+        ],
+        "next_cursor": next_cursor,
+    }
+
+
+def _example_page(params: Dict[str, Any]) -> Dict:
+    """Build one page of examples, optionally for a single tool."""
+    tool: Optional[str] = params.get("tool")
+    tools = [tool] if tool else sorted(get_example_provider().get_all_tools())
+
+    # Keys sort by tool, then by position within the tool's example list
+    keys = [
+        f"{name}\x00{index:06d}"
+        for name in tools
+        for index in range(len(get_example_provider().get_examples(name)))
+    ]
+    fields = parse_fields(params.get("fields"), EXAMPLE_FIELDS, EXAMPLE_FIELDS)
+    page, next_cursor = paginate(keys, params.get("cursor"), params.get("limit"))
+
+    items = []
+    for key in page:
+        name, _, index = key.partition("\x00")
+        example = {"tool": name, **get_example_provider().get_examples(name)[int(index)]}
+        items.append(select_fields(example, fields))
+
+    return {"total": len(keys), "fields": fields, "items": items, "next_cursor": next_cursor}
+
+
+def _config_signature() -> tuple:
+    """Modification time and size of every candidate config file."""
+    signature = []
+    for config_path in ShellConfigParser.CONFIG_PATHS:
+        try:
+            stat = os.stat(os.path.expanduser(config_path))
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def reload_config() -> Optional[Dict]:
+    """Re-read the config and swap in a new state.
+
+    Returns the net change since the previous generation, or None when no
+    alias or function changed.
+    """
+    global _config_state
+
+    tracker = get_change_tracker()
+    with _config_lock:
+        state = _load_config_state()
+        _config_state = state
+        delta = tracker.update(state.detector)
+    if delta is None:
+        return None
+    return tracker.changes_since(delta.generation - 1)
+
+
+async def _notify(prefix: str) -> None:
+    """Send resources/updated to every session subscribed under a URI prefix."""
+    for uri, sessions in list(subscriptions.items()):
+        if not uri.startswith(prefix):
+            continue
+        for session in list(sessions):
+            try:
+                await session.send_resource_updated(uri)
+            except Exception as e:
+                watch_log.warning("Dropping subscriber for %s: %s", uri, e)
+                sessions.discard(session)
+
+
+async def watch_for_changes() -> None:
+    """Poll config files and $PATH, notifying subscribers of changes."""
+    config_signature = _config_signature()
+    path_signature = get_tool_checker().get_path_signature()
+
+    while True:
+        await asyncio.sleep(WATCH_INTERVAL)
+
+        signature = _config_signature()
+        if signature != config_signature:
+            config_signature = signature
+            # Nothing to diff against until the config was first needed
+            changes = reload_config() if _config_state is not None else None
+            if changes:
+                watch_log.info("Config changed", extra={"generation": changes["generation"]})
+                await _notify("simpleminded://aliases/")
+
+        signature = get_tool_checker().get_path_signature()
+        if signature != path_signature:
+            path_signature = signature
+            get_tool_checker().clear_cache()
+            get_flag_index().clear()
+            await _notify("simpleminded://tools/")
+
+
+@app.subscribe_resource()
+async def subscribe_resource(uri) -> None:
+    """Subscribe the calling session to updates of a resource."""
+    session = app.request_context.session
+    subscriptions.setdefault(str(uri), weakref.WeakSet()).add(session)
+
+
+@app.unsubscribe_resource()
+async def unsubscribe_resource(uri) -> None:
+    """Unsubscribe the calling session from a resource."""
+    sessions = subscriptions.get(str(uri))
+    if sessions is not None:
+        sessions.discard(app.request_context.session)
+
+
+# Worker threads for handlers that parse configs or spawn subprocesses
+MAX_WORKERS = int(os.environ.get("SIMPLEMINDED_WORKERS", "8"))
+
+
+@_component
+def get_executor():
+    """Get the thread pool handlers run on."""
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="simpleminded")
+
+
+async def run_in_worker(func, *args):
+    """Run a blocking handler on the worker pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    # Keep the session's context (client_cwd) on the worker thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(), functools.partial(context.run, func, *args))
+
+
+def get_initialization_options():
+    """Initialization options advertising resource subscriptions."""
+    options = app.create_initialization_options(NotificationOptions(resources_changed=True))
+    if options.capabilities.resources:
+        options.capabilities.resources.subscribe = True
+    return options
 
 
 @app.list_resources()
 async def list_resources() -> list[Resource]:
     """List available resources."""
+    return await run_in_worker(_list_resources)
+
+
+def _list_resources() -> list[Resource]:
+    """Build the resource list (may load the config on first use)."""
     resources = [
         Resource(
             uri="simpleminded://config/info",
@@ -64,6 +487,24 @@ async def list_resources() -> list[Resource]:
             description="Aliases organized by category (file, git, docker, etc.)",
             mimeType="application/json",
         ),
+        Resource(
+            uri="simpleminded://aliases/page",
+            name="Aliases (paginated)",
+            description="One page of aliases; query: cursor, limit, fields, category, kind=aliases|functions",
+            mimeType="application/json",
+        ),
+        Resource(
+            uri="simpleminded://aliases/delta",
+            name="Alias Changes",
+            description="Net alias/function changes since a generation; query: since",
+            mimeType="application/json",
+        ),
+        Resource(
+            uri="simpleminded://aliases/live",
+            name="Live Aliases",
+            description="Aliases and functions as seen by an interactive shell (refreshed in the background)",
+            mimeType="application/json",
+        ),
         Resource(
             uri="simpleminded://tools/status",
             name="Tool Installation Status",
@@ -82,17 +523,36 @@ async def list_resources() -> list[Resource]:
             description="Usage examples for all tools",
             mimeType="application/json",
         ),
+        Resource(
+            uri="simpleminded://examples/page",
+            name="Examples (paginated)",
+            description="One page of examples; query: cursor, limit, fields, tool",
+            mimeType="application/json",
+        ),
         Resource(
             uri="simpleminded://workflows/all",
             name="Common Workflows",
             description="Multi-step workflows using simpleminded-shell tools",
             mimeType="application/json",
         ),
+        Resource(
+            uri="simpleminded://history/translations",
+            name="History Translation Opportunities",
+            description="How often shell history uses commands that have modern equivalents; query: top",
+            mimeType="application/json",
+        ),
+        Resource(
+            uri="simpleminded://server/stats",
+            name="Server Stats",
+            description="Duplicate probes and parses avoided by sharing in-flight work",
+            mimeType="application/json",
+        ),
     ]
 
     # Add category-specific resources if aliases are available
-    if alias_detector:
-        for category in alias_detector.get_all_categories():
+    detector = get_alias_detector()
+    if detector:
+        for category in detector.get_all_categories():
             resources.append(
                 Resource(
                     uri=f"simpleminded://aliases/category/{category}",
@@ -108,40 +568,96 @@ async def list_resources() -> list[Resource]:
 @app.read_resource()
 async def read_resource(uri: str) -> str:
     """Read a specific resource."""
-    logger.info(f"Reading resource: {uri}")
+    uri = str(uri)
+    resource_log.info("Reading resource", extra={"uri": short(uri)})
+    return await run_in_worker(get_profiler().run, "resource", uri.partition("?")[0], _read_resource, uri)
+
+
+def _read_resource(uri: str) -> str:
+    """Read a resource on a worker thread.
 
-    if uri == "simpleminded://config/info":
-        return json.dumps(config_parser.get_config_info(), indent=2)
+    Config and alias resources take ``?config=<path>`` to read another
+    config file than the detected one.
+    """
+    base = uri.partition("?")[0]
+    config_path = _query_params(uri).get("config")
+
+    if base == "simpleminded://config/info":
+        if config_path:
+            entry = get_detector_pool().get(config_path)
+            if not entry:
+                return json.dumps(_no_config_error(config_path))
+            return json.dumps(entry.parser.get_config_info(), indent=2)
+        state = get_config_state()
+        info = state.parser.get_config_info()
+        if state.merged:
+            info["sources"] = state.merged.get_sources_info()
+            info["overridden"] = {
+                "aliases": state.merged.overridden_aliases,
+                "functions": state.merged.overridden_functions,
+            }
+        return json.dumps(info, indent=2)
 
-    elif uri == "simpleminded://aliases/all":
-        if not alias_detector:
-            return json.dumps({"error": "No simpleminded-shell configuration detected"})
-        return json.dumps(alias_detector.to_dict(), indent=2)
+    elif base == "simpleminded://aliases/all":
+        detector = get_alias_detector(config_path)
+        if not detector:
+            return json.dumps(_no_config_error(config_path))
+        return json.dumps(detector.to_dict(), indent=2)
 
-    elif uri == "simpleminded://aliases/categories":
-        if not alias_detector:
-            return json.dumps({"error": "No simpleminded-shell configuration detected"})
+    elif uri.startswith("simpleminded://aliases/page"):
+        params = _query_params(uri)
+        params["config_path"] = params.pop("config", None)
+        try:
+            return json.dumps(_alias_page(params), indent=2)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+
+    elif uri.startswith("simpleminded://examples/page"):
+        try:
+            return json.dumps(_example_page(_query_params(uri)), indent=2)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+
+    elif uri.startswith("simpleminded://aliases/delta"):
+        since = _query_params(uri).get("since", "0")
+        try:
+            return json.dumps(get_change_tracker().changes_since(int(since)), indent=2)
+        except ValueError:
+            return json.dumps({"error": f"Invalid generation: {since}"})
+
+    elif uri == "simpleminded://aliases/live":
+        live_detector = get_live_snapshot().get()
+        result = {"status": get_live_snapshot().get_status()}
+        if live_detector:
+            result.update(live_detector.to_dict())
+        return json.dumps(result, indent=2)
+
+    elif base == "simpleminded://aliases/categories":
+        detector = get_alias_detector(config_path)
+        if not detector:
+            return json.dumps(_no_config_error(config_path))
         categories = {}
-        for category in alias_detector.get_all_categories():
+        for category in detector.get_all_categories():
             categories[category] = {
                 name: {"command": alias.command}
-                for name, alias in alias_detector.get_aliases_by_category(category).items()
+                for name, alias in detector.get_aliases_by_category(category).items()
             }
         return json.dumps(categories, indent=2)
 
-    elif uri.startswith("simpleminded://aliases/category/"):
-        category = uri.split("/")[-1]
-        if not alias_detector:
-            return json.dumps({"error": "No simpleminded-shell configuration detected"})
-        aliases = alias_detector.get_aliases_by_category(category)
+    elif base.startswith("simpleminded://aliases/category/"):
+        category = base.split("/")[-1]
+        detector = get_alias_detector(config_path)
+        if not detector:
+            return json.dumps(_no_config_error(config_path))
+        aliases = detector.get_aliases_by_category(category)
         result = {
-            name: {"command": alias.command, "category": alias.category}
+            name: {"command": alias.command, "category": alias.category, "source": alias.source}
             for name, alias in aliases.items()
         }
         return json.dumps(result, indent=2)
 
     elif uri == "simpleminded://tools/status":
-        all_tools = tool_checker.check_all_tools()
+        all_tools = get_tool_checker().check_all_tools()
         result = {
             name: {
                 "installed": info.installed,
@@ -154,16 +670,29 @@ async def read_resource(uri: str) -> str:
         return json.dumps(result, indent=2)
 
     elif uri == "simpleminded://tools/summary":
-        return json.dumps(tool_checker.get_summary(), indent=2)
+        return json.dumps(get_tool_checker().get_summary(), indent=2)
 
     elif uri == "simpleminded://examples/all":
         examples = {}
-        for tool in example_provider.get_all_tools():
-            examples[tool] = example_provider.get_examples(tool)
+        for tool in get_example_provider().get_all_tools():
+            examples[tool] = get_example_provider().get_examples(tool)
         return json.dumps(examples, indent=2)
 
     elif uri == "simpleminded://workflows/all":
-        return json.dumps(example_provider.get_all_workflows(), indent=2)
+        return json.dumps(get_example_provider().get_all_workflows(), indent=2)
+
+    elif base == "simpleminded://history/translations":
+        top = _query_params(uri).get("top", "20")
+        try:
+            return json.dumps(get_history_analyzer().analyze(top=int(top)), indent=2)
+        except ValueError:
+            return json.dumps({"error": f"Invalid top: {top}"})
+
+    elif uri == "simpleminded://server/stats":
+        return json.dumps(
+            {"single_flight": get_flight_stats(), "config_pool": get_detector_pool().get_stats()},
+            indent=2,
+        )
 
     else:
         return json.dumps({"error": f"Unknown resource: {uri}"})
@@ -187,6 +716,110 @@ async def list_tools() -> list[Tool]:
                 "required": ["command"],
             },
         ),
+        Tool(
+            name="run_search",
+            description="Run rg (file contents) or fd (file names) and get a compact summary; output is cut off at a result, byte or time limit",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tool": {
+                        "type": "string",
+                        "enum": ["rg", "fd"],
+                        "description": "rg to search contents, fd to find files (default: rg)",
+                    },
+                    "pattern": {
+                        "type": "string",
+                        "description": "Regex to search for (rg) or match file names against (fd)",
+                    },
+                    "path": {
+                        "type": "string",
+                        "description": "Directory to search (default: current directory)",
+                    },
+                    "glob": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "rg only: globs of files to include, or exclude with a leading '!'",
+                    },
+                    "ignore_case": {
+                        "type": "boolean",
+                        "description": "rg only: case-insensitive search",
+                    },
+                    "fixed_strings": {
+                        "type": "boolean",
+                        "description": "rg only: treat the pattern as a literal string",
+                    },
+                    "extension": {
+                        "type": "string",
+                        "description": "fd only: file extension to match (e.g., 'py')",
+                    },
+                    "type": {
+                        "type": "string",
+                        "enum": ["f", "d", "l", "x"],
+                        "description": "fd only: files, directories, symlinks or executables",
+                    },
+                    "max_results": {
+                        "type": "integer",
+                        "description": "Stop after this many matches or paths (default 200)",
+                    },
+                },
+            },
+        ),
+        Tool(
+            name="find_files",
+            description="Find files in a project by fuzzy name, glob or extension from an index that honors .gitignore",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Directory in the project (default: current directory); the index covers its git root",
+                    },
+                    "query": {
+                        "type": "string",
+                        "description": "Fuzzy match against the path, best matches first (e.g., 'srvpy')",
+                    },
+                    "glob": {
+                        "type": "string",
+                        "description": "Glob for the file name, or the whole path if it has a slash (e.g., 'test_*.py')",
+                    },
+                    "extension": {
+                        "type": "string",
+                        "description": "File extension (e.g., 'py')",
+                    },
+                    "under": {
+                        "type": "string",
+                        "description": "Only files under this project-relative directory",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum paths to return (default 50)",
+                    },
+                },
+            },
+        ),
+        Tool(
+            name="set_profiling",
+            description="Turn per-request profiling on or off; profiles are written to a local directory",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "mode": {
+                        "type": "string",
+                        "enum": ["off", "cprofile", "sample"],
+                        "description": "cprofile writes .pstats, sample writes .folded flame graph stacks; omit to only get status",
+                    },
+                    "every": {
+                        "type": "integer",
+                        "description": "Profile one request in N (default 1)",
+                    },
+                    "handlers": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Tool names or resource URIs to profile (default: all)",
+                    },
+                },
+            },
+        ),
         Tool(
             name="check_tool",
             description="Check if a specific tool is installed and get version information",
@@ -229,10 +862,123 @@ async def list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "Name of the alias to explain",
                     },
+                    "config_path": {
+                        "type": "string",
+                        "description": "Config file to read instead of the detected one",
+                    },
                 },
                 "required": ["alias_name"],
             },
         ),
+        Tool(
+            name="list_aliases",
+            description="List aliases or functions one page at a time, with field selection",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "kind": {
+                        "type": "string",
+                        "enum": ["aliases", "functions"],
+                        "description": "What to list (default: aliases)",
+                    },
+                    "category": {
+                        "type": "string",
+                        "description": "Only aliases in this category",
+                    },
+                    "config_path": {
+                        "type": "string",
+                        "description": "Config file to read instead of the detected one",
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Fields to return (aliases: name, command, category, source; functions: name, body, source)",
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "next_cursor from the previous page",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Page size (default 50, max 500)",
+                    },
+                },
+            },
+        ),
+        Tool(
+            name="suggest_aliases",
+            description="Suggest new aliases for command prefixes you type often, ranked by keystrokes saved",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "limit": {
+                        "type": "integer",
+                        "description": "Number of suggestions (default 10)",
+                    },
+                    "min_count": {
+                        "type": "integer",
+                        "description": "Minimum times a prefix was typed (default 3)",
+                    },
+                    "config_path": {
+                        "type": "string",
+                        "description": "Config whose aliases to skip instead of the detected one",
+                    },
+                },
+            },
+        ),
+        Tool(
+            name="validate_aliases",
+            description="Find aliases and functions whose command is missing, that shadow an installed command, or that are redundant",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "config_path": {
+                        "type": "string",
+                        "description": "Path to shell config (optional, auto-detected)",
+                    },
+                },
+            },
+        ),
+        Tool(
+            name="list_examples",
+            description="List usage examples one page at a time",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tool": {
+                        "type": "string",
+                        "description": "Only examples for this tool",
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Fields to return (tool, use_case, command, description)",
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "next_cursor from the previous page",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Page size (default 50, max 500)",
+                    },
+                },
+            },
+        ),
+        Tool(
+            name="get_alias_changes",
+            description="Get aliases added, removed or changed since a generation number",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "since": {
+                        "type": "integer",
+                        "description": "Generation the client last saw (0 = startup)",
+                    },
+                },
+                "required": ["since"],
+            },
+        ),
         Tool(
             name="search_examples",
             description="Search for examples by keyword or description",
@@ -281,12 +1027,65 @@ async def list_tools() -> list[Tool]:
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls."""
-    logger.info(f"Calling tool: {name} with arguments: {arguments}")
+    # Arguments can be whole scripts; they're serialized only if emitted
+    tool_log.info("Calling tool", extra={"tool": name, "arguments": short(arguments)})
+    if name == "run_search":
+        # Streams a subprocess on the event loop rather than holding a worker
+        return await _run_search(arguments or {})
+    return await run_in_worker(get_profiler().run, "tool", name, _call_tool, name, arguments or {})
+
 
+async def _run_search(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle run_search."""
+    try:
+        tool = arguments.get("tool", "rg")
+        runner = get_search_runner()
+        executable = await run_in_worker(runner.resolve, tool) if tool in ("rg", "fd") else None
+        max_results = int(arguments["max_results"]) if arguments.get("max_results") else None
+
+        if tool not in ("rg", "fd"):
+            result = {"error": f"Unknown search tool: {tool}"}
+        elif executable is None:
+            result = {
+                "error": f"{tool} is not installed",
+                "install_command": get_tool_checker().get_installation_command(tool),
+            }
+        elif tool == "rg":
+            if not arguments.get("pattern"):
+                result = {"error": "rg needs a pattern"}
+            else:
+                result = await runner.search_content(
+                    executable,
+                    arguments["pattern"],
+                    arguments.get("path", "."),
+                    cwd=client_dir(arguments.get("path")),
+                    globs=arguments.get("glob"),
+                    ignore_case=bool(arguments.get("ignore_case")),
+                    fixed_strings=bool(arguments.get("fixed_strings")),
+                    max_results=max_results,
+                )
+        else:
+            result = await runner.search_files(
+                executable,
+                arguments.get("pattern"),
+                arguments.get("path", "."),
+                cwd=client_dir(arguments.get("path")),
+                extension=arguments.get("extension"),
+                file_type=arguments.get("type"),
+                max_results=max_results,
+            )
+    except Exception as e:
+        tool_log.error("Error running search: %s", e, extra={"tool": "run_search"})
+        result = {"error": str(e)}
+    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
+
+def _call_tool(name: str, arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle a tool call on a worker thread."""
     try:
         if name == "translate_command":
             command = arguments.get("command", "")
-            translation = translator.translate(command)
+            translation = get_translator().translate(command)
 
             if translation:
                 result = {
@@ -295,6 +1094,8 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
                     "explanation": translation.explanation,
                     "tool": translation.tool,
                 }
+                if translation.unsupported_flags:
+                    result["unsupported_flags"] = translation.unsupported_flags
             else:
                 result = {
                     "error": "Could not translate command",
@@ -304,16 +1105,49 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
 
             return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
+        elif name == "find_files":
+            start = time.perf_counter()
+            path = arguments.get("path")
+            index = get_project_indexes().get(os.path.join(client_dir(path), path or "."))
+            paths, total = index.find(
+                query=arguments.get("query"),
+                glob=arguments.get("glob"),
+                extension=arguments.get("extension"),
+                under=arguments.get("under"),
+                limit=int(arguments.get("limit", 50)),
+            )
+            result = {
+                "root": str(index.root),
+                "indexed_files": len(index),
+                "total": total,
+                "paths": paths,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+            if index.truncated:
+                result["index_truncated"] = True
+            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
+        elif name == "set_profiling":
+            profiler = get_profiler()
+            if "mode" in arguments:
+                mode = arguments["mode"]
+                profiler.configure(
+                    None if mode == "off" else mode,
+                    every=int(arguments.get("every", 1)),
+                    handlers=arguments.get("handlers"),
+                )
+            return [TextContent(type="text", text=json.dumps(profiler.status(), indent=2))]
+
         elif name == "check_tool":
             tool_name = arguments.get("tool_name", "")
-            info = tool_checker.check_tool(tool_name)
+            info = get_tool_checker().check_tool(tool_name)
 
             result = {
                 "name": info.name,
                 "installed": info.installed,
                 "version": info.version,
                 "path": info.path,
-                "install_command": tool_checker.get_installation_command(tool_name),
+                "install_command": get_tool_checker().get_installation_command(tool_name),
             }
 
             return [TextContent(type="text", text=json.dumps(result, indent=2))]
@@ -322,7 +1156,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             tool = arguments.get("tool", "")
             use_case = arguments.get("use_case")
 
-            examples = example_provider.get_examples(tool, use_case)
+            examples = get_example_provider().get_examples(tool, use_case)
 
             if not examples:
                 result = {"error": f"No examples found for tool: {tool}"}
@@ -333,26 +1167,63 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
 
         elif name == "explain_alias":
             alias_name = arguments.get("alias_name", "")
+            config_path = arguments.get("config_path")
 
-            if not alias_detector:
-                result = {"error": "No simpleminded-shell configuration detected"}
+            detector = get_alias_detector(config_path)
+            alias = detector.get_alias(alias_name) if detector else None
+            live_detector = None
+            if not alias and not config_path and os.environ.get("SIMPLEMINDED_LIVE_ALIASES"):
+                # Fall back to the live shell snapshot for plugin-defined aliases;
+                # it starts an interactive shell, so only when opted in
+                live_detector = get_live_snapshot().get()
+                alias = live_detector.get_alias(alias_name) if live_detector else None
+            if alias:
+                result = {
+                    "alias": alias_name,
+                    "command": alias.command,
+                    "category": alias.category,
+                    "source": alias.source,
+                    "explanation": get_translator().explain_alias(alias_name, alias.command),
+                }
+            elif not detector and not live_detector:
+                result = _no_config_error(config_path)
             else:
-                alias = alias_detector.get_alias(alias_name)
-                if alias:
-                    result = {
-                        "alias": alias_name,
-                        "command": alias.command,
-                        "category": alias.category,
-                        "explanation": translator.explain_alias(alias_name, alias.command),
-                    }
-                else:
-                    result = {"error": f"Alias not found: {alias_name}"}
+                result = {"error": f"Alias not found: {alias_name}"}
 
             return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
+        elif name == "list_aliases":
+            result = _alias_page(arguments)
+            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
+        elif name == "suggest_aliases":
+            result = get_alias_miner().suggest(
+                get_alias_detector(arguments.get("config_path")),
+                limit=int(arguments.get("limit", 10)),
+                min_count=int(arguments.get("min_count", 3)),
+            )
+            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
+        elif name == "validate_aliases":
+            config_path = arguments.get("config_path")
+            detector = get_alias_detector(config_path)
+            if detector:
+                result = get_alias_validator().validate(detector)
+            else:
+                result = _no_config_error(config_path)
+            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
+        elif name == "list_examples":
+            result = _example_page(arguments)
+            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
+        elif name == "get_alias_changes":
+            result = get_change_tracker().changes_since(int(arguments.get("since", 0)))
+            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
         elif name == "search_examples":
             query = arguments.get("query", "")
-            results = example_provider.search_examples(query)
+            results = get_example_provider().search_examples(query)
 
             result = {
                 "query": query,
@@ -364,7 +1235,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
 
         elif name == "get_tool_benefits":
             tool = arguments.get("tool", "")
-            benefits = translator.get_tool_benefits(tool)
+            benefits = get_translator().get_tool_benefits(tool)
 
             result = {
                 "tool": tool,
@@ -375,7 +1246,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
 
         elif name == "recommend_tools":
             task = arguments.get("task", "")
-            recommendations = example_provider.get_recommendations(task)
+            recommendations = get_example_provider().get_recommendations(task)
 
             result = {
                 "task": task,
@@ -388,7 +1259,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             return [TextContent(type="text", text=json.dumps({"error": f"Unknown tool: {name}"}))]
 
     except Exception as e:
-        logger.error(f"Error calling tool {name}: {e}")
+        tool_log.error("Error calling tool: %s", e, extra={"tool": name})
         return [TextContent(type="text", text=json.dumps({"error": str(e)}))]
 
 
@@ -396,14 +1267,76 @@ async def async_main():
     """Run the MCP server."""
     from mcp.server.stdio import stdio_server
 
-    async with stdio_server() as (read_stream, write_stream):
-        logger.info("Simpleminded Shell MCP Server starting...")
-        await app.run(read_stream, write_stream, app.create_initialization_options())
+    if os.environ.get("SIMPLEMINDED_LIVE_ALIASES"):
+        # Warm the snapshot while the client is still initializing
+        get_live_snapshot().refresh()
+
+    watcher = asyncio.create_task(watch_for_changes())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            logger.info("Simpleminded Shell MCP Server starting...")
+            await app.run(read_stream, write_stream, get_initialization_options())
+    finally:
+        watcher.cancel()
+
+
+def profile_startup(top: int = 15) -> None:
+    """Report where server startup time goes.
+
+    Imports this module in a fresh interpreter with ``-X importtime`` and
+    prints the slowest imports, then times creating each lazily built
+    component in this process.
+    """
+    import subprocess
+    import sys
+
+    module_name = __spec__.name if __spec__ else __name__
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        fields = line[len("import time:"):].split("|")
+        if line.startswith("import time:") and len(fields) == 3 and fields[0].strip().isdigit():
+            rows.append((int(fields[0]), int(fields[1]), fields[2].strip()))
+
+    total = next((row[1] for row in rows if row[2] == module_name), 0)
+    print(f"import {module_name}: {total / 1000:.1f} ms cumulative ({len(rows)} modules)")
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for self_us, cumulative_us, module in sorted(rows, reverse=True)[:top]:
+        print(f"{self_us / 1000:9.2f} {cumulative_us / 1000:9.2f}  {module}")
+
+    print("\nFirst-use component initialization:")
+    for label, factory in [
+        ("config state", get_config_state),
+        ("tool checker", get_tool_checker),
+        ("translator", get_translator),
+        ("example provider", get_example_provider),
+        ("live snapshot", get_live_snapshot),
+    ]:
+        start = time.perf_counter()
+        factory()
+        print(f"{(time.perf_counter() - start) * 1000:9.2f} ms  {label}")
 
 
 def main():
     """Entry point for the MCP server."""
-    import asyncio
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="simpleminded-mcp", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="report import and initialization times instead of serving",
+    )
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        profile_startup()
+        return
+    setup_logging()
     asyncio.run(async_main())
 
 
@@ -0,0 +1,124 @@
+"""Bridge stdio to the simpleminded-shell daemon, starting it if needed.
+
+Only the standard library is imported here: the shim's startup cost is a
+socket connect, and all MCP work happens in the daemon.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from .daemon import default_socket_path
+
+# How long to wait for an auto-started daemon to accept connections
+START_TIMEOUT = 10.0
+
+# Auto-started daemons exit after this long without sessions
+DEFAULT_IDLE_TIMEOUT = "1800"
+
+
+def connect(socket_path: Path) -> socket.socket:
+    """Connect to the daemon socket; raises OSError if nothing is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def start_daemon(socket_path: Path) -> None:
+    """Start a detached daemon listening on socket_path."""
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    log_path = socket_path.with_suffix(".log")
+    with open(log_path, "ab") as log:
+        subprocess.Popen(
+            [
+                sys.executable, "-m", f"{__package__}.daemon",
+                "--socket", str(socket_path),
+                "--idle-timeout", os.environ.get("SIMPLEMINDED_DAEMON_IDLE", DEFAULT_IDLE_TIMEOUT),
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            # Outlive this shim and the assistant session that started it
+            start_new_session=True,
+            # To import the package; sessions use the cwd each shim sends
+            cwd=str(Path(__file__).resolve().parent.parent),
+        )
+
+
+def connect_or_start(socket_path: Path) -> socket.socket:
+    """Connect to the daemon, starting one if none is running."""
+    try:
+        return connect(socket_path)
+    except OSError:
+        pass
+
+    start_daemon(socket_path)
+    deadline = time.monotonic() + START_TIMEOUT
+    while True:
+        try:
+            return connect(socket_path)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def _pump_stdin(sock: socket.socket) -> None:
+    """Copy stdin to the socket until EOF, then half-close it."""
+    stdin = sys.stdin.buffer.fileno()
+    try:
+        while True:
+            data = os.read(stdin, 65536)
+            if not data:
+                break
+            sock.sendall(data)
+    except OSError:
+        pass
+    finally:
+        try:
+            sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+
+def bridge(sock: socket.socket) -> None:
+    """Relay bytes between stdio and the socket until the daemon hangs up.
+
+    The first line sent is the shim's working directory, which the daemon
+    resolves the session's relative paths against.
+    """
+    sock.sendall(json.dumps({"cwd": os.getcwd()}).encode() + b"\n")
+    threading.Thread(target=_pump_stdin, args=(sock,), daemon=True).start()
+    stdout = sys.stdout.buffer.fileno()
+    while True:
+        data = sock.recv(65536)
+        if not data:
+            break
+        while data:
+            written = os.write(stdout, data)
+            data = data[written:]
+
+
+def main():
+    """Entry point for the stdio shim."""
+    socket_path = default_socket_path()
+    try:
+        sock = connect_or_start(socket_path)
+    except OSError as e:
+        print(f"simpleminded-mcp-shim: can't reach daemon at {socket_path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    with sock:
+        bridge(sock)
+
+
+if __name__ == "__main__":
+    main()
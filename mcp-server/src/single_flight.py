@@ -0,0 +1,118 @@
+"""Share one in-flight call between concurrent requests for the same key."""
+
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple
+
+# Every live instance; several can share a name (one per ToolChecker, ...)
+_registry: "weakref.WeakSet[SingleFlight]" = weakref.WeakSet()
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls by key.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait on the same future and get its result (or exception). Nothing
+    is cached once the call finishes, that is left to the caller.
+    """
+
+    def __init__(self, name: str):
+        """Initialize and register under a name for stats reporting."""
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.executed = 0
+        self.shared = 0
+        _registry.add(self)
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a call for a key is running."""
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key: Hashable, func: Callable, *args) -> Any:
+        """Run func(*args) for a key, or wait for the call already running."""
+        with self._lock:
+            future = self._calls.get(key)
+            owner = future is None
+            if owner:
+                future = self._calls[key] = Future()
+                self.executed += 1
+            else:
+                self.shared += 1
+        if not owner:
+            return future.result()
+
+        try:
+            future.set_result(func(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+    def do_many(self, keys: Iterable[Hashable], func: Callable[[List], Dict]) -> Dict:
+        """Run one batched call for the keys nobody else is working on.
+
+        ``func`` gets the list of keys this caller owns and returns a dict of
+        results for them; keys already in flight are waited on instead.
+        """
+        owned: List[Tuple[Hashable, Future]] = []
+        waiting: List[Tuple[Hashable, Future]] = []
+        with self._lock:
+            for key in keys:
+                future = self._calls.get(key)
+                if future is not None:
+                    self.shared += 1
+                    waiting.append((key, future))
+                else:
+                    future = self._calls[key] = Future()
+                    self.executed += 1
+                    owned.append((key, future))
+
+        results: Dict = {}
+        if owned:
+            try:
+                batch = func([key for key, _ in owned])
+                for key, future in owned:
+                    if key in batch:
+                        future.set_result(batch[key])
+                    else:
+                        future.set_exception(KeyError(key))
+            except BaseException as e:
+                for key, future in owned:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                with self._lock:
+                    for key, _ in owned:
+                        del self._calls[key]
+
+        for key, future in owned + waiting:
+            if future.exception() is None:
+                results[key] = future.result()
+        return results
+
+    def get_stats(self) -> Dict:
+        """Count calls executed and duplicates that shared one."""
+        with self._lock:
+            in_flight = len(self._calls)
+        return {
+            "executed": self.executed,
+            "shared": self.shared,
+            "in_flight": in_flight,
+        }
+
+
+def get_flight_stats() -> Dict[str, Dict]:
+    """Stats of every live SingleFlight, added up per name."""
+    totals: Dict[str, Dict] = {}
+    for flight in list(_registry):
+        stats = flight.get_stats()
+        total = totals.setdefault(flight.name, {"executed": 0, "shared": 0, "in_flight": 0, "instances": 0})
+        for field, value in stats.items():
+            total[field] += value
+        total["instances"] += 1
+    return dict(sorted(totals.items()))
@@ -0,0 +1,153 @@
+"""Persist parsed config snapshots for fast warm starts."""
+
+import hashlib
+import marshal
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .alias_detector import Alias, AliasDetector, ShellFunction
+
+# Bump when the stored layout changes; marshal data is also tied to the
+# Python minor version, so that is part of the header too.
+FORMAT_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """Get the per-user cache directory for simpleminded-shell."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "simpleminded-shell"
+
+
+def temp_path(path) -> Path:
+    """Temporary file next to path for an atomic write-then-replace.
+
+    The name includes the process and thread, so concurrent writers of the
+    same entry don't truncate each other's file before os.replace.
+    """
+    path = Path(path)
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+class SnapshotCache:
+    """Cache parsed aliases and functions per config file.
+
+    Each entry is a single marshal file holding the parsed records together
+    with the source file's path, size, mtime and SHA-256. An entry is reused
+    when path, size and mtime match, or when only the mtime moved but the
+    content hash is unchanged (e.g. after a `touch`); otherwise the config is
+    re-parsed and the entry rewritten.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """Initialize with an optional cache directory."""
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / "snapshots"
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, config_path: Path) -> Path:
+        """Cache file for a config path."""
+        digest = hashlib.sha1(str(config_path).encode()).hexdigest()[:16]
+        return self.cache_dir / f"{config_path.name.lstrip('.')}-{digest}.marshal"
+
+    def _stat_key(self, config_path: Path) -> Optional[Tuple]:
+        """Cache key without the hash: (format, python, path, size, mtime_ns)."""
+        try:
+            stat = config_path.stat()
+        except OSError:
+            return None
+        return (
+            FORMAT_VERSION,
+            tuple(sys.version_info[:2]),
+            str(config_path),
+            stat.st_size,
+            stat.st_mtime_ns,
+        )
+
+    @staticmethod
+    def _content_hash(content: str) -> str:
+        """SHA-256 of the config content."""
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def load(self, config_path: Path, content: str) -> Optional[AliasDetector]:
+        """Load a cached snapshot if it still matches the config file."""
+        key = self._stat_key(config_path)
+        if key is None:
+            return None
+        try:
+            data = self._entry_path(config_path).read_bytes()
+            stored_key, aliases, functions = marshal.loads(data)
+            if tuple(stored_key[:4]) != key[:4]:
+                return None
+        except (OSError, EOFError, ValueError, TypeError, IndexError):
+            return None
+        if stored_key[4] != key[4]:
+            # Only hash when the mtime moved: a touch keeps the entry valid
+            content_hash = self._content_hash(content)
+            if stored_key[5] != content_hash:
+                return None
+            self._write(config_path, (key + (content_hash,), aliases, functions))
+
+        return AliasDetector.from_parsed(
+            {
+                row[0]: Alias(
+                    name=row[0],
+                    command=row[1],
+                    category=sys.intern(row[2]) if row[2] else row[2],
+                    description=row[3],
+                    source=row[4],
+                )
+                for row in aliases
+            },
+            {
+                row[0]: ShellFunction(
+                    name=row[0], body=row[1], description=row[2], source=row[3]
+                )
+                for row in functions
+            },
+        )
+
+    def store(self, config_path: Path, content: str, detector: AliasDetector) -> None:
+        """Write a snapshot of a parsed config; failures are ignored."""
+        key = self._stat_key(config_path)
+        if key is None:
+            return
+        key += (self._content_hash(content),)
+        aliases = [
+            (a.name, a.command, a.category, a.description, a.source)
+            for a in detector.parse_aliases().values()
+        ]
+        functions = [
+            (f.name, f.body, f.description, f.source)
+            for f in detector.parse_functions().values()
+        ]
+        self._write(config_path, (key, aliases, functions))
+
+    def _write(self, config_path: Path, entry_data: Tuple) -> None:
+        """Atomically write a cache entry; failures are ignored."""
+        entry = self._entry_path(config_path)
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            tmp = temp_path(entry)
+            tmp.write_bytes(marshal.dumps(entry_data))
+            os.replace(tmp, entry)
+        except OSError:
+            pass
+
+    def get_detector(self, config_path: Path, content: str) -> AliasDetector:
+        """Get a detector for a config, from cache or by parsing it."""
+        config_path = Path(config_path)
+        detector = self.load(config_path, content)
+        if detector is not None:
+            self.hits += 1
+            return detector
+
+        self.misses += 1
+        detector = AliasDetector(content, source=str(config_path))
+        detector.parse_aliases()
+        detector.parse_functions()
+        self.store(config_path, content, detector)
+        return detector
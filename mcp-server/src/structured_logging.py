@@ -0,0 +1,200 @@
+"""Low-overhead structured logging for the server and daemon.
+
+Records are handed to a queue unformatted and formatted by a background
+listener thread, so a handler thread pays for creating the record and
+nothing else: no message formatting and no stderr write. Request arguments
+are wrapped with short() so they are only serialized, and truncated, if the
+record is actually emitted.
+
+Loggers are per category (``simpleminded.tools``, ``simpleminded.resources``,
+...) so each can have its own level and sampling rate:
+
+    SIMPLEMINDED_LOG_LEVEL=info                  default level
+    SIMPLEMINDED_LOG_LEVELS=tools=debug,watch=warning
+    SIMPLEMINDED_LOG_SAMPLE=resources=100        keep 1 in 100 records below WARNING
+    SIMPLEMINDED_LOG_FORMAT=json                 one JSON object per line (default: text)
+"""
+
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+ROOT_LOGGER = "simpleminded"
+
+# Characters of an argument kept in a log line
+MAX_ARG_CHARS = 200
+
+# LogRecord attributes; anything else on a record came from extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def get_logger(category: str) -> logging.Logger:
+    """Logger for a category, e.g. get_logger("tools")."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{category}")
+
+
+class Truncated:
+    """A log argument rendered, and cut to length, only when formatted."""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int = MAX_ARG_CHARS):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        value = _shrink(self.value, self.limit)
+        if isinstance(value, str):
+            text = value
+        else:
+            try:
+                text = json.dumps(value, default=str, ensure_ascii=False)
+            except (TypeError, ValueError):
+                text = repr(value)
+        if len(text) > self.limit:
+            return text[:self.limit] + "..."
+        return text
+
+    __repr__ = __str__
+
+
+def _shrink(value: Any, limit: int) -> Any:
+    """Cut long strings and lists inside a value before it is serialized."""
+    if isinstance(value, str):
+        return value[:limit + 1]
+    if isinstance(value, dict):
+        return {key: _shrink(item, limit) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_shrink(item, limit) for item in value[:limit]]
+    return value
+
+
+def short(value: Any, limit: int = MAX_ARG_CHARS) -> Truncated:
+    """Wrap a log argument so it is serialized lazily and truncated."""
+    return Truncated(value, limit)
+
+
+class SampleFilter(logging.Filter):
+    """Let through one in ``every`` records below WARNING; warnings always pass."""
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or next(self._counter) % self.every == 0
+
+
+class StructuredFormatter(logging.Formatter):
+    """Format a record and its extra= fields as text or a JSON line."""
+
+    def __init__(self, json_lines: bool = False):
+        super().__init__()
+        self.json_lines = json_lines
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        fields = {
+            key: value for key, value in record.__dict__.items()
+            if key not in _RECORD_ATTRS and not key.startswith("_")
+        }
+        if self.json_lines:
+            entry = {
+                "time": round(record.created, 3),
+                "level": record.levelname,
+                "logger": record.name,
+                "message": message,
+                **fields,
+            }
+            if record.exc_info:
+                entry["exception"] = self.formatException(record.exc_info)
+            return json.dumps(entry, default=str, ensure_ascii=False)
+
+        text = f"{self.formatTime(record)} {record.levelname} {record.name}: {message}"
+        if fields:
+            text += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            text += "\n" + self.formatException(record.exc_info)
+        return text
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue records as they are; the listener thread formats them.
+
+    The stock QueueHandler formats the message in the logging thread so
+    records can be pickled; this queue never leaves the process.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _parse_pairs(value: Optional[str]) -> Dict[str, str]:
+    """Parse "a=1,b=2" into a dict."""
+    pairs = {}
+    for item in (value or "").split(","):
+        key, sep, val = item.partition("=")
+        if sep and key.strip():
+            pairs[key.strip()] = val.strip()
+    return pairs
+
+
+def setup_logging(stream=None) -> QueueListener:
+    """Route all logging through a background queue listener writing to stderr.
+
+    Reads the SIMPLEMINDED_LOG_* settings described in the module docstring
+    and returns the started listener (stopped automatically at exit).
+    """
+    # The formatter doesn't print caller, thread or process, so skip
+    # collecting them for every record (see "Optimization" in the logging docs)
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    # A mistyped setting is reported once logging works, and otherwise ignored
+    problems = []
+    level = os.environ.get("SIMPLEMINDED_LOG_LEVEL", "INFO")
+    try:
+        root.setLevel(level.upper())
+    except (ValueError, TypeError):
+        problems.append(f"SIMPLEMINDED_LOG_LEVEL={level}")
+        root.setLevel(logging.INFO)
+
+    for category, level in _parse_pairs(os.environ.get("SIMPLEMINDED_LOG_LEVELS")).items():
+        try:
+            get_logger(category).setLevel(level.upper())
+        except (ValueError, TypeError):
+            problems.append(f"SIMPLEMINDED_LOG_LEVELS {category}={level}")
+    for category, every in _parse_pairs(os.environ.get("SIMPLEMINDED_LOG_SAMPLE")).items():
+        try:
+            get_logger(category).addFilter(SampleFilter(int(every)))
+        except (ValueError, TypeError):
+            problems.append(f"SIMPLEMINDED_LOG_SAMPLE {category}={every}")
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(StructuredFormatter(os.environ.get("SIMPLEMINDED_LOG_FORMAT") == "json"))
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    root.addHandler(DeferredQueueHandler(records))
+    listener = QueueListener(records, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(_flush, listener)
+    for problem in problems:
+        get_logger("logging").warning("Ignoring invalid setting %s", problem)
+    return listener
+
+
+def _flush(listener: QueueListener) -> None:
+    """Stop a listener at exit, writing out queued records, unless already stopped."""
+    if listener._thread is not None:
+        listener.stop()
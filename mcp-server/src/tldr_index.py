@@ -0,0 +1,281 @@
+"""Read tealdeer's local tldr page cache without running tldr."""
+
+import bisect
+import hashlib
+import marshal
+import mmap
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from .snapshot_cache import default_cache_dir, temp_path
+
+# Bump when the index layout changes
+FORMAT_VERSION = 1
+
+# Packs replaced longer ago than this are deleted; readers that loaded an
+# older index between checks keep theirs until then
+STALE_PACK_AGE = 24 * 60 * 60
+
+# tldr platform directory for sys.platform
+PLATFORMS = {"darwin": "osx", "win32": "windows", "linux": "linux"}
+
+_OPTION_PLACEHOLDER = re.compile(r"\{\{\[([^|\]]*)\|([^\]]*)\]\}\}")
+_PLACEHOLDER = re.compile(r"\{\{(.*?)\}\}")
+
+
+def default_tldr_dir() -> Path:
+    """tealdeer's cache directory: $TEALDEER_CACHE_DIR or the platform cache dir."""
+    if os.environ.get("TEALDEER_CACHE_DIR"):
+        return Path(os.environ["TEALDEER_CACHE_DIR"]).expanduser()
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "tealdeer"
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "tealdeer"
+
+
+def _slug(text: str) -> str:
+    """use_case name for an example description."""
+    return "_".join(re.findall(r"[a-z0-9]+", text.lower())[:6])
+
+
+def parse_page(name: str, text: str) -> List[Dict]:
+    """Examples in a tldr page: each "- description:" followed by a `command`.
+
+    Placeholders such as ``{{path/to/file}}`` lose their braces, and option
+    placeholders like ``{{[-r|--recursive]}}`` use the long form.
+    """
+    examples = []
+    description = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("- "):
+            description = line[2:].rstrip(":").strip()
+        elif line.startswith("`") and line.endswith("`") and description:
+            command = _OPTION_PLACEHOLDER.sub(r"\2", line[1:-1])
+            command = _PLACEHOLDER.sub(r"\1", command)
+            examples.append({
+                "use_case": _slug(description) or name,
+                "command": command,
+                "description": description,
+                "source": "tldr",
+            })
+            description = None
+    return examples
+
+
+@dataclass(frozen=True, slots=True)
+class PageIndex:
+    """One installed index. It is replaced as a whole, so a reader that
+    took it never pairs one pack's offsets with another's blob."""
+    signature: Tuple
+    blob: Optional[Path]
+    offsets: Dict[str, Tuple[int, int]]
+    # Page start offsets, ascending, and the page starting at each
+    starts: Tuple[int, ...]
+    names: Tuple[str, ...]
+    # Pages held in memory when the pack couldn't be written
+    memory: bytes = b""
+
+    def read(self, start: int, length: int) -> bytes:
+        """Bytes of the packed pages."""
+        if self.blob is None:
+            return self.memory[start:start + length]
+        with open(self.blob, "rb") as f:
+            f.seek(start)
+            return f.read(length)
+
+
+class TldrIndex:
+    """Pages from tealdeer's cache, packed into one blob with an offset index.
+
+    The common pages and the current platform's (which take precedence) are
+    concatenated into ``pages-<digest>.bin`` under the cache directory, with a
+    marshal index of command -> (offset, length). A page lookup reads just its
+    slice. The pack is rebuilt only when a page directory's mtime changes,
+    which tealdeer's ``--update`` causes by extracting a fresh archive.
+    """
+
+    def __init__(self, tldr_dir: Optional[Path] = None, index_dir: Optional[Path] = None,
+                 language: str = "en", platform: Optional[str] = None):
+        """Initialize with tealdeer's cache dir and where to keep the index."""
+        self.tldr_dir = Path(tldr_dir) if tldr_dir else default_tldr_dir()
+        self.index_dir = Path(index_dir) if index_dir else default_cache_dir() / "tldr"
+        self.language = language
+        self.platform = platform or PLATFORMS.get(sys.platform, "linux")
+        self._lock = threading.Lock()
+        self._index: Optional[PageIndex] = None
+
+    def _page_dirs(self) -> List[Path]:
+        """Existing page directories, lowest precedence first."""
+        roots = [
+            self.tldr_dir / "tldr-pages" / f"pages.{self.language}",
+            # tealdeer before 1.7 kept the English pages in tldr-master/pages
+            self.tldr_dir / "tldr-master" / ("pages" if self.language == "en" else f"pages.{self.language}"),
+        ]
+        for root in roots:
+            if root.is_dir():
+                return [d for d in (root / "common", root / self.platform) if d.is_dir()]
+        return []
+
+    def _current_signature(self) -> Tuple:
+        """(path, mtime_ns) of each page directory."""
+        signature = []
+        for page_dir in self._page_dirs():
+            try:
+                signature.append((str(page_dir), page_dir.stat().st_mtime_ns))
+            except OSError:
+                pass
+        return tuple(signature)
+
+    def _ensure(self) -> PageIndex:
+        """The current index, loaded or rebuilt if the page cache changed."""
+        signature = self._current_signature()
+        index = self._index
+        if index is not None and index.signature == signature:
+            return index
+        with self._lock:
+            if self._index is None or self._index.signature != signature:
+                if not signature:
+                    self._set(signature, None, {})
+                elif not self._load_index(signature):
+                    self._build(signature)
+            return self._index
+
+    def _set(self, signature: Tuple, blob: Optional[Path], offsets: Dict[str, Tuple[int, int]],
+             memory: bytes = b"") -> None:
+        """Install an index with a single assignment."""
+        ordered = sorted((start, name) for name, (start, _) in offsets.items())
+        self._index = PageIndex(
+            signature, blob, offsets,
+            tuple(start for start, _ in ordered), tuple(name for _, name in ordered), memory,
+        )
+
+    def _blob_path(self, signature: Tuple) -> Path:
+        """Pack file for a signature, so readers of an older index keep their blob."""
+        digest = hashlib.sha1(repr((FORMAT_VERSION, signature)).encode()).hexdigest()[:16]
+        return self.index_dir / f"pages-{digest}.bin"
+
+    def _load_index(self, signature: Tuple) -> bool:
+        """Use the stored index if it was built from the same pages."""
+        try:
+            stored_signature, offsets = marshal.loads((self.index_dir / "index.marshal").read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+        blob = self._blob_path(signature)
+        if tuple(map(tuple, stored_signature)) != signature or not blob.exists():
+            return False
+        self._set(signature, blob, offsets)
+        return True
+
+    def _build(self, signature: Tuple) -> None:
+        """Pack every page into a new blob and write its index."""
+        pages: Dict[str, Path] = {}
+        for page_dir in self._page_dirs():
+            for page in page_dir.glob("*.md"):
+                pages[page.stem] = page
+
+        chunks = []
+        offsets: Dict[str, Tuple[int, int]] = {}
+        position = 0
+        for name in sorted(pages):
+            try:
+                data = pages[name].read_bytes()
+            except OSError:
+                continue
+            offsets[name] = (position, len(data))
+            chunks.append(data)
+            position += len(data)
+
+        blob = self._blob_path(signature)
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            tmp = temp_path(blob)
+            tmp.write_bytes(b"".join(chunks))
+            os.replace(tmp, blob)
+            index = self.index_dir / "index.marshal"
+            tmp = temp_path(index)
+            tmp.write_bytes(marshal.dumps((signature, offsets)))
+            os.replace(tmp, index)
+        except OSError:
+            pass
+        self._remove_stale_packs(blob)
+        if blob.exists():
+            self._set(signature, blob, offsets)
+        else:
+            # Unwritable cache dir: serve from memory this time
+            self._set(signature, None, offsets, b"".join(chunks))
+
+    def _remove_stale_packs(self, current: Path) -> None:
+        """Delete packs other than current that haven't been written for a day."""
+        cutoff = time.time() - STALE_PACK_AGE
+        for old in self.index_dir.glob("pages-*.bin"):
+            try:
+                if old != current and old.stat().st_mtime < cutoff:
+                    old.unlink()
+            except OSError:
+                pass
+
+    def commands(self) -> List[str]:
+        """Commands that have a page."""
+        return sorted(self._ensure().offsets)
+
+    def page(self, command: str) -> Optional[str]:
+        """Raw markdown of a command's page; "git commit" finds git-commit."""
+        index = self._ensure()
+        entry = index.offsets.get(command.strip().replace(" ", "-").lower())
+        if entry is None:
+            return None
+        try:
+            return index.read(*entry).decode("utf-8", errors="replace")
+        except OSError:
+            return None
+
+    def get_examples(self, command: str) -> List[Dict]:
+        """Parsed examples of a command's page."""
+        text = self.page(command)
+        return parse_page(command, text) if text else []
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """Examples whose command or description contains query, with their tool.
+
+        The pack is memory-mapped and scanned with a case-insensitive pattern,
+        so it is never copied into memory; only pages with a hit are parsed.
+        """
+        index = self._ensure()
+        if not query or not index.offsets:
+            return []
+        pattern = re.compile(re.escape(query.encode()), re.IGNORECASE)
+        if index.blob is None:
+            return self._search(index, pattern, query, index.memory, limit)
+        try:
+            with open(index.blob, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self._search(index, pattern, query, data, limit)
+        except (OSError, ValueError):
+            # Missing or empty pack
+            return []
+
+    @staticmethod
+    def _search(index: PageIndex, pattern: Pattern[bytes], query: str, data, limit: int) -> List[Dict]:
+        """Examples from the pages of data that match pattern."""
+        results: List[Dict] = []
+        seen = set()
+        match = pattern.search(data)
+        while match and len(results) < limit:
+            name = index.names[bisect.bisect_right(index.starts, match.start()) - 1]
+            start, length = index.offsets[name]
+            if name not in seen:
+                seen.add(name)
+                text = bytes(data[start:start + length]).decode("utf-8", errors="replace")
+                for example in parse_page(name, text):
+                    text = f"{example['command']}\n{example['description']}\n{name}".lower()
+                    if query.lower() in text:
+                        results.append({"tool": name, **example})
+            # Continue after this page
+            match = pattern.search(data, start + length)
+        return results[:limit]
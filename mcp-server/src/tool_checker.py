@@ -1,12 +1,18 @@
 """Check for installed tools and their versions."""
 
+import os
 import subprocess
 import re
+import shlex
+import tempfile
+import threading
 from typing import Dict, Optional, List
 from dataclasses import dataclass
 
+from .single_flight import SingleFlight
 
-@dataclass
+
+@dataclass(slots=True)
 class ToolInfo:
     """Information about an installed tool."""
     name: str
@@ -36,14 +42,41 @@ class ToolChecker:
         "ollama": {"brew": "ollama", "version_flag": "--version", "version_pattern": r"ollama version is (\d+\.\d+\.\d+)"},
     }
 
-    def __init__(self):
-        """Initialize tool checker."""
+    # Delimiters written by the batched probe script
+    PROBE_MARKER = "@@SIMPLEMINDED-PROBE@@"
+    PROBE_STATUS = "@@SIMPLEMINDED-STATUS@@"
+
+    # Exit statuses of a probe cut off by its time limit (timeout / SIGKILL / SIGTERM)
+    PROBE_KILLED = {"124", "137", "143"}
+
+    def __init__(self, batch_probe: bool = True, probe_timeout: float = 2.0):
+        """Initialize tool checker.
+
+        With batch_probe, check_all_tools resolves paths and versions of every
+        uncached tool in a single `sh` process instead of two per tool.
+        """
         self._cache: Dict[str, ToolInfo] = {}
+        # Guards _cache; probes run outside it so checks overlap
+        self._lock = threading.Lock()
+        # Concurrent checks of the same tool share one probe
+        self._flight = SingleFlight("tool_probe")
+        self.batch_probe = batch_probe
+        self.probe_timeout = probe_timeout
 
     def check_tool(self, tool_name: str) -> ToolInfo:
         """Check if a tool is installed and get its version."""
-        if tool_name in self._cache:
-            return self._cache[tool_name]
+        with self._lock:
+            cached = self._cache.get(tool_name)
+        if cached is not None:
+            return cached
+        return self._flight.do(tool_name, self._check_uncached, tool_name)
+
+    def _check_uncached(self, tool_name: str) -> ToolInfo:
+        """Probe one tool and cache the result."""
+        with self._lock:
+            cached = self._cache.get(tool_name)
+        if cached is not None:
+            return cached
 
         tool_config = self.SIMPLEMINDED_TOOLS.get(tool_name)
         if not tool_config:
@@ -57,7 +90,8 @@ class ToolChecker:
                 installed=False,
                 brew_package=tool_config["brew"]
             )
-            self._cache[tool_name] = info
+            with self._lock:
+                self._cache[tool_name] = info
             return info
 
         # Get version
@@ -70,7 +104,8 @@ class ToolChecker:
             path=path,
             brew_package=tool_config["brew"]
         )
-        self._cache[tool_name] = info
+        with self._lock:
+            self._cache[tool_name] = info
         return info
 
     def _get_command_path(self, command: str) -> Optional[str]:
@@ -114,28 +149,138 @@ class ToolChecker:
             )
 
             if result.returncode == 0:
-                output = result.stdout + result.stderr
-                pattern = tool_config.get("version_pattern")
-                if pattern:
-                    match = re.search(pattern, output)
-                    if match:
-                        return match.group(1)
-
-                # Fallback: return first line
-                return output.split("\n")[0].strip()
+                return self._parse_version(result.stdout + result.stderr, tool_config)
 
         except Exception:
             pass
 
         return None
 
+    def _parse_version(self, output: str, tool_config: Dict) -> Optional[str]:
+        """Extract a version from --version output."""
+        pattern = tool_config.get("version_pattern")
+        if pattern:
+            match = re.search(pattern, output)
+            if match:
+                return match.group(1)
+
+        # Fallback: return first line
+        return output.strip().split("\n")[0].strip()
+
+    def _build_probe_script(self, tool_names: List[str]) -> str:
+        """Build one sh script that locates and version-probes every tool.
+
+        Each probe is limited to probe_timeout seconds, so a hanging tool
+        can't stall the others: through `timeout` where it exists (one extra
+        process per tool), otherwise under a background watchdog that takes
+        its `sleep` down with it when cancelled. Paths are looked up with the
+        `command -v` builtin rather than a subshell. Probe output goes to the
+        scratch file passed as $1 and is echoed back with shell builtins, so
+        stray grandchildren never hold our stdout open.
+        """
+        timeout = shlex.quote(str(self.probe_timeout))
+        lines = ["if command -v timeout >/dev/null 2>&1; then t=1; else t=; fi"]
+        for tool_name in tool_names:
+            tool = shlex.quote(tool_name)
+            flag = shlex.quote(self.SIMPLEMINDED_TOOLS[tool_name].get("version_flag", "--version"))
+            lines.append(
+                f"printf '\\n%s %s\\n' {self.PROBE_MARKER} {tool}\n"
+                f"if command -v {tool} 2>/dev/null; then\n"
+                f"  if [ -n \"$t\" ]; then\n"
+                f"    timeout -s KILL {timeout} {tool} {flag} </dev/null >\"$1\" 2>&1; rc=$?\n"
+                f"  else\n"
+                f"    {tool} {flag} </dev/null >\"$1\" 2>&1 & pid=$!\n"
+                f"    (trap 'kill $s; exit 0' TERM; sleep {timeout} & s=$!; wait $s; kill -9 $pid) >/dev/null 2>&1 & watchdog=$!\n"
+                f"    wait $pid; rc=$?\n"
+                f"    kill $watchdog >/dev/null 2>&1; wait $watchdog\n"
+                f"  fi\n"
+                f"  while IFS= read -r line || [ -n \"$line\" ]; do printf '%s\\n' \"$line\"; done <\"$1\"\n"
+                f"  printf '\\n%s %s\\n' {self.PROBE_STATUS} $rc\n"
+                f"else\n"
+                f"  printf '\\n'\n"
+                f"fi"
+            )
+        return "\n".join(lines) + "\n"
+
+    def _probe_batch(self, tool_names: List[str]) -> Dict[str, ToolInfo]:
+        """Probe several tools with a single subprocess.
+
+        Tools whose probe was killed, or that the batch never reached, fall
+        back to the per-tool check.
+        """
+        script = self._build_probe_script(tool_names)
+        try:
+            with tempfile.NamedTemporaryFile(prefix="simpleminded-probe-") as scratch:
+                result = subprocess.run(
+                    ["sh", "-c", script, "sh", scratch.name],
+                    capture_output=True,
+                    text=True,
+                    timeout=self.probe_timeout * len(tool_names) + 5,
+                )
+            output = result.stdout
+        except subprocess.TimeoutExpired as e:
+            output = e.stdout or ""
+            if isinstance(output, bytes):
+                output = output.decode(errors="replace")
+        except Exception:
+            output = ""
+
+        results: Dict[str, ToolInfo] = {}
+        for section in output.split(self.PROBE_MARKER + " ")[1:]:
+            tool_name, _, rest = section.partition("\n")
+            tool_config = self.SIMPLEMINDED_TOOLS.get(tool_name)
+            if not tool_config:
+                continue
+            path, _, rest = rest.partition("\n")
+            if not path:
+                results[tool_name] = ToolInfo(
+                    name=tool_name,
+                    installed=False,
+                    brew_package=tool_config["brew"]
+                )
+                continue
+
+            version_output, found, status = rest.rpartition(self.PROBE_STATUS + " ")
+            status = status.strip()
+            if not found or status in self.PROBE_KILLED:
+                # Hung or cut off: leave it to the per-tool fallback
+                continue
+
+            version = None
+            if status == "0":
+                version = self._parse_version(version_output, tool_config)
+            results[tool_name] = ToolInfo(
+                name=tool_name,
+                installed=True,
+                version=version,
+                path=path,
+                brew_package=tool_config["brew"]
+            )
+
+        for tool_name in tool_names:
+            if tool_name not in results:
+                results[tool_name] = self._check_uncached(tool_name)
+        return results
+
     def check_all_tools(self) -> Dict[str, ToolInfo]:
         """Check all simpleminded-shell tools."""
+        with self._lock:
+            pending = [name for name in self.SIMPLEMINDED_TOOLS if name not in self._cache]
+        if self.batch_probe and len(pending) > 1:
+            self._flight.do_many(pending, self._probe_and_cache)
+
         results = {}
         for tool_name in self.SIMPLEMINDED_TOOLS.keys():
             results[tool_name] = self.check_tool(tool_name)
         return results
 
+    def _probe_and_cache(self, tool_names: List[str]) -> Dict[str, ToolInfo]:
+        """Batch-probe tools and cache the results."""
+        probed = self._probe_batch(tool_names)
+        with self._lock:
+            self._cache.update(probed)
+        return probed
+
     def get_installed_tools(self) -> List[ToolInfo]:
         """Get list of installed tools only."""
         all_tools = self.check_all_tools()
@@ -182,6 +327,21 @@ class ToolChecker:
             ]
         }
 
+    def get_path_signature(self) -> tuple:
+        """Modification times of the $PATH directories.
+
+        Installing or removing a binary touches its directory, so a changed
+        signature means cached tool status may be stale.
+        """
+        signature = []
+        for directory in os.environ.get("PATH", "").split(os.pathsep):
+            try:
+                signature.append((directory, os.stat(directory).st_mtime_ns))
+            except OSError:
+                signature.append((directory, None))
+        return tuple(signature)
+
     def clear_cache(self) -> None:
         """Clear the tool information cache."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
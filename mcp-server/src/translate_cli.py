@@ -0,0 +1,270 @@
+"""Translate grep/find/cat/ls usage in shell scripts and Makefiles.
+
+Walks the given files and directories, translates each command line with
+the flag-level translation engine in a pool of worker processes, and prints
+a unified diff (or rewrites files with --in-place) followed by how often each
+translation rule fired. Only translations the engine marks exact are written,
+with fd/rg told to search hidden and ignored files as find/grep do; lines left
+alone because no exact translation exists are listed on stderr.
+"""
+
+import difflib
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .command_translator import CommandTranslator
+from .snapshot_cache import temp_path
+from .translation_engine import tokenize
+
+SCRIPT_SUFFIXES = {".sh", ".bash", ".zsh", ".ksh", ".mk"}
+MAKEFILE_NAMES = {"Makefile", "makefile", "GNUmakefile"}
+SHEBANG_SHELLS = (b"sh", b"bash", b"zsh", b"ksh", b"dash")
+SKIP_DIRS = {".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv"}
+
+# Commands the engine rewrites; lines using them with redirections are skipped
+TRANSLATED_COMMANDS = set(CommandTranslator.TARGETS)
+
+# Files per task sent to a worker; amortizes inter-process overhead
+CHUNK_SIZE = 16
+
+_translator: Optional[CommandTranslator] = None
+
+
+@dataclass(slots=True)
+class FileResult:
+    """Outcome of translating one file."""
+    path: str
+    diff: str = ""
+    changed_lines: int = 0
+    # (line number, line) of commands left alone for lack of an exact translation
+    skipped: List[Tuple[int, str]] = field(default_factory=list)
+    rule_counts: Counter = field(default_factory=Counter)
+    error: Optional[str] = None
+
+
+def is_script(path: Path) -> bool:
+    """Check whether a file is a shell script or Makefile."""
+    if path.name in MAKEFILE_NAMES or path.suffix in SCRIPT_SUFFIXES:
+        return True
+    if path.suffix:
+        return False
+    try:
+        with open(path, "rb") as f:
+            first_line = f.readline(128)
+    except OSError:
+        return False
+    return first_line.startswith(b"#!") and first_line.rstrip().endswith(SHEBANG_SHELLS)
+
+
+def iter_scripts(paths: Iterable[str]) -> Iterator[str]:
+    """Yield script files under the given paths, in sorted order per directory."""
+    for raw in paths:
+        path = Path(raw)
+        if path.is_file():
+            yield str(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+            for name in sorted(files):
+                file_path = Path(root) / name
+                if is_script(file_path):
+                    yield str(file_path)
+
+
+def _get_translator() -> CommandTranslator:
+    """Per-process translator; scripts don't expand aliases like ll."""
+    global _translator
+    if _translator is None:
+        _translator = CommandTranslator(use_aliases=False, exact=True)
+    return _translator
+
+
+def translate_line(line: str, is_makefile: bool) -> Tuple[str, List[str], bool]:
+    """Translate one line; returns (new line, rules applied, skipped).
+
+    A line is skipped (left as is) when it continues onto the next line,
+    has a redirection or ``--``, or has no exact translation: a flag the
+    engine can't carry over or a rule that only approximates the original.
+    """
+    body = line.rstrip("\n")
+    ending = line[len(body):]
+    if is_makefile:
+        # Only recipe lines are commands; keep make's @ and - prefixes
+        if not body.startswith("\t"):
+            return line, [], False
+        stripped = body.lstrip("\t")
+        prefix_end = len(body) - len(stripped)
+        while prefix_end < len(body) and body[prefix_end] in "@-+":
+            prefix_end += 1
+    else:
+        prefix_end = len(body) - len(body.lstrip())
+
+    prefix, command = body[:prefix_end], body[prefix_end:]
+    if not command or command.startswith("#"):
+        return line, [], False
+    if command.endswith("\\"):
+        return line, [], True
+
+    try:
+        tokens = tokenize(command)
+    except ValueError:
+        return line, [], True
+    if any(token.redirect or token.value == "--" for token in tokens):
+        # Rewritten in place without review; leave anything subtle alone
+        if any(token.value in TRANSLATED_COMMANDS for token in tokens):
+            return line, [], True
+        return line, [], False
+
+    try:
+        result = _get_translator().engine.translate(command, tokens)
+    except ValueError:
+        return line, [], True
+    if result is None or result.modern == command:
+        return line, [], False
+    if not result.exact:
+        return line, [], True
+    return prefix + result.modern + ending, result.rules, False
+
+
+def heredoc_delimiters(line: str) -> List[Tuple[str, bool]]:
+    """Delimiters of the heredocs a line opens, and whether each is ``<<-``."""
+    if "<<" not in line:
+        return []
+    try:
+        tokens = tokenize(line)
+    except ValueError:
+        return []
+    delimiters = []
+    for i, token in enumerate(tokens):
+        operator = token.redirect.lstrip("0123456789")
+        if operator not in ("<<", "<<-"):
+            continue
+        word = token.value[len(token.redirect):]
+        if not word and i + 1 < len(tokens):
+            word = tokens[i + 1].value
+        delimiters.append((word, operator == "<<-"))
+    return delimiters
+
+
+def translate_file(path: str, in_place: bool = False) -> FileResult:
+    """Translate every command line of a file."""
+    result = FileResult(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+    except (OSError, UnicodeDecodeError) as e:
+        result.error = str(e)
+        return result
+
+    is_makefile = Path(path).name in MAKEFILE_NAMES or path.endswith(".mk")
+    new_lines = []
+    continued = False
+    heredocs: List[Tuple[str, bool]] = []
+    for number, line in enumerate(lines, 1):
+        if heredocs:
+            # Heredoc body: data, not commands
+            new_lines.append(line)
+            delimiter, strip_tabs = heredocs[0]
+            text = line.rstrip("\n")
+            if (text.lstrip("\t") if strip_tabs else text) == delimiter:
+                heredocs.pop(0)
+            continue
+        if continued:
+            # Rest of a multi-line command; not safe to rewrite piecewise
+            new_lines.append(line)
+            continued = line.rstrip("\n").endswith("\\")
+            continue
+        new_line, rules, skipped = translate_line(line, is_makefile)
+        heredocs = heredoc_delimiters(line)
+        new_lines.append(new_line)
+        continued = line.rstrip("\n").endswith("\\")
+        if skipped:
+            result.skipped.append((number, line.strip()))
+        if new_line != line:
+            result.changed_lines += 1
+            result.rule_counts.update(rules)
+
+    if result.changed_lines:
+        if in_place:
+            tmp = temp_path(path)
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(new_lines)
+            os.chmod(tmp, os.stat(path).st_mode)
+            os.replace(tmp, path)
+        else:
+            result.diff = "".join(difflib.unified_diff(lines, new_lines, path, path))
+    return result
+
+
+def _translate_task(args: Tuple[str, bool]) -> FileResult:
+    """Worker entry point."""
+    path, in_place = args
+    return translate_file(path, in_place)
+
+
+def run(paths: Iterable[str], in_place: bool = False, jobs: Optional[int] = None,
+        out=sys.stdout) -> Tuple[int, int, Counter]:
+    """Translate scripts, streaming diffs to out as each file finishes.
+
+    Returns (files changed, lines changed, rule hit counts).
+    """
+    tasks = ((path, in_place) for path in iter_scripts(paths))
+    jobs = jobs or os.cpu_count() or 1
+    files_changed = lines_changed = 0
+    rule_counts: Counter = Counter()
+
+    def consume(results: Iterable[FileResult]) -> None:
+        nonlocal files_changed, lines_changed
+        for result in results:
+            if result.error:
+                print(f"simpleminded-translate: {result.path}: {result.error}", file=sys.stderr)
+                continue
+            for number, line in result.skipped:
+                print(f"simpleminded-translate: {result.path}:{number}: left as is: {line}",
+                      file=sys.stderr)
+            if result.diff:
+                out.write(result.diff)
+                out.flush()
+            if result.changed_lines:
+                files_changed += 1
+                lines_changed += result.changed_lines
+                rule_counts.update(result.rule_counts)
+
+    if jobs == 1:
+        consume(map(_translate_task, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # map keeps input order, so output is deterministic
+            consume(executor.map(_translate_task, tasks, chunksize=CHUNK_SIZE))
+    return files_changed, lines_changed, rule_counts
+
+
+def main():
+    """Entry point for simpleminded-translate."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="simpleminded-translate", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("paths", nargs="+", help="files or directories to translate")
+    parser.add_argument(
+        "-i", "--in-place", action="store_true", help="rewrite files instead of printing a diff"
+    )
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    files_changed, lines_changed, rule_counts = run(args.paths, args.in_place, args.jobs)
+
+    action = "Rewrote" if args.in_place else "Would change"
+    print(f"{action} {lines_changed} lines in {files_changed} files", file=sys.stderr)
+    for rule, count in rule_counts.most_common():
+        print(f"{count:8d}  {rule}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
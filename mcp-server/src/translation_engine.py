@@ -0,0 +1,614 @@
+"""Flag-level translation of traditional commands, driven by lookup tables.
+
+A command line is tokenized once, left to right, keeping each word's raw
+text so quoting survives translation. Each pipeline stage whose command has
+a spec is parsed into flags and positionals (splitting bundled short flags
+like ``-rin``), every flag is mapped through a precompiled table, and the
+target argv is rebuilt. Stages without a spec are copied verbatim. Work is
+linear in the length of the command; no regexes run per call.
+"""
+
+import shlex
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Separators between pipeline stages / list elements
+OPERATORS = ("||", "&&", "|&", "|", ";", "&")
+
+# Redirection operators, longest first; an optional fd number or & goes before
+REDIRECTIONS = (">>", ">|", ">&", "<<<", "<<-", "<<", "<>", "<&", ">", "<")
+
+
+class UntranslatableError(ValueError):
+    """A known command used in a way the engine can't translate faithfully."""
+
+
+@dataclass(frozen=True, slots=True)
+class Token:
+    """A word (or operator) with its raw text and unquoted value.
+
+    For a redirection, ``redirect`` is its operator (``2>``, ``&>>``, ``>&``);
+    when ``raw`` is just the operator the target is the next word.
+    """
+    raw: str
+    value: str
+    start: int
+    end: int
+    operator: bool = False
+    redirect: str = ""
+
+
+def tokenize(command: str) -> List[Token]:
+    """Split a command line into words and operators in one pass.
+
+    Handles single and double quotes, backslash escapes, redirections (kept
+    whole, so ``2>&1`` is one word) and trailing comments (which are not
+    returned); raises ValueError on an unterminated quote.
+    """
+    tokens: List[Token] = []
+    i = 0
+    length = len(command)
+    while i < length:
+        char = command[i]
+        if char.isspace():
+            i += 1
+            continue
+        if char == "#":
+            # A comment runs to the end of the line
+            break
+
+        operator = None if command.startswith("&>", i) else next(
+            (op for op in OPERATORS if command.startswith(op, i)), None
+        )
+        if operator:
+            tokens.append(Token(operator, operator, i, i + len(operator), operator=True))
+            i += len(operator)
+            continue
+
+        start = i
+        value: List[str] = []
+        redirect = ""
+        while i < length:
+            char = command[i]
+            if char in "<>":
+                prefix = command[start:i]
+                if redirect or not (prefix == "" or prefix.isdigit() or prefix == "&"):
+                    # foo>bar: the redirection starts a new word
+                    break
+                operator = next(op for op in REDIRECTIONS if command.startswith(op, i))
+                i += len(operator)
+                if operator.endswith("&"):
+                    # >&2, <&0, >&-: the fd is part of the operator's word
+                    while i < length and (command[i].isdigit() or command[i] == "-"):
+                        i += 1
+                redirect = prefix + operator
+                value = list(command[start:i])
+                continue
+            if char == "&" and i == start and command.startswith("&>", i):
+                value.append(char)
+                i += 1
+                continue
+            if char.isspace() or char in "|;&":
+                break
+            if char == "\\" and i + 1 < length:
+                value.append(command[i + 1])
+                i += 2
+            elif char == "'":
+                end = command.find("'", i + 1)
+                if end < 0:
+                    raise ValueError("Unterminated single quote")
+                value.append(command[i + 1:end])
+                i = end + 1
+            elif char == '"':
+                i += 1
+                while i < length and command[i] != '"':
+                    if command[i] == "\\" and i + 1 < length and command[i + 1] in '"\\$`':
+                        i += 1
+                    value.append(command[i])
+                    i += 1
+                if i >= length:
+                    raise ValueError("Unterminated double quote")
+                i += 1
+            else:
+                value.append(char)
+                i += 1
+        tokens.append(Token(command[start:i], "".join(value), start, i, redirect=redirect))
+    return tokens
+
+
+def split_stages(tokens: Sequence[Token]) -> List[Tuple[List[Token], Optional[Token]]]:
+    """Group tokens into stages, each with the operator that follows it."""
+    stages: List[Tuple[List[Token], Optional[Token]]] = []
+    words: List[Token] = []
+    for token in tokens:
+        if token.operator:
+            stages.append((words, token))
+            words = []
+        else:
+            words.append(token)
+    stages.append((words, None))
+    return stages
+
+
+# Commands that run the command given after their own options, with the
+# options that take a separate value
+WRAPPER_OPTIONS: Dict[str, frozenset] = {
+    "builtin": frozenset(),
+    "command": frozenset(),
+    "env": frozenset({"-C", "-S", "-u", "--chdir", "--split-string", "--unset"}),
+    "exec": frozenset({"-a"}),
+    "nice": frozenset({"-n", "--adjustment"}),
+    "noglob": frozenset(),
+    "nocorrect": frozenset(),
+    "nohup": frozenset(),
+    "sudo": frozenset({"-C", "-D", "-g", "-h", "-p", "-R", "-r", "-T", "-t", "-U", "-u",
+                       "--chdir", "--close-from", "--group", "--host", "--prompt",
+                       "--role", "--type", "--user", "--other-user"}),
+    "time": frozenset({"-f", "-o", "--format", "--output"}),
+    "xargs": frozenset({"-a", "-d", "-E", "-I", "-L", "-n", "-P", "-s",
+                        "--arg-file", "--delimiter", "--max-args", "--max-chars",
+                        "--max-lines", "--max-procs"}),
+}
+
+
+def wrapped_command(words: Sequence[str]) -> int:
+    """Index of the command a stage runs, past wrappers like ``sudo -u x``.
+
+    Skips ``VAR=value`` assignments, wrapper commands, their options and
+    option values; returns len(words) when no command follows.
+    """
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if "=" in word and word.split("=", 1)[0].isidentifier():
+            i += 1
+            continue
+        options = WRAPPER_OPTIONS.get(word)
+        if options is None:
+            return i
+        i += 1
+        while i < len(words) and words[i].startswith("-") and words[i] != "-":
+            option = words[i]
+            i += 1
+            if option == "--":
+                break
+            if option in options:
+                i += 1
+    return i
+
+
+# Value converters referenced from flag templates as {name}. Each gets the
+# unquoted value and returns the target words, or None if it can't be expressed.
+def _time_window(unit: str) -> Callable[[str], Optional[List[str]]]:
+    """Convert find's -mtime/-mmin -N, +N to fd's --changed-within/before.
+
+    find counts whole days and drops the fraction, so ``-mtime +N`` means at
+    least N+1 days. An exact ``N`` has no fd equivalent.
+    """
+    def convert(value: str) -> Optional[List[str]]:
+        sign, amount = value[:1], value.lstrip("+-")
+        if not amount.isdigit():
+            return None
+        if sign == "-":
+            return ["--changed-within", f"{amount}{unit}"]
+        if sign == "+":
+            if unit == "d":
+                amount = str(int(amount) + 1)
+            return ["--changed-before", f"{amount}{unit}"]
+        return None
+    return convert
+
+
+_SIZE_UNITS = {"c": "b", "k": "ki", "M": "mi", "G": "gi"}
+
+
+def _size(value: str) -> Optional[List[str]]:
+    """Convert find's -size +10M to fd's -S +10mi."""
+    sign, rest = value[:1], value[1:]
+    if sign not in "+-" or not rest:
+        return None
+    unit = rest[-1]
+    if unit in _SIZE_UNITS:
+        amount, unit = rest[:-1], _SIZE_UNITS[unit]
+    else:
+        # Without a unit find counts 512-byte blocks
+        amount, unit = (str(int(rest) * 512) if rest.isdigit() else ""), "b"
+    if not amount.isdigit():
+        return None
+    return ["-S", f"{sign}{amount}{unit}"]
+
+
+CONVERTERS: Dict[str, Callable[[str], Optional[List[str]]]] = {
+    "negglob": lambda value: ["-g", shlex.quote("!" + value)],
+    "negdir": lambda value: ["-g", shlex.quote("!" + value.rstrip("/") + "/")],
+    "days": _time_window("d"),
+    "minutes": _time_window("min"),
+    "size": _size,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class FlagRule:
+    """A compiled flag translation.
+
+    ``words`` are target words where ``{}`` stands for the flag's raw value;
+    a rule with a converter instead produces its words from the value.
+    """
+    flag: str
+    words: Tuple[str, ...]
+    arity: int
+    converter: Optional[str] = None
+
+
+def compile_rule(flag: str, template: str) -> FlagRule:
+    """Compile a template like ``"-A {}"``, ``"{days}"`` or ``""`` (drop)."""
+    words = tuple(template.split())
+    for word in words:
+        if word.startswith("{") and word.endswith("}") and word != "{}":
+            name = word[1:-1]
+            if name not in CONVERTERS:
+                raise ValueError(f"Unknown converter in template for {flag}: {word}")
+            return FlagRule(flag, (), 1, name)
+    return FlagRule(flag, words, 1 if "{}" in words else 0)
+
+
+@dataclass(slots=True)
+class StageResult:
+    """Target words for one stage plus what was applied."""
+    words: List[str]
+    rules: List[str] = field(default_factory=list)
+    unsupported: List[str] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class EngineResult:
+    """A translated command line.
+
+    ``exact`` is False when a flag was left unsupported or a rule only
+    approximates the source command (different output format, ordering, ...).
+    """
+    modern: str
+    tool: str
+    rules: List[str]
+    unsupported: List[str]
+    notes: List[str]
+    exact: bool = True
+
+
+class TranslationEngine:
+    """Translate command lines with per-command flag tables.
+
+    ``flag_translations`` maps a source command to ``{flag: template}``;
+    ``targets`` maps it to the binary to run and the tool name to report;
+    ``notes`` maps ``"<command> <flag>"`` rule ids to explanation snippets;
+    ``approximate`` lists rule ids whose target behaves only similarly.
+    """
+
+    # Flags grep treats as "search recursively"; rg needs no path then
+    RECURSIVE_FLAGS = {"-r", "-R", "--recursive", "--dereference-recursive"}
+
+    # grep flags that supply the pattern, so every positional is a path
+    PATTERN_FLAGS = {"-e", "--regexp", "-f", "--file"}
+
+    # ls flag sets the `ll` alias (eza -la with human sizes) already covers
+    LL_FLAGS = {"-l", "-a", "-h"}
+
+    # find's explicit AND, which fd applies to every filter anyway
+    FIND_AND = {"-a", "-and"}
+
+    # Long flags whose value is optional, with the value a bare flag means
+    OPTIONAL_VALUES = {"--color": "auto", "--colour": "auto"}
+
+    # ls flags that reverse the order; several cancel each other out
+    REVERSE_WORDS = {"-r", "--reverse"}
+
+    def __init__(
+        self,
+        flag_translations: Dict[str, Dict[str, str]],
+        targets: Dict[str, Tuple[str, str]],
+        notes: Optional[Dict[str, str]] = None,
+        use_aliases: bool = True,
+        approximate: Iterable[str] = (),
+        exact_flags: Optional[Dict[str, Sequence[str]]] = None,
+    ):
+        """Compile the flag tables.
+
+        Without use_aliases, shortcuts to shell aliases (ls -la -> ll) are
+        not taken, e.g. for scripts where aliases aren't expanded. With
+        exact_flags, each target gets its flags (fd --hidden --no-ignore,
+        rg -uu) so it sees the same files as the source command, and ``.``
+        paths are kept so output paths keep their ``./`` prefix.
+        """
+        self.tables: Dict[str, Dict[str, FlagRule]] = {
+            command: {flag: compile_rule(flag, template) for flag, template in flags.items()}
+            for command, flags in flag_translations.items()
+        }
+        self.targets = targets
+        self.notes = notes or {}
+        self.use_aliases = use_aliases
+        self.approximate = frozenset(approximate)
+        self.exact_flags = exact_flags
+
+    def translate(self, command: str, tokens: Optional[Sequence[Token]] = None) -> Optional[EngineResult]:
+        """Translate every stage with a known command; None if none has one.
+
+        Pass tokens when the caller already tokenized the command.
+        """
+        if tokens is None:
+            tokens = tokenize(command)
+        parts: List[str] = []
+        tool: Optional[str] = None
+        rules: List[str] = []
+        unsupported: List[str] = []
+        notes: List[str] = []
+
+        for words, operator in split_stages(tokens):
+            result = self.translate_stage(words) if words else None
+            if result is None:
+                if words:
+                    parts.append(command[words[0].start:words[-1].end])
+            else:
+                tool = tool or self.targets[result.rules[0]][1]
+                parts.append(" ".join(result.words))
+                rules.extend(result.rules)
+                unsupported.extend(result.unsupported)
+                notes.extend(note for note in result.notes if note not in notes)
+            if operator is not None:
+                parts.append(operator.raw)
+
+        if tool is None:
+            return None
+        # Keep a trailing comment as written
+        comment = command[tokens[-1].end:].strip() if tokens else ""
+        if comment:
+            parts.append(comment)
+        exact = not unsupported and self.approximate.isdisjoint(rules)
+        return EngineResult(" ".join(parts), tool, rules, unsupported, notes, exact)
+
+    def translate_stage(self, words: Sequence[Token]) -> Optional[StageResult]:
+        """Translate one stage; None if its command has no table.
+
+        Redirections are set aside and appended, unchanged, after the
+        translated words. Raises UntranslatableError when the command has a
+        table but the stage can't be carried over without changing meaning.
+        """
+        arguments: List[Token] = []
+        redirections: List[str] = []
+        i = 0
+        while i < len(words):
+            token = words[i]
+            i += 1
+            if not token.redirect:
+                arguments.append(token)
+                continue
+            redirections.append(token.raw)
+            if token.raw == token.redirect:
+                # "> file": the target is the next word
+                if i >= len(words) or words[i].redirect:
+                    raise UntranslatableError(f"Redirection without a target: {token.raw}")
+                redirections.append(words[i].raw)
+                i += 1
+
+        if not arguments or arguments[0].value not in self.tables:
+            return None
+        command = arguments[0].value
+        if command == "find":
+            result = self._translate_find(arguments)
+        else:
+            result = self._translate_gnu(command, arguments)
+        if self.exact_flags and command in self.exact_flags and result.words[0] != "ll":
+            result.words[1:1] = self.exact_flags[command]
+        result.words.extend(redirections)
+        result.rules.insert(0, command)
+        if not result.notes:
+            result.notes.append(f"Use {result.words[0]} instead of {command}")
+        return result
+
+    def _apply(self, command: str, rule: FlagRule, value: Optional[Token],
+               result: StageResult, source: str) -> List[str]:
+        """Target words for one flag occurrence; records rule ids and notes.
+
+        Raises UntranslatableError when a converter can't express the value.
+        """
+        if rule.arity and value is None:
+            result.unsupported.append(source)
+            return [source]
+        if rule.converter:
+            converted = CONVERTERS[rule.converter](value.value)
+            if converted is None:
+                raise UntranslatableError(f"No {self.targets[command][0]} equivalent for {source} {value.raw}")
+            words = converted
+        else:
+            words = [value.raw if word == "{}" else word for word in rule.words]
+
+        rule_id = f"{command} {rule.flag}"
+        result.rules.append(rule_id)
+        if rule_id in self.notes:
+            result.notes.append(self.notes[rule_id])
+        return words
+
+    def _translate_gnu(self, command: str, words: Sequence[Token]) -> StageResult:
+        """Translate a command with getopt-style flags (grep, ls, cat)."""
+        table = self.tables[command]
+        result = StageResult([])
+        flags: List[str] = []
+        positionals: List[Token] = []
+        seen: List[str] = []
+        options_done = False
+        i = 1
+
+        while i < len(words):
+            token = words[i]
+            i += 1
+            raw = token.value
+            if options_done or not raw.startswith("-") or raw == "-":
+                positionals.append(token)
+                continue
+            if raw == "--":
+                options_done = True
+                continue
+
+            if raw.startswith("--"):
+                name, has_value, _ = raw.partition("=")
+                rule = table.get(name)
+                seen.append(name)
+                if rule is None:
+                    result.unsupported.append(raw)
+                    flags.append(token.raw)
+                    continue
+                value = None
+                if rule.arity:
+                    if has_value:
+                        value = Token(token.raw.partition("=")[2], raw.partition("=")[2],
+                                      token.start, token.end)
+                    elif name in self.OPTIONAL_VALUES:
+                        # grep --color alone doesn't take the next word
+                        default = self.OPTIONAL_VALUES[name]
+                        value = Token(default, default, token.start, token.end)
+                    elif i < len(words):
+                        value = words[i]
+                        i += 1
+                flags.extend(self._apply(command, rule, value, result, raw))
+                continue
+
+            # A bundle of short flags; a flag taking a value ends it
+            for offset in range(1, len(raw)):
+                name = "-" + raw[offset]
+                rule = table.get(name)
+                seen.append(name)
+                if rule is None:
+                    result.unsupported.append(name)
+                    flags.append(name)
+                    continue
+                value = None
+                if rule.arity:
+                    rest = raw[offset + 1:]
+                    if rest:
+                        value = Token(shlex.quote(rest), rest, token.start, token.end)
+                    elif i < len(words):
+                        value = words[i]
+                        i += 1
+                    flags.extend(self._apply(command, rule, value, result, name))
+                    break
+                flags.extend(self._apply(command, rule, value, result, name))
+
+        target = self.targets[command][0]
+        # Keep "--" so positionals like -v aren't read as flags
+        end_of_options = ["--"] if options_done else []
+        if command == "ls" and self.use_aliases and seen and set(seen) <= self.LL_FLAGS and {"-l", "-a"} <= set(seen):
+            result.rules = ["ls ll"]
+            result.notes = [self.notes["ls ll"]] if "ls ll" in self.notes else []
+            result.words = ["ll"] + end_of_options + [token.raw for token in positionals]
+            return result
+
+        if command == "ls":
+            flags = self._net_reverse(flags)
+
+        if command == "grep" and self.RECURSIVE_FLAGS & set(seen) and self.exact_flags is None:
+            # rg searches the working directory recursively when given no path
+            first_path = 0 if self.PATTERN_FLAGS & set(seen) else 1
+            positionals = [token for j, token in enumerate(positionals)
+                           if j < first_path or token.value not in (".", "./")]
+
+        result.words = [target] + flags + end_of_options + [token.raw for token in positionals]
+        return result
+
+    def _net_reverse(self, flags: List[str]) -> List[str]:
+        """Keep one reverse flag if an odd number were given, none if even.
+
+        ``ls -tr`` is oldest first; with -t already reversed for eza, the two
+        reversals cancel.
+        """
+        reversals = [j for j, word in enumerate(flags) if word in self.REVERSE_WORDS]
+        if len(reversals) < 2:
+            return flags
+        drop = set(reversals[1:] if len(reversals) % 2 else reversals)
+        return [word for j, word in enumerate(flags) if j not in drop]
+
+    def _translate_find(self, words: Sequence[Token]) -> StageResult:
+        """Translate find's path list and expression into fd arguments.
+
+        fd takes one name pattern and ANDs every filter, so expressions with
+        operators (``-o``, ``!``, ``-not``, parentheses), more than one
+        ``-name`` or primaries without a table entry (``-delete``, ``-path``,
+        ...) raise UntranslatableError instead of being copied through.
+        """
+        table = self.tables["find"]
+        result = StageResult([])
+        flags: List[str] = []
+        paths: List[str] = []
+        pattern: Optional[str] = None
+        named = False
+        i = 1
+
+        # Paths come before the first expression primary
+        while i < len(words) and not words[i].value.startswith(("-", "(", "!")):
+            if words[i].value not in (".", "./") or self.exact_flags is not None:
+                paths.append(words[i].raw)
+            i += 1
+        if not paths and self.exact_flags is not None:
+            # find searches "." by default and prints "./" paths
+            paths.append(".")
+
+        while i < len(words):
+            token = words[i]
+            i += 1
+            primary = token.value
+
+            if primary in self.FIND_AND:
+                # Primaries are ANDed by default
+                continue
+
+            if primary in ("-name", "-iname") and i < len(words):
+                if named:
+                    raise UntranslatableError("fd takes a single name pattern")
+                named = True
+                value = words[i]
+                i += 1
+                if primary == "-iname":
+                    flags.append("-i")
+                extension = value.value[2:]
+                if value.value.startswith("*.") and extension.isalnum():
+                    flags += ["-e", extension]
+                else:
+                    # -name matches the whole base name; a bare fd pattern is
+                    # an unanchored regex, so always match as a glob
+                    flags.append("-g")
+                    pattern = value.raw
+                rule_id = f"find {primary}"
+                result.rules.append(rule_id)
+                if rule_id in self.notes:
+                    result.notes.append(self.notes[rule_id])
+                continue
+
+            if primary in ("-exec", "-execdir"):
+                # Everything up to ';' or '+' is the command to run per result
+                end = i
+                while end < len(words) and words[end].value not in (";", "+"):
+                    end += 1
+                batch = end < len(words) and words[end].value == "+"
+                inner = self.translate_stage(words[i:end]) if end > i else None
+                inner_words = inner.words if inner else [token.raw for token in words[i:end]]
+                if inner:
+                    result.rules.extend(inner.rules)
+                    result.unsupported.extend(inner.unsupported)
+                flags += ["-X" if batch else "-x"] + inner_words
+                result.rules.append(f"find {primary}")
+                i = end + 1
+                continue
+
+            rule = table.get(primary)
+            if rule is None:
+                raise UntranslatableError(f"No fd equivalent for find {primary}")
+            value = None
+            if rule.arity and i < len(words):
+                value = words[i]
+                i += 1
+            flags.extend(self._apply("find", rule, value, result, primary))
+
+        if pattern is None and paths:
+            # fd takes the pattern first, so a path needs a match-all pattern
+            pattern = "."
+        result.words = [self.targets["find"][0]] + flags + ([pattern] if pattern else []) + paths
+        return result
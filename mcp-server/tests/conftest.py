@@ -0,0 +1,29 @@
+"""Shared fixtures for tests that put fake tools on $PATH."""
+
+import os
+import stat
+
+import pytest
+
+
+def write_tool(directory, name, script=""):
+    """Create an executable shell script called name in directory."""
+    path = directory / name
+    path.write_text(f"#!/bin/sh\n{script}\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+
+@pytest.fixture
+def make_tool():
+    """Create executable fake tools: make_tool(directory, name, script)."""
+    return write_tool
+
+
+@pytest.fixture
+def fake_bin(tmp_path, monkeypatch):
+    """An empty bin directory on $PATH, ahead of the system shell utilities."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", os.pathsep.join([str(bin_dir), "/usr/bin", "/bin"]))
+    return bin_dir
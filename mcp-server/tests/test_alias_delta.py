@@ -0,0 +1,68 @@
+"""Tests for alias change tracking."""
+
+import pytest
+from src.alias_detector import AliasDetector
+from src.alias_delta import AliasChangeTracker, compute_delta
+
+
+BASE = """
+alias gs='git status'
+alias ll='eza -la'
+alias cat='bat'
+"""
+
+
+def test_compute_delta():
+    """Test added, removed and changed aliases are detected."""
+    old = AliasDetector(BASE)
+    new = AliasDetector(BASE.replace("eza -la", "eza -la --icons").replace("alias cat='bat'\n", "")
+                        + "alias gd='git diff'\n")
+    delta = compute_delta(old, new, 1)
+
+    assert delta.added == {"gd": "git diff"}
+    assert delta.removed == ["cat"]
+    assert delta.changed == {"ll": "eza -la --icons"}
+
+
+def test_unchanged_snapshot_keeps_generation():
+    """Test identical snapshots don't bump the generation."""
+    tracker = AliasChangeTracker(AliasDetector(BASE))
+
+    assert tracker.update(AliasDetector(BASE)) is None
+    assert tracker.generation == 0
+
+
+def test_changes_since_folds_deltas():
+    """Test net changes across several generations."""
+    tracker = AliasChangeTracker(AliasDetector(BASE))
+    tracker.update(AliasDetector(BASE + "alias gd='git diff'\n"))
+    tracker.update(AliasDetector(BASE + "alias gd='git diff --staged'\nmkcd() {\n cd\n}\n"))
+    tracker.update(AliasDetector(BASE.replace("alias gs='git status'\n", "")
+                                 + "alias gd='git diff --staged'\nmkcd() {\n cd\n}\n"))
+
+    changes = tracker.changes_since(0)
+    assert changes["generation"] == 3
+    assert changes["added"] == {"gd": "git diff --staged"}
+    assert changes["removed"] == ["gs"]
+    assert changes["functions"]["added"] == ["mkcd"]
+
+    assert tracker.changes_since(2)["removed"] == ["gs"]
+    assert tracker.changes_since(2)["added"] == {}
+    assert tracker.changes_since(3)["added"] == {}
+    assert not tracker.changes_since(3)["reset"]
+
+
+def test_expired_history_requests_reset():
+    """Test clients behind the retained history are told to re-read."""
+    tracker = AliasChangeTracker(AliasDetector(BASE), history=1)
+    tracker.update(AliasDetector(BASE + "alias a='b'\n"))
+    tracker.update(AliasDetector(BASE + "alias a='c'\n"))
+
+    assert tracker.changes_since(0)["reset"]
+    assert tracker.changes_since(1)["changed"] == {"a": "c"}
+    # A generation from before a server restart is ahead of the tracker
+    assert tracker.changes_since(5)["reset"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -95,5 +95,36 @@ def test_to_dict():
     assert len(data["aliases"]) > 0
 
 
+def test_alias_records_are_slotted():
+    """Test that alias records carry no per-instance __dict__."""
+    detector = AliasDetector(SAMPLE_CONFIG)
+    alias = detector.get_alias("gs")
+
+    assert not hasattr(alias, "__dict__")
+
+
+def test_categories_are_interned():
+    """Test that equal categories share one string object."""
+    detector = AliasDetector(SAMPLE_CONFIG)
+    aliases = detector.parse_aliases()
+
+    assert aliases["gs"].category is aliases["ga"].category
+
+
+def test_alias_table():
+    """Test columnar alias table."""
+    detector = AliasDetector(SAMPLE_CONFIG)
+    table = detector.to_table()
+
+    assert len(table) == len(detector.parse_aliases())
+    assert "gs" in table
+    assert table.get("gs") == detector.get_alias("gs")
+    assert sorted(table.rows_with_word("git")) == ["g", "ga", "gs"]
+
+    table.add("gs", "git status -sb", "git")
+    assert table.get("gs").command == "git status -sb"
+    assert len(table) == len(detector.parse_aliases())
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
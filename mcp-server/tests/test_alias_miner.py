@@ -0,0 +1,105 @@
+"""Tests for alias suggestions mined from shell history."""
+
+from collections import Counter
+
+import pytest
+from src import alias_miner
+from src.alias_detector import AliasDetector
+from src.alias_miner import AliasMiner, SpaceSaving, command_prefixes, suggest_name
+from src.history_analyzer import iter_history
+
+
+def test_space_saving_keeps_heavy_hitters():
+    """Test frequent keys survive a stream of one-off keys in bounded memory."""
+    sketch = SpaceSaving(capacity=10)
+    stream = []
+    for i in range(300):
+        stream.append("heavy")
+        stream.append(f"rare{i}")
+        if i % 3 == 0:
+            stream.append("medium")
+    for key in stream:
+        sketch.add(key)
+
+    truth = Counter(stream)
+    assert len(sketch) == 10
+    for key in ("heavy", "medium"):
+        assert key in sketch.counts
+        assert sketch.guaranteed(key) <= truth[key] <= sketch.counts[key]
+    assert sketch.guaranteed("heavy") > 250
+
+
+def test_command_prefixes():
+    """Test prefixes stop at quotes, expansions and operators."""
+    assert command_prefixes('git commit -m "fix"') == ["git", "git commit", "git commit -m"]
+    assert command_prefixes("docker compose up -d web") == [
+        "docker", "docker compose", "docker compose up"
+    ]
+    assert command_prefixes("echo $HOME") == ["echo"]
+    assert command_prefixes("make | tee log") == ["make"]
+
+
+def test_suggest_name_avoids_taken_names():
+    """Test names are initials, lengthened when taken."""
+    assert suggest_name("docker compose up", set()) == "dcu"
+    assert suggest_name("docker compose up", {"dcu"}) == "dcup"
+    assert suggest_name("ab", {"a"}) is None
+
+
+def test_suggest_skips_covered_prefixes(tmp_path):
+    """Test prefixes covered by existing aliases aren't suggested."""
+    history = tmp_path / ".zsh_history"
+    lines = (
+        ["docker compose up -d"] * 6
+        + ["git status"] * 8
+        + ["git status -sb"] * 2
+        + ["kubectl get pods"] * 4
+        + ["ls"] * 20
+    )
+    history.write_text("".join(f": {i}:0;{line}\n" for i, line in enumerate(lines)))
+    detector = AliasDetector("alias gs='git status'\n")
+
+    result = AliasMiner([history]).suggest(detector, min_count=3)
+    commands = [s["command"] for s in result["suggestions"]]
+
+    assert result["entries"] == len(lines)
+    assert "docker compose up" in commands
+    assert "kubectl get pods" in commands
+    # Covered by gs, or too short to be worth an alias
+    assert not any(command.startswith("git status") for command in commands)
+    assert "ls" not in commands
+    # docker compose always continues with "up", so only the longest is offered
+    assert "docker compose" not in commands
+
+    docker = next(s for s in result["suggestions"] if s["command"] == "docker compose up")
+    assert docker["count"] == 6
+    assert docker["keystrokes_saved"] == 6 * (len("docker compose up") - len(docker["name"]))
+    assert docker["name"] != "gs"
+
+
+def test_count_resumes_after_appends(tmp_path, monkeypatch):
+    """Test appended entries are read from the stored offset; rewrites recount."""
+    history = tmp_path / ".bash_history"
+    history.write_text("terraform plan\n" * 3)
+    starts = []
+
+    def recording_iter_history(path, start=0):
+        starts.append(start)
+        return iter_history(path, start)
+
+    monkeypatch.setattr(alias_miner, "iter_history", recording_iter_history)
+    miner = AliasMiner([history])
+    assert miner.suggest(min_count=3)["suggestions"][0]["count"] == 3
+
+    with open(history, "a") as f:
+        f.write("terraform plan\n" * 2)
+    assert miner.suggest(min_count=3)["suggestions"][0]["count"] == 5
+    assert miner.count()[1] == 5
+    assert starts == [0, len("terraform plan\n") * 3]
+
+    history.write_text("terraform plan\n" * 4)
+    assert miner.suggest(min_count=3)["suggestions"][0]["count"] == 4
+    assert starts[-1] == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
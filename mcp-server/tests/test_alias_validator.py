@@ -0,0 +1,99 @@
+"""Tests for alias target validation."""
+
+import os
+
+import pytest
+from src.alias_detector import AliasDetector
+from src.alias_validator import AliasValidator, PathIndex, function_command, leading_command
+from src.tool_checker import ToolChecker
+
+
+@pytest.fixture
+def fake_path(fake_bin, make_tool, monkeypatch):
+    """A PATH holding only a few fake executables."""
+    for name in ("git", "ls", "eza", "grep"):
+        make_tool(fake_bin, name)
+    monkeypatch.setenv("PATH", str(fake_bin))
+    return fake_bin
+
+
+def test_leading_command():
+    """Test wrappers, assignments and quotes are skipped; expansions are unknown."""
+    assert leading_command("git status -sb") == "git"
+    assert leading_command("sudo -E apt update") == "apt"
+    assert leading_command("sudo -u root vim /etc/hosts") == "vim"
+    assert leading_command("env -u PAGER LESS=-R less") == "less"
+    assert leading_command("LC_ALL=C noglob \\grep -r") == "grep"
+    assert leading_command("'eza' --icons") == "eza"
+    assert leading_command("cd ..; ls") == "cd"
+    assert leading_command("$EDITOR ~/.zshrc") is None
+    assert leading_command("(cd src && make)") is None
+    assert leading_command("'my tool' --fast") == "my tool"
+    assert leading_command('FOO="a b" sudo -u root my\\ tool x') == "my tool"
+    assert leading_command('"$EDITOR" notes') is None
+
+
+def test_function_command():
+    """Test the first command of a function body is found."""
+    assert function_command("mkcd() {\n    mkdir -p \"$1\" && cd \"$1\"\n}") == "mkdir"
+    assert function_command("serve() { python3 -m http.server; }") == "python3"
+    body = "up() {\n    local dir=\"$1\" count\n    # go up\n    x=1; cd \"$dir\"\n}"
+    assert function_command(body) == "cd"
+    assert function_command("f() {\n  local x=1\n  rg \"$x\"\n}") == "rg"
+
+
+def test_path_index_relists_when_path_changes(fake_path, make_tool):
+    """Test new executables are seen once their directory changes."""
+    index = PathIndex()
+    index.refresh()
+    assert index.lookup("git") == str(fake_path / "git")
+    assert index.lookup("bat") is None
+
+    make_tool(fake_path, "bat")
+    os.utime(fake_path, ns=(0, 10**18))
+    index.refresh()
+    assert index.lookup("bat") == str(fake_path / "bat")
+
+
+def test_validate_reports_broken_shadowing_and_redundant(fake_path):
+    """Test each kind of problem is reported in a single pass."""
+    detector = AliasDetector("\n".join([
+        "alias gs='git status'",
+        "alias gst='git status'",
+        "alias cat='bat --paging=never'",
+        "alias ls='eza --icons'",
+        "alias ll='ls -l'",
+        "alias grep='grep'",
+        "alias k='kubectl'",
+        "alias e='$EDITOR'",
+        "alias here='cd .'",
+        "mkcd() {",
+        '    mkdir -p "$1" && cd "$1"',
+        "}",
+    ]))
+
+    result = AliasValidator(ToolChecker()).validate(detector)
+
+    broken = {entry["name"]: entry for entry in result["broken"]}
+    assert set(broken) == {"cat", "k", "mkcd"}
+    assert broken["cat"]["target"] == "bat"
+    assert broken["cat"]["install_command"] == "brew install bat"
+    assert broken["mkcd"]["kind"] == "function"
+
+    shadowing = {entry["name"]: entry for entry in result["shadowing"]}
+    assert set(shadowing) == {"ls"}
+    assert shadowing["ls"]["shadows"] == str(fake_path / "ls")
+    assert shadowing["ls"]["target_installed"] is True
+
+    reasons = {entry["name"]: entry["reason"] for entry in result["redundant"]}
+    assert set(reasons) == {"grep", "gst"}
+    assert "gs" in reasons["gst"]
+
+    # ll goes through the ls alias to eza, which is installed
+    assert "ll" not in broken
+    assert result["unchecked"] == ["e"]
+    assert result["checked"] == 9
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+"""Tests for merged multi-config discovery."""
+
+import pytest
+from src.config_discovery import discover_configs
+
+
+ZSHRC = """
+# SIMPLEMINDED-SHELL-CONFIG
+alias cat='bat --paging=never'
+alias gs='git status'
+"""
+
+BASHRC = """
+alias gs='git status -sb'
+alias ll='eza -la'
+
+mkcd() {
+    mkdir -p "$1" && cd "$1"
+}
+"""
+
+
+@pytest.fixture
+def configs(tmp_path):
+    zshrc = tmp_path / ".zshrc"
+    bashrc = tmp_path / ".bashrc"
+    zshrc.write_text(ZSHRC)
+    bashrc.write_text(BASHRC)
+    return [str(zshrc), str(bashrc), str(tmp_path / ".profile")]
+
+
+def test_merges_all_files(configs):
+    """Test aliases from every existing file are merged."""
+    merged = discover_configs(configs)
+
+    assert len(merged.sources) == 2
+    assert set(merged.aliases) == {"cat", "gs", "ll"}
+    assert "mkcd" in merged.functions
+
+
+def test_precedence_and_attribution(configs):
+    """Test earlier files win and every alias records its source."""
+    merged = discover_configs(configs)
+
+    assert merged.aliases["gs"].command == "git status"
+    assert merged.aliases["gs"].source == configs[0]
+    assert merged.aliases["ll"].source == configs[1]
+    assert merged.functions["mkcd"].source == configs[1]
+    assert merged.overridden_aliases == {"gs": [configs[1]]}
+    assert merged.overridden_functions == {}
+    assert merged.primary_path == configs[0]
+
+
+def test_alias_and_function_overrides_are_separate(tmp_path):
+    """Test an alias and a function of the same name don't hide each other."""
+    first = tmp_path / ".zshrc"
+    second = tmp_path / ".bashrc"
+    first.write_text("alias mkcd='mkdir -p'\n")
+    second.write_text("mkcd() {\n    mkdir -p \"$1\" && cd \"$1\"\n}\nalias mkcd='md'\n")
+    merged = discover_configs([str(first), str(second)])
+
+    assert merged.overridden_aliases == {"mkcd": [str(second)]}
+    assert merged.overridden_functions == {}
+    assert "mkcd" in merged.functions
+
+
+def test_primary_parser_reuses_content(configs):
+    """Test the simpleminded config's parser comes from the discovery read."""
+    merged = discover_configs(configs)
+    parser = merged.primary_parser
+
+    assert str(parser.config_path) == configs[0]
+    assert parser.is_simpleminded_shell()
+    assert parser is merged.sources[0].parser
+
+
+def test_duplicate_paths_parsed_once(configs):
+    """Test the same file listed twice only contributes once."""
+    merged = discover_configs([configs[0], configs[0]])
+
+    assert len(merged.sources) == 1
+    assert merged.overridden_aliases == {}
+
+
+def test_detector_over_merged(configs):
+    """Test the merged detector answers like a single-file detector."""
+    detector = discover_configs(configs).detector()
+
+    assert detector.get_alias("ll").command == "eza -la"
+    assert "git" in detector.get_all_categories()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
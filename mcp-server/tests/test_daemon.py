@@ -0,0 +1,117 @@
+"""Tests for the socket daemon."""
+
+import asyncio
+import json
+import socket
+import stat
+
+import pytest
+from src.daemon import Daemon, default_socket_path
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "test", "version": "1"},
+    },
+}
+
+
+def test_default_socket_path(monkeypatch, tmp_path):
+    """Test the socket path honours the environment."""
+    monkeypatch.setenv("SIMPLEMINDED_SOCKET", str(tmp_path / "custom.sock"))
+    assert default_socket_path() == tmp_path / "custom.sock"
+
+    monkeypatch.delenv("SIMPLEMINDED_SOCKET")
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert default_socket_path() == tmp_path / "simpleminded-shell.sock"
+
+
+def test_stale_socket_removed(tmp_path):
+    """Test a socket file nobody listens on is cleaned up."""
+    path = tmp_path / "stale.sock"
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(path))
+    sock.close()
+
+    Daemon(path)._remove_stale_socket()
+    assert not path.exists()
+
+
+async def _session(path, messages, replies):
+    """Send messages on a new connection and read a number of replies."""
+    reader, writer = await asyncio.open_unix_connection(str(path))
+    for message in messages:
+        writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    lines = [json.loads(await reader.readline()) for _ in range(replies)]
+    writer.close()
+    await writer.wait_closed()
+    return lines
+
+
+async def test_sessions_share_one_server(tmp_path):
+    """Test consecutive connections are served by the same daemon."""
+    path = tmp_path / "d.sock"
+    daemon = Daemon(path)
+    task = asyncio.create_task(daemon.serve())
+    for _ in range(100):
+        if path.exists():
+            break
+        await asyncio.sleep(0.01)
+
+    try:
+        for _ in range(2):
+            replies = await _session(path, [INITIALIZE], 1)
+            assert replies[0]["result"]["serverInfo"]["name"] == "simpleminded-shell"
+        assert daemon.total_sessions == 2
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    assert not path.exists()
+
+
+def find_files_call(arguments):
+    """Messages completing the handshake and calling find_files."""
+    return [
+        INITIALIZE,
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/call",
+         "params": {"name": "find_files", "arguments": arguments}},
+    ]
+
+
+async def test_sessions_use_the_client_cwd(tmp_path):
+    """Test the socket is private and relative paths resolve in the shim's cwd."""
+    project = tmp_path / "project"
+    (project / ".git").mkdir(parents=True)
+    (project / "notes.txt").write_text("")
+    path = tmp_path / "d.sock"
+    task = asyncio.create_task(Daemon(path).serve())
+    for _ in range(100):
+        if path.exists():
+            break
+        await asyncio.sleep(0.01)
+
+    try:
+        assert stat.S_IMODE(path.stat().st_mode) & 0o077 == 0
+        replies = await _session(path, [{"cwd": str(project)}] + find_files_call({}), 2)
+        result = json.loads(replies[1]["result"]["content"][0]["text"])
+        assert result["root"] == str(project.resolve())
+        assert result["paths"] == ["notes.txt"]
+
+        # Without a cwd only absolute paths are accepted
+        replies = await _session(path, find_files_call({"path": "."}), 2)
+        assert "absolute path" in json.loads(replies[1]["result"]["content"][0]["text"])["error"]
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
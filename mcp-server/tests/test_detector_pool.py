@@ -0,0 +1,81 @@
+"""Tests for the per-config detector pool."""
+
+import os
+
+import pytest
+from src.detector_pool import DetectorPool
+
+
+def write_config(path, aliases):
+    """Write a config file with the given aliases."""
+    path.write_text("".join(f"alias {name}='{command}'\n" for name, command in aliases.items()))
+    return str(path)
+
+
+def test_get_parses_and_reuses(tmp_path):
+    """Test a config is parsed once and then served from the pool."""
+    pool = DetectorPool()
+    config = write_config(tmp_path / "zshrc", {"gs": "git status"})
+
+    first = pool.get(config)
+    assert first.detector.get_alias("gs").command == "git status"
+    assert pool.get(config) is first
+    assert pool.get_stats()["hits"] == 1
+    assert pool.get_stats()["misses"] == 1
+
+
+def test_stale_entry_reparsed(tmp_path):
+    """Test a changed file is parsed again."""
+    pool = DetectorPool()
+    config = write_config(tmp_path / "zshrc", {"gs": "git status"})
+    pool.get(config)
+
+    write_config(tmp_path / "zshrc", {"gs": "git status -sb"})
+    os.utime(config, ns=(0, 10**18))
+    assert pool.get(config).detector.get_alias("gs").command == "git status -sb"
+
+
+def test_missing_config(tmp_path):
+    """Test a missing or deleted config returns None and leaves the pool."""
+    pool = DetectorPool()
+    assert pool.get(str(tmp_path / "nope")) is None
+
+    config = write_config(tmp_path / "zshrc", {"gs": "git status"})
+    pool.get(config)
+    os.remove(config)
+    assert pool.get(config) is None
+    assert pool.get_stats()["entries"] == 0
+
+
+def test_lru_eviction_by_count(tmp_path):
+    """Test the least recently used config is evicted first."""
+    pool = DetectorPool(max_entries=2)
+    configs = [write_config(tmp_path / f"rc{i}", {"gs": "git status"}) for i in range(3)]
+
+    pool.get(configs[0])
+    pool.get(configs[1])
+    pool.get(configs[0])
+    pool.get(configs[2])
+
+    paths = pool.get_stats()["paths"]
+    assert paths == [str(tmp_path / "rc0"), str(tmp_path / "rc2")]
+    assert pool.evictions == 1
+
+
+def test_eviction_by_memory(tmp_path):
+    """Test the memory cap evicts but keeps the newest entry."""
+    aliases = {f"a{i}": "echo " + "x" * 100 for i in range(50)}
+    configs = [write_config(tmp_path / f"rc{i}", aliases) for i in range(3)]
+    pool = DetectorPool(max_bytes=1)
+
+    for config in configs:
+        pool.get(config)
+
+    stats = pool.get_stats()
+    assert stats["entries"] == 1
+    assert stats["paths"] == [str(tmp_path / "rc2")]
+    assert stats["bytes"] > stats["max_bytes"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,83 @@
+"""Tests for example packs."""
+
+import json
+
+import pytest
+from src.example_provider import BUNDLED_DIR, ExampleProvider, PackCache
+
+
+def write_pack(root, tool, examples):
+    """Write examples/<tool>.json under a pack root."""
+    pack = root / "examples" / f"{tool}.json"
+    pack.parent.mkdir(parents=True, exist_ok=True)
+    pack.write_text(json.dumps(examples))
+    return pack
+
+
+def test_bundled_packs():
+    """Test the bundled examples and workflows load."""
+    provider = ExampleProvider([BUNDLED_DIR])
+    assert {"bat", "fd", "rg", "eza"} <= set(provider.get_all_tools())
+    assert provider.get_examples("fd", "find_by_extension")[0]["command"].startswith("fd")
+    assert "git_workflow" in provider.get_all_workflows()
+    assert any(ex["tool"] == "fd" for ex in provider.search_examples("python files"))
+
+
+def test_user_packs_extend_and_override(tmp_path):
+    """Test later roots add tools and replace examples by use_case."""
+    site, user = tmp_path / "site", tmp_path / "user"
+    write_pack(site, "deploy", [
+        {"use_case": "ship", "command": "deploy ship", "description": "Ship it"},
+        {"use_case": "rollback", "command": "deploy back", "description": "Undo"},
+    ])
+    write_pack(user, "deploy", [
+        {"use_case": "ship", "command": "deploy ship --canary", "description": "Ship to canary"},
+    ])
+    (user / "workflows").mkdir()
+    (user / "workflows" / "team.json").write_text(json.dumps({"release": {"steps": ["deploy ship"]}}))
+
+    provider = ExampleProvider([site, user])
+    assert provider.get_all_tools() == ["deploy"]
+    assert [ex["command"] for ex in provider.get_examples("deploy")] == [
+        "deploy ship --canary", "deploy back"
+    ]
+    assert provider.get_workflow("release") == {"steps": ["deploy ship"]}
+    assert provider.get_examples("missing") == []
+
+
+def test_tools_load_lazily(tmp_path):
+    """Test only the requested tool's pack is parsed, and search loads the rest."""
+    write_pack(tmp_path, "one", [{"use_case": "a", "command": "one a", "description": "first"}])
+    write_pack(tmp_path, "two", [{"use_case": "b", "command": "two b", "description": "second"}])
+    write_pack(tmp_path, "broken", [])
+    (tmp_path / "examples" / "broken.json").write_text("{not json")
+
+    provider = ExampleProvider([tmp_path])
+    provider.get_examples("one")
+    assert set(provider._examples) == {"one"}
+
+    assert [ex["tool"] for ex in provider.search_examples("second")] == ["two"]
+    assert provider.get_examples("broken") == []
+
+
+def test_pack_cache_reparses_changed_files(tmp_path):
+    """Test the compiled cache serves unchanged packs and notices edits."""
+    pack = write_pack(tmp_path, "tool", [{"use_case": "a", "command": "tool a", "description": ""}])
+    cache_path = tmp_path / "cache" / "examples.marshal"
+
+    cache = PackCache(cache_path)
+    assert cache.parse(pack)[0]["command"] == "tool a"
+    cache.flush()
+    assert cache_path.exists()
+
+    # A fresh cache reads the stored entry instead of the file
+    stored = PackCache(cache_path)
+    assert stored.parse(pack)[0]["command"] == "tool a"
+    assert stored._dirty is False
+
+    pack.write_text(json.dumps([{"use_case": "a", "command": "tool a --changed", "description": ""}]))
+    assert stored.parse(pack)[0]["command"] == "tool a --changed"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,123 @@
+"""Tests for the per-project file index."""
+
+import os
+
+import pytest
+from src.file_index import FileIndex, ProjectIndexes, fuzzy_score, is_ignored, parse_ignore_file
+
+
+def make_tree(root, paths):
+    """Create empty files (and their directories) under root."""
+    for path in paths:
+        full = root / path
+        full.parent.mkdir(parents=True, exist_ok=True)
+        full.write_text("")
+
+
+def bump_mtime(path):
+    """Move a directory's mtime forward so a change is seen on coarse clocks."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_ignore_rules():
+    """Test gitignore anchoring, directory-only rules, ** and negation."""
+    rules = parse_ignore_file("*.log\n!keep.log\n/build\ncache/\ndocs/**/*.tmp\n")
+    assert is_ignored(rules, "a/b/debug.log", False)
+    assert not is_ignored(rules, "a/keep.log", False)
+    assert is_ignored(rules, "build", True)
+    assert not is_ignored(rules, "src/build", True)
+    assert is_ignored(rules, "src/cache", True)
+    assert not is_ignored(rules, "src/cache", False)
+    assert is_ignored(rules, "docs/x/y/z.tmp", False)
+
+    nested = parse_ignore_file("*.gen.py\n", "src/")
+    assert is_ignored(nested, "src/sub/a.gen.py", False)
+    assert not is_ignored(nested, "a.gen.py", False)
+
+
+def test_index_honors_ignore_files(tmp_path):
+    """Test ignored, hidden and .git entries are left out."""
+    make_tree(tmp_path, [
+        "src/server.py", "src/gen/out.py", "src/sub/deep.py",
+        "node_modules/pkg/index.js", ".git/HEAD", ".env", "README.md",
+    ])
+    (tmp_path / ".gitignore").write_text("node_modules/\n")
+    (tmp_path / "src" / ".ignore").write_text("gen/\n")
+
+    index = FileIndex(tmp_path)
+    paths, total = index.find()
+
+    assert paths == ["README.md", "src/server.py", "src/sub/deep.py"]
+    assert total == 3
+
+
+def test_find_filters(tmp_path):
+    """Test glob, extension, under and fuzzy ranking."""
+    make_tree(tmp_path, [
+        "src/server.py", "src/sub/very/deep.py", "tests/test_server.py", "src0/x.py", "docs/a.md",
+    ])
+    index = FileIndex(tmp_path)
+
+    assert index.find(extension="md")[0] == ["docs/a.md"]
+    assert index.find(glob="test_*.py")[0] == ["tests/test_server.py"]
+    assert index.find(glob="src/*.py")[0] == ["src/server.py"]
+    assert index.find(under="src")[0] == ["src/server.py", "src/sub/very/deep.py"]
+    assert index.find(query="srvpy")[0][0] == "src/server.py"
+    assert fuzzy_score("zzz", "src/server.py") is None
+
+
+def test_refresh_rescans_only_changed_directories(tmp_path):
+    """Test added and removed files are picked up by re-scanning their directory."""
+    make_tree(tmp_path, ["a/one.py", "b/two.py", "c/three.py"])
+    index = FileIndex(tmp_path, refresh_interval=0)
+    assert len(index.find()[0]) == 3
+
+    assert index.refresh() == 0
+    (tmp_path / "b" / "new.py").write_text("")
+    bump_mtime(tmp_path / "b")
+    assert index.refresh() == 1
+    assert "b/new.py" in index.find()[0]
+
+    (tmp_path / "c" / "three.py").unlink()
+    (tmp_path / "c").rmdir()
+    bump_mtime(tmp_path)
+    index.refresh()
+    assert index.find()[0] == ["a/one.py", "b/new.py", "b/two.py"]
+
+
+def test_scan_stops_at_max_files(tmp_path):
+    """Test directories past the file limit aren't scanned until there's room."""
+    make_tree(tmp_path, [f"{d}/f{n}.txt" for d in "ab" for n in range(10)] + ["c/x.txt", "c/y.txt"])
+    index = FileIndex(tmp_path, max_files=15, refresh_interval=0)
+
+    assert index.refresh(force=True) == 3
+    assert index.truncated
+    assert len(index) == 15
+    assert not index.find(under="c")[1]
+
+    for path in (tmp_path / "b").iterdir():
+        path.unlink()
+    (tmp_path / "b").rmdir()
+    bump_mtime(tmp_path)
+    index.refresh()
+    assert not index.truncated
+    assert index.find(under="c")[1] == 2
+
+
+def test_project_indexes_use_git_root(tmp_path):
+    """Test indexes are shared per git root and bounded in number."""
+    make_tree(tmp_path, ["repo/.git/HEAD", "repo/src/a.py", "other/b.py", "third/c.py"])
+    indexes = ProjectIndexes(max_projects=2)
+
+    index = indexes.get(tmp_path / "repo" / "src")
+    assert index.root == (tmp_path / "repo").resolve()
+    assert indexes.get(tmp_path / "repo") is index
+
+    indexes.get(tmp_path / "other")
+    indexes.get(tmp_path / "third")
+    assert indexes.get(tmp_path / "repo") is not index
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
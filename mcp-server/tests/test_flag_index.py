@@ -0,0 +1,106 @@
+"""Tests for the flag capability index."""
+
+import pytest
+from src.command_translator import CommandTranslator
+from src.flag_index import FlagIndex, parse_help_flags
+from src.tool_checker import ToolChecker
+
+RG_HELP = """\
+ripgrep 14.1.0
+
+USAGE:
+    rg [OPTIONS] PATTERN [PATH ...]
+
+OPTIONS:
+    -e PATTERN, --regexp=PATTERN   A pattern to search for.
+    -i, --ignore-case              Case insensitive search.
+    -l, --files-with-matches       Print the paths with at least one match.
+    -t TYPE, --type=TYPE           Only search files matching TYPE.
+    -g GLOB, --glob=GLOB           Include or exclude files.
+        --json                     Show search results in a JSON Lines format.
+    -c                             Only show the count of matching lines.
+
+This text mentions --not-a-flag in prose.
+"""
+
+
+@pytest.fixture
+def fake_rg(tmp_path, fake_bin, make_tool):
+    """An rg on PATH that counts how often its --help runs."""
+    (tmp_path / "help.txt").write_text(RG_HELP)
+    make_tool(
+        fake_bin,
+        "rg",
+        f'if [ "$1" = --version ]; then echo "ripgrep 14.1.0"; exit 0; fi\n'
+        f'echo run >> "{tmp_path}/calls"\ncat "{tmp_path}/help.txt"',
+    )
+    return tmp_path
+
+
+def test_parse_help_flags():
+    """Test flags come from option lines only."""
+    flags = parse_help_flags(RG_HELP)
+    assert {"-e", "--regexp", "-i", "--ignore-case", "-l", "--files-with-matches",
+            "-t", "--type", "-g", "--glob", "--json", "-c"} == flags
+
+
+def test_index_cached_on_disk(fake_rg):
+    """Test --help runs once per version, then the disk cache is used."""
+    cache_dir = fake_rg / "cache"
+    index = FlagIndex(ToolChecker(), cache_dir=cache_dir)
+    assert index.supports("rg", "--json")
+    assert (cache_dir / "rg-14.1.0.json").exists()
+
+    fresh = FlagIndex(ToolChecker(), cache_dir=cache_dir)
+    assert fresh.supports("rg", "-i")
+    assert (fake_rg / "calls").read_text().count("run") == 1
+
+
+def test_supports(fake_rg):
+    """Test bundles, values and unknown tools."""
+    index = FlagIndex(ToolChecker(), cache_dir=fake_rg / "cache")
+    assert index.supports("rg", "-il")
+    assert index.supports("rg", "--type=py")
+    assert index.supports("rg", "--count") is False
+    assert index.supports("rg", "-c")
+    assert index.supports("rg", "-iz") is False
+    assert index.supports("not-installed", "-x") is None
+
+
+def test_translator_validates_flags(fake_rg):
+    """Test translated flags are adjusted or reported."""
+    translator = CommandTranslator(flag_index=FlagIndex(ToolChecker(), cache_dir=fake_rg / "cache"))
+
+    result = translator.translate('grep --count "foo"')
+    assert result.modern == 'rg -c "foo"'
+    assert result.unsupported_flags == []
+
+    result = translator.translate('grep --color=always "foo"')
+    assert result.unsupported_flags == ["--color"]
+
+    result = translator.translate('grep -z "foo"')
+    assert result.unsupported_flags == ["-z"]
+
+    result = translator.translate('grep --include="*.py" "foo"')
+    assert result.modern == 'rg -g "*.py" "foo"'
+    assert result.unsupported_flags == []
+
+
+def test_translator_validates_wrapped_stages(fake_rg):
+    """Test stages run through xargs are checked, and quoted pipes don't split stages."""
+    translator = CommandTranslator(flag_index=FlagIndex(ToolChecker(), cache_dir=fake_rg / "cache"))
+
+    result = translator.translate('cat files | xargs -n 1 rg --count "a|b"')
+    assert result.modern == 'bat files | xargs -n 1 rg -c "a|b"'
+    assert result.unsupported_flags == []
+
+    result = translator.translate('cat files | xargs rg -z "a|b"')
+    assert result.unsupported_flags == ["-z"]
+
+    result = translator.translate('find . -name "*.py" -exec grep -c "a|b" {} +')
+    assert result.modern == 'fd -e py -X rg -c "a|b" {}'
+    assert result.unsupported_flags == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,89 @@
+"""Tests for the shell history analyzer."""
+
+import pytest
+from src.command_translator import CommandTranslator
+from src.history_analyzer import HistoryAnalyzer, iter_history, unmetafy
+
+
+def test_unmetafy():
+    """Test zsh meta bytes are decoded."""
+    # "é" is 0xC3 0xA9; zsh stores 0xA9 as META, 0x89
+    assert unmetafy(b"echo \xc3\x83\x89").decode() == "echo é"
+    assert unmetafy(b"plain") == b"plain"
+
+
+def test_unmetafy_only_zsh_history(tmp_path):
+    """Test UTF-8 containing 0x83 survives in bash history."""
+    command = "grep カタカナ file"
+    bash = tmp_path / ".bash_history"
+    bash.write_text(command + "\n")
+    assert [entry for entry, _ in iter_history(bash)] == [command]
+
+    zsh = tmp_path / ".zsh_history"
+    zsh.write_bytes(b"echo \xc3\x83\x89\n")
+    assert [entry for entry, _ in iter_history(zsh)] == ["echo é"]
+
+
+def test_iter_history_formats(tmp_path):
+    """Test extended, multi-line, bash timestamp and partial entries."""
+    history = tmp_path / "history"
+    history.write_bytes(
+        b": 1700000000:0;grep -r foo .\n"
+        b"#1700000001\n"
+        b"ls -la\n"
+        b": 1700000002:3;for f in *; do\\\necho $f\\\ndone\n"
+        b"partial"
+    )
+    entries = list(iter_history(history))
+
+    assert [command for command, _ in entries] == [
+        "grep -r foo .",
+        "ls -la",
+        "for f in *; do\necho $f\ndone",
+    ]
+    assert entries[-1][1] == history.stat().st_size - len(b"partial")
+
+
+def test_analyze_incremental(tmp_path):
+    """Test counts persist and only appended entries are read again."""
+    history = tmp_path / ".zsh_history"
+    history.write_text(": 1:0;grep -r foo .\n: 2:0;git status\n: 3:0;grep -r foo .\n")
+    calls = []
+    translator = CommandTranslator()
+
+    class CountingTranslator:
+        def translate(self, command):
+            calls.append(command)
+            return translator.translate(command)
+
+    analyzer = HistoryAnalyzer(CountingTranslator(), [history], tmp_path / "state")
+    first = analyzer.analyze()
+    assert first["entries"] == 3
+    assert first["translatable"] == 2
+    assert first["by_command"] == {"grep": 2}
+    assert first["by_rule"]["grep -r"] == 2
+    assert first["top"][0] == {"command": "grep -r foo .", "count": 2, "modern": "rg foo"}
+    # Memoized: translated once while scanning, once more for the top list
+    assert calls.count("grep -r foo .") == 2
+
+    with open(history, "a") as f:
+        f.write(": 4:0;cat a | grep b\n")
+    fresh = HistoryAnalyzer(translator, [history], tmp_path / "state")
+    second = fresh.analyze()
+    assert second["entries"] == 4
+    assert second["by_command"] == {"grep": 3, "cat": 1}
+
+
+def test_truncated_history_restarts(tmp_path):
+    """Test a rewritten (shorter) history is re-read from the start."""
+    history = tmp_path / ".bash_history"
+    history.write_text("grep -r foo .\nls -la\nls -la\n")
+    analyzer = HistoryAnalyzer(CommandTranslator(), [history], tmp_path / "state")
+    analyzer.analyze()
+
+    history.write_text("ls -la\n")
+    assert analyzer.analyze()["entries"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
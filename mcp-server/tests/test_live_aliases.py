@@ -0,0 +1,66 @@
+"""Tests for live shell alias snapshots."""
+
+import pytest
+from src.live_aliases import parse_alias_output, parse_function_output
+
+
+ZSH_ALIASES = """g=git
+ll='eza -la --icons'
+q='echo "it'\\''s"'
+"""
+
+BASH_ALIASES = """alias g='git'
+alias ll='eza -la --icons'
+"""
+
+ZSH_FUNCTIONS = """mkcd () {
+\tmkdir -p "$1" && cd "$1"
+}
+search () {
+\tif [ -n "$1" ]; then
+\t\trg "$1" | fzf
+\tfi
+}
+"""
+
+BASH_FUNCTIONS = """mkcd () 
+{ 
+    mkdir -p "$1" && cd "$1"
+}
+"""
+
+
+def test_parse_zsh_aliases():
+    """Test zsh name=value output, including escaped quotes."""
+    aliases = parse_alias_output(ZSH_ALIASES)
+
+    assert aliases["g"].command == "git"
+    assert aliases["ll"].command == "eza -la --icons"
+    assert aliases["q"].command == 'echo "it\'s"'
+
+
+def test_parse_bash_aliases():
+    """Test bash alias name='value' output."""
+    aliases = parse_alias_output(BASH_ALIASES)
+
+    assert set(aliases) == {"g", "ll"}
+    assert aliases["ll"].command == "eza -la --icons"
+
+
+def test_parse_zsh_functions():
+    """Test zsh functions output with nested braces."""
+    functions = parse_function_output(ZSH_FUNCTIONS)
+
+    assert set(functions) == {"mkcd", "search"}
+    assert "fzf" in functions["search"].body
+
+
+def test_parse_bash_functions():
+    """Test bash declare -f output with the brace on its own line."""
+    functions = parse_function_output(BASH_FUNCTIONS)
+
+    assert "mkdir -p" in functions["mkcd"].body
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
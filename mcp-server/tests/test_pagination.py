@@ -0,0 +1,57 @@
+"""Tests for cursor pagination."""
+
+import pytest
+from src.pagination import decode_cursor, encode_cursor, paginate, parse_fields
+
+
+KEYS = [f"a{i:03d}" for i in range(10)]
+
+
+def test_pages_cover_all_keys():
+    """Test walking every page returns each key exactly once."""
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = paginate(KEYS, cursor, limit=3)
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    assert seen == KEYS
+
+
+def test_cursor_stable_across_inserts():
+    """Test a cursor keeps its position when earlier keys are added."""
+    page, cursor = paginate(KEYS, limit=3)
+    grown = sorted(KEYS + ["a000a", "a001a"])
+    next_page, _ = paginate(grown, cursor, limit=3)
+
+    assert next_page == ["a003", "a004", "a005"]
+
+
+def test_predicate_filters():
+    """Test filtering while paginating."""
+    page, cursor = paginate(KEYS, limit=2, predicate=lambda key: int(key[1:]) % 2 == 0)
+
+    assert page == ["a000", "a002"]
+    assert decode_cursor(cursor) == "a002"
+
+
+def test_invalid_cursor():
+    """Test malformed cursors are rejected."""
+    with pytest.raises(ValueError):
+        paginate(KEYS, "!!!")
+    assert decode_cursor(encode_cursor("gs")) == "gs"
+
+
+def test_parse_fields():
+    """Test field selection parsing."""
+    allowed = ["name", "command", "category"]
+
+    assert parse_fields("name,bogus", allowed, allowed) == ["name"]
+    assert parse_fields(None, allowed, ["name"]) == ["name"]
+    assert parse_fields(["bogus"], allowed, ["name"]) == ["name"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
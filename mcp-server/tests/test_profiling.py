@@ -0,0 +1,82 @@
+"""Tests for per-request profiling."""
+
+import pstats
+import time
+
+import pytest
+from src.profiling import RequestProfiler
+
+
+def slow_handler(value):
+    """A handler that takes long enough to be sampled."""
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+    return value * 2
+
+
+def test_off_by_default(tmp_path):
+    """Test nothing is written unless a mode is set."""
+    profiler = RequestProfiler(output_dir=tmp_path)
+    assert profiler.run("tool", "t", slow_handler, 2) == 4
+    assert list(tmp_path.iterdir()) == []
+    assert profiler.status()["mode"] == "off"
+
+
+def test_cprofile_writes_pstats(tmp_path):
+    """Test cprofile mode writes loadable stats naming the handler."""
+    profiler = RequestProfiler("cprofile", tmp_path)
+    assert profiler.run("tool", "translate_command", slow_handler, 3) == 6
+
+    [path] = tmp_path.glob("*-tool-translate_command-*.pstats")
+    stats = pstats.Stats(str(path))
+    assert any(func[2] == "slow_handler" for func in stats.stats)
+
+
+def test_sample_writes_folded_stacks(tmp_path):
+    """Test sample mode writes flame graph stacks ending in the handler."""
+    profiler = RequestProfiler("sample", tmp_path)
+    profiler.run("resource", "simpleminded://aliases/all", slow_handler, 1)
+
+    [path] = tmp_path.glob("*-resource-simpleminded_aliases_all-*.folded")
+    lines = path.read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert stack.endswith("test_profiling:slow_handler")
+    assert int(count) > 0
+
+
+def test_one_in_n_and_handler_filter(tmp_path):
+    """Test only selected handlers are profiled, one request in every."""
+    profiler = RequestProfiler("cprofile", tmp_path, every=3, handlers={"check_tool"})
+    for _ in range(6):
+        profiler.run("tool", "check_tool", len, "x")
+        profiler.run("tool", "list_aliases", len, "x")
+
+    files = sorted(path.name for path in tmp_path.iterdir())
+    assert len(files) == 2
+    assert all("check_tool" in name for name in files)
+    assert len(profiler.status()["recent"]) == 2
+
+    with pytest.raises(ValueError):
+        profiler.configure("perf")
+
+
+@pytest.mark.parametrize("setting, value", [
+    ("SIMPLEMINDED_PROFILE", "cprofle"),
+    ("SIMPLEMINDED_PROFILE_EVERY", "ten"),
+])
+def test_from_env_warns_on_bad_settings(tmp_path, monkeypatch, caplog, setting, value):
+    """Test a mistyped setting leaves profiling off instead of raising."""
+    monkeypatch.setenv("SIMPLEMINDED_PROFILE", "sample")
+    monkeypatch.setenv("SIMPLEMINDED_PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv(setting, value)
+
+    profiler = RequestProfiler.from_env()
+    assert profiler.status()["mode"] == "off"
+    assert profiler.output_dir == tmp_path
+    assert "Profiling disabled" in caplog.text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
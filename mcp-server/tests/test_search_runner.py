@@ -0,0 +1,96 @@
+"""Tests for running rg and fd searches with output limits."""
+
+import json
+import sys
+import time
+
+import pytest
+from src.search_runner import SearchRunner
+
+
+def fake_tool(tmp_path, name, lines, then_sleep=0.0):
+    """Write an executable that prints lines, then optionally hangs."""
+    script = tmp_path / name
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys, time\n"
+        f"for line in {lines!r}:\n"
+        "    sys.stdout.write(line + '\\n')\n"
+        "    sys.stdout.flush()\n"
+        f"time.sleep({then_sleep})\n"
+    )
+    script.chmod(0o755)
+    return str(script)
+
+
+def rg_match(path, line_number, text):
+    """An rg --json match message."""
+    return json.dumps({
+        "type": "match",
+        "data": {
+            "path": {"text": path},
+            "lines": {"text": text + "\n"},
+            "line_number": line_number,
+            "submatches": [{"match": {"text": "foo"}, "start": text.index("foo"), "end": 0}],
+        },
+    })
+
+
+async def test_search_content_summarizes_matches(tmp_path):
+    """Test rg matches are counted per file with the first hits kept."""
+    lines = [json.dumps({"type": "begin", "data": {"path": {"text": "a.py"}}})]
+    lines += [rg_match("a.py", n, f"x = foo({n})") for n in range(1, 4)]
+    lines += [rg_match("b.py", 7, "foo")]
+    lines += [json.dumps({"type": "summary", "data": {}})]
+    rg = fake_tool(tmp_path, "rg", lines)
+
+    result = await SearchRunner(None).search_content(rg, "foo", hits_shown=2)
+
+    assert result["total_matches"] == 4
+    assert result["files"] == [{"path": "a.py", "matches": 3}, {"path": "b.py", "matches": 1}]
+    assert result["hits"] == [
+        {"path": "a.py", "line": 1, "column": 5, "text": "x = foo(1)"},
+        {"path": "a.py", "line": 2, "column": 5, "text": "x = foo(2)"},
+    ]
+    assert result["truncated"] is False
+    assert result["error"] is None
+
+
+async def test_search_content_stops_at_max_results(tmp_path):
+    """Test the search is killed once max_results matches were seen."""
+    lines = [rg_match("a.py", n, "foo") for n in range(1, 50)]
+    rg = fake_tool(tmp_path, "rg", lines, then_sleep=30)
+
+    start = time.monotonic()
+    result = await SearchRunner(None).search_content(rg, "foo", max_results=5)
+
+    assert time.monotonic() - start < 10
+    assert result["total_matches"] == 5
+    assert result["truncated"] is True
+    assert result["reason"] == "max_results"
+
+
+async def test_search_files_timeout_kills_child(tmp_path):
+    """Test a hanging fd is killed at the timeout with the paths seen so far."""
+    fd = fake_tool(tmp_path, "fd", ["src/a.py", "src/b.py"], then_sleep=30)
+
+    start = time.monotonic()
+    result = await SearchRunner(None, timeout=0.5).search_files(fd, extension="py")
+
+    assert time.monotonic() - start < 10
+    assert result["paths"] == ["src/a.py", "src/b.py"]
+    assert result["reason"] == "timeout"
+
+
+async def test_search_files_byte_budget(tmp_path):
+    """Test output beyond max_bytes isn't read."""
+    fd = fake_tool(tmp_path, "fd", [f"file{n:04d}.txt" for n in range(1000)])
+
+    result = await SearchRunner(None, max_bytes=100).search_files(fd)
+
+    assert result["reason"] == "max_bytes"
+    assert 0 < result["count"] < 20
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,100 @@
+"""Tests for server dispatch and shared state."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from src import server
+from src.alias_detector import AliasDetector
+
+
+def test_component_created_once():
+    """Test a component factory runs once even when threads race to it."""
+    calls = []
+
+    @server._component
+    def get_thing():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(get_thing())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_config_state_is_immutable():
+    """Test config state can't be modified in place."""
+    state = server.ConfigState(parser=None, merged=None, detector=None)
+    with pytest.raises(AttributeError):
+        state.detector = None
+
+
+async def test_blocking_calls_run_in_parallel():
+    """Test blocking handlers don't serialize on the event loop."""
+    def slow(value):
+        time.sleep(0.2)
+        return value
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(server.run_in_worker(slow, i) for i in range(4)))
+    elapsed = time.monotonic() - started
+
+    assert results == [0, 1, 2, 3]
+    assert elapsed < 0.6
+
+
+async def test_unknown_tool():
+    """Test unknown tools are reported, not raised."""
+    result = await server.call_tool("no_such_tool", {})
+    assert "Unknown tool" in result[0].text
+
+
+async def test_explain_alias_only_queries_live_shell_when_opted_in(monkeypatch):
+    """Test the live snapshot is used only for a config miss with the opt-in set."""
+    detector = AliasDetector("alias gs='git status'\n")
+    live_calls = []
+
+    class FakeSnapshot:
+        def get(self):
+            live_calls.append(1)
+            return AliasDetector("alias zz='zoxide query'\n")
+
+    monkeypatch.setattr(server, "get_alias_detector", lambda config_path=None: detector)
+    monkeypatch.setattr(server, "get_live_snapshot", FakeSnapshot)
+    monkeypatch.delenv("SIMPLEMINDED_LIVE_ALIASES", raising=False)
+
+    result = await server.call_tool("explain_alias", {"alias_name": "gs"})
+    assert '"git status"' in result[0].text
+    result = await server.call_tool("explain_alias", {"alias_name": "zz"})
+    assert "Alias not found" in result[0].text
+    assert live_calls == []
+
+    monkeypatch.setenv("SIMPLEMINDED_LIVE_ALIASES", "1")
+    await server.call_tool("explain_alias", {"alias_name": "gs"})
+    assert live_calls == []
+    result = await server.call_tool("explain_alias", {"alias_name": "zz"})
+    assert '"zoxide query"' in result[0].text
+    assert live_calls == [1]
+
+
+def test_alias_page_total_counts_the_category(monkeypatch):
+    """Test total counts only the aliases in the requested category."""
+    detector = AliasDetector("alias gs='git status'\nalias ga='git add'\nalias ll='eza -l'\n")
+    monkeypatch.setattr(server, "get_alias_detector", lambda config_path=None: detector)
+
+    page = server._alias_page({"category": "git", "limit": "1"})
+    assert page["total"] == 2
+    assert len(page["items"]) == 1 and page["next_cursor"]
+    assert server._alias_page({})["total"] == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,111 @@
+"""Tests for single-flight deduplication."""
+
+import threading
+import time
+
+import pytest
+from src.single_flight import SingleFlight, get_flight_stats
+
+
+def _run_concurrently(target, count=8):
+    """Start count threads on target and wait for them."""
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_calls_share_one_execution():
+    """Test callers arriving during a call get its result."""
+    flight = SingleFlight("test_share")
+    calls = []
+    results = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.1)
+        return "done"
+
+    _run_concurrently(lambda: results.append(flight.do("key", work)))
+
+    assert len(calls) == 1
+    assert results == ["done"] * 8
+    assert flight.get_stats() == {"executed": 1, "shared": 7, "in_flight": 0}
+
+
+def test_sequential_calls_run_again():
+    """Test nothing is cached after a call finishes."""
+    flight = SingleFlight("test_sequential")
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.get_stats()["shared"] == 0
+
+
+def test_exception_is_shared():
+    """Test waiting callers see the owner's exception."""
+    flight = SingleFlight("test_error")
+    errors = []
+
+    def fail():
+        time.sleep(0.1)
+        raise RuntimeError("boom")
+
+    def call():
+        try:
+            flight.do("key", fail)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    _run_concurrently(call, count=4)
+    assert errors == ["boom"] * 4
+    assert not flight.in_flight("key")
+
+
+def test_do_many_waits_on_running_keys():
+    """Test a batch only runs keys that aren't already in flight."""
+    flight = SingleFlight("test_many")
+    started = threading.Event()
+    batches = []
+
+    def single():
+        started.set()
+        time.sleep(0.1)
+        return "single"
+
+    def batch(keys):
+        batches.append(keys)
+        return {key: "batch" for key in keys}
+
+    thread = threading.Thread(target=flight.do, args=("rg", single))
+    thread.start()
+    started.wait()
+    results = flight.do_many(["rg", "fd", "bat"], batch)
+    thread.join()
+
+    assert batches == [["fd", "bat"]]
+    assert results == {"rg": "single", "fd": "batch", "bat": "batch"}
+
+
+def test_stats_registry():
+    """Test flights report stats by name."""
+    flight = SingleFlight("test_registry")
+    flight.do("key", lambda: None)
+    assert get_flight_stats()["test_registry"]["executed"] == 1
+
+
+def test_stats_added_up_per_name():
+    """Test instances sharing a name are summed, not overwritten."""
+    first = SingleFlight("test_same_name")
+    second = SingleFlight("test_same_name")
+    first.do("key", lambda: None)
+    second.do("key", lambda: None)
+    second.do("other", lambda: None)
+
+    stats = get_flight_stats()["test_same_name"]
+    assert stats["executed"] == 3
+    assert stats["instances"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,86 @@
+"""Tests for the parsed-config snapshot cache."""
+
+import os
+import threading
+
+import pytest
+from src.snapshot_cache import SnapshotCache, temp_path
+
+
+CONFIG = """
+alias gs='git status'
+alias cat='bat'
+
+mkcd() {
+    mkdir -p "$1" && cd "$1"
+}
+"""
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / ".zshrc"
+    path.write_text(CONFIG)
+    return path
+
+
+def test_warm_load_matches_parse(config, tmp_path):
+    """Test a cached snapshot equals a fresh parse."""
+    cache = SnapshotCache(tmp_path / "cache")
+    cold = cache.get_detector(config, config.read_text())
+    warm = cache.get_detector(config, config.read_text())
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert warm.parse_aliases() == cold.parse_aliases()
+    assert warm.parse_functions() == cold.parse_functions()
+    assert warm.get_alias("gs").source == str(config)
+
+
+def test_changed_content_rebuilds(config, tmp_path):
+    """Test editing the config invalidates the entry."""
+    cache = SnapshotCache(tmp_path / "cache")
+    cache.get_detector(config, config.read_text())
+    config.write_text(CONFIG + "alias gd='git diff'\n")
+    detector = cache.get_detector(config, config.read_text())
+
+    assert cache.misses == 2
+    assert detector.get_alias("gd") is not None
+
+
+def test_touch_keeps_entry(config, tmp_path):
+    """Test an mtime-only change is still a hit."""
+    cache = SnapshotCache(tmp_path / "cache")
+    cache.get_detector(config, config.read_text())
+    stat = config.stat()
+    os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    cache.get_detector(config, config.read_text())
+
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_corrupt_entry_ignored(config, tmp_path):
+    """Test a damaged cache file falls back to parsing."""
+    cache = SnapshotCache(tmp_path / "cache")
+    cache.get_detector(config, config.read_text())
+    for entry in (tmp_path / "cache").iterdir():
+        entry.write_bytes(b"garbage")
+
+    detector = cache.get_detector(config, config.read_text())
+    assert cache.misses == 2
+    assert detector.get_alias("cat").command == "bat"
+
+
+def test_temp_path_unique_per_thread(tmp_path):
+    """Test threads writing the same entry get different temporary files."""
+    entry = tmp_path / "entry.marshal"
+    names = [temp_path(entry)]
+    thread = threading.Thread(target=lambda: names.append(temp_path(entry)))
+    thread.start()
+    thread.join()
+
+    assert names[0] != names[1]
+    assert all(name.parent == tmp_path and name.name.startswith("entry.marshal.") for name in names)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,114 @@
+"""Tests for structured logging."""
+
+import io
+import json
+import logging
+
+import pytest
+from src.structured_logging import (
+    SampleFilter,
+    StructuredFormatter,
+    get_logger,
+    setup_logging,
+    short,
+)
+
+
+@pytest.fixture
+def restore_logging():
+    """Put back the root logger and category settings after a test."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    srcfile = logging._srcfile
+    yield
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+    logging._srcfile = srcfile
+    logging.logThreads = logging.logProcesses = logging.logMultiprocessing = True
+    for category in ("tools", "resources"):
+        logger = get_logger(category)
+        logger.setLevel(logging.NOTSET)
+        for log_filter in list(logger.filters):
+            logger.removeFilter(log_filter)
+
+
+def test_short_is_lazy_and_truncated():
+    """Test arguments are serialized only when rendered, and cut to length."""
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("rendered")
+
+    wrapped = short(Exploding())
+    assert wrapped.value is not None
+
+    text = str(short({"command": "x" * 1000}, limit=50))
+    assert text.startswith('{"command": "xxx')
+    assert text.endswith("...")
+    assert len(text) == 53
+
+
+def test_sample_filter_keeps_warnings():
+    """Test one in N info records pass, and every warning does."""
+    sample = SampleFilter(3)
+    info = logging.LogRecord("t", logging.INFO, "", 0, "m", (), None)
+    warning = logging.LogRecord("t", logging.WARNING, "", 0, "m", (), None)
+    assert [sample.filter(info) for _ in range(6)] == [True, False, False, True, False, False]
+    assert all(sample.filter(warning) for _ in range(3))
+
+
+def test_json_formatter_includes_extra_fields():
+    """Test extra= fields become keys of the JSON line."""
+    record = logging.makeLogRecord({
+        "name": "simpleminded.tools", "levelno": logging.INFO, "levelname": "INFO",
+        "msg": "Calling %s", "args": ("tool",), "tool": "translate_command",
+        "arguments": short({"command": "grep -r foo ."}),
+    })
+    entry = json.loads(StructuredFormatter(json_lines=True).format(record))
+    assert entry["message"] == "Calling tool"
+    assert entry["tool"] == "translate_command"
+    assert entry["arguments"] == '{"command": "grep -r foo ."}'
+
+    text = StructuredFormatter().format(record)
+    assert "simpleminded.tools: Calling tool tool=translate_command" in text
+
+
+def test_setup_logging_levels_and_sampling(restore_logging, monkeypatch):
+    """Test per-category levels and sampling through the queue listener."""
+    monkeypatch.setenv("SIMPLEMINDED_LOG_LEVELS", "resources=warning")
+    monkeypatch.setenv("SIMPLEMINDED_LOG_SAMPLE", "tools=2")
+    monkeypatch.setenv("SIMPLEMINDED_LOG_FORMAT", "json")
+    stream = io.StringIO()
+    listener = setup_logging(stream)
+
+    for n in range(4):
+        get_logger("tools").info("call %d", n)
+    get_logger("resources").info("hidden")
+    get_logger("resources").warning("shown")
+    listener.stop()
+
+    messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+    assert messages == ["call 0", "call 2", "shown"]
+
+
+def test_setup_logging_ignores_bad_settings(restore_logging, monkeypatch):
+    """Test mistyped settings are warned about and the defaults used."""
+    monkeypatch.setenv("SIMPLEMINDED_LOG_LEVEL", "verbose")
+    monkeypatch.setenv("SIMPLEMINDED_LOG_LEVELS", "tools=loud")
+    monkeypatch.setenv("SIMPLEMINDED_LOG_SAMPLE", "resources=often")
+    stream = io.StringIO()
+    listener = setup_logging(stream)
+    get_logger("tools").info("still logged")
+    listener.stop()
+
+    output = stream.getvalue()
+    assert logging.getLogger().level == logging.INFO
+    assert "SIMPLEMINDED_LOG_LEVEL=verbose" in output
+    assert "tools=loud" in output and "resources=often" in output
+    assert "still logged" in output
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
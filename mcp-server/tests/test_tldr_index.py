@@ -0,0 +1,118 @@
+"""Tests for reading tealdeer's page cache."""
+
+import os
+
+import pytest
+from src.example_provider import ExampleProvider
+from src.tldr_index import TldrIndex, parse_page
+
+TAR_PAGE = """# tar
+
+> Archiving utility.
+> More information: <https://www.gnu.org/software/tar>.
+
+- Create an archive from files:
+
+`tar cf {{path/to/target.tar}} {{path/to/file1}}`
+
+- Extract an archive verbosely:
+
+`tar {{[-x|--extract]}} {{[-v|--verbose]}} {{[-f|--file]}} {{path/to/source.tar}}`
+"""
+
+
+def write_page(tldr_dir, platform, name, text):
+    """Write a page into a tealdeer-style cache."""
+    page = tldr_dir / "tldr-pages" / "pages.en" / platform / f"{name}.md"
+    page.parent.mkdir(parents=True, exist_ok=True)
+    page.write_text(text)
+    return page
+
+
+def test_parse_page():
+    """Test descriptions, commands and placeholders are extracted."""
+    examples = parse_page("tar", TAR_PAGE)
+    assert examples == [
+        {
+            "use_case": "create_an_archive_from_files",
+            "command": "tar cf path/to/target.tar path/to/file1",
+            "description": "Create an archive from files",
+            "source": "tldr",
+        },
+        {
+            "use_case": "extract_an_archive_verbosely",
+            "command": "tar --extract --verbose --file path/to/source.tar",
+            "description": "Extract an archive verbosely",
+            "source": "tldr",
+        },
+    ]
+
+
+def test_index_packs_pages_and_reuses_index(tmp_path):
+    """Test pages are served from the pack, platform pages win, and the index is reused."""
+    tldr_dir, index_dir = tmp_path / "tealdeer", tmp_path / "index"
+    write_page(tldr_dir, "common", "tar", TAR_PAGE)
+    write_page(tldr_dir, "common", "free", "# free\n\n- Common:\n\n`free`\n")
+    write_page(tldr_dir, "linux", "free", "# free\n\n- Linux:\n\n`free -h`\n")
+    write_page(tldr_dir, "osx", "open", "# open\n\n- Open:\n\n`open .`\n")
+
+    index = TldrIndex(tldr_dir, index_dir, platform="linux")
+    assert index.commands() == ["free", "tar"]
+    assert index.get_examples("free")[0]["command"] == "free -h"
+    assert len(list(index_dir.glob("pages-*.bin"))) == 1
+
+    # Another process loads the stored index instead of reading the pages
+    (tldr_dir / "tldr-pages" / "pages.en" / "common" / "tar.md").write_text("# changed\n")
+    os.utime(tldr_dir / "tldr-pages" / "pages.en" / "common",
+             ns=(0, index._index.signature[0][1]))
+    fresh = TldrIndex(tldr_dir, index_dir, platform="linux")
+    assert fresh.get_examples("tar")[0]["command"].startswith("tar cf")
+
+
+def test_index_rebuilds_when_cache_changes(tmp_path):
+    """Test a new page is picked up once its directory changes."""
+    tldr_dir, index_dir = tmp_path / "tealdeer", tmp_path / "index"
+    common = write_page(tldr_dir, "common", "tar", TAR_PAGE).parent
+    index = TldrIndex(tldr_dir, index_dir, platform="linux")
+    assert index.page("git commit") is None
+    held = index._index
+
+    # A reader of the old index keeps its pack until it is a day old
+    old_pack, = index_dir.glob("pages-*.bin")
+    stale_pack = index_dir / "pages-0000000000000000.bin"
+    stale_pack.write_bytes(b"")
+    os.utime(stale_pack, (0, 0))
+
+    write_page(tldr_dir, "common", "git-commit", "# git commit\n\n- Commit:\n\n`git commit -m {{message}}`\n")
+    stat = os.stat(common)
+    os.utime(common, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert index.get_examples("git commit")[0]["command"] == "git commit -m message"
+    packs = set(index_dir.glob("pages-*.bin"))
+    assert len(packs) == 2 and old_pack in packs and stale_pack not in packs
+    assert index.search("COMMIT")[0]["tool"] == "git-commit"
+    # An index taken before the rebuild still reads its own pack
+    assert held.read(*held.offsets["tar"]).startswith(b"# tar")
+
+
+def test_provider_falls_back_to_tldr(tmp_path):
+    """Test commands without a pack use tldr, and search includes tldr hits."""
+    tldr_dir = tmp_path / "tealdeer"
+    write_page(tldr_dir, "common", "tar", TAR_PAGE)
+    write_page(tldr_dir, "common", "fd", "# fd\n\n- Find python files:\n\n`fd -e py`\n")
+    packs = tmp_path / "packs" / "examples"
+    packs.mkdir(parents=True)
+    (packs / "fd.json").write_text('[{"use_case": "py", "command": "fd -e py", "description": "Find python files"}]')
+
+    provider = ExampleProvider([tmp_path / "packs"], tldr=TldrIndex(tldr_dir, tmp_path / "index"))
+    assert provider.get_examples("tar")[1]["use_case"] == "extract_an_archive_verbosely"
+    assert provider.get_all_tools() == ["fd"]
+
+    results = provider.search_examples("archive")
+    assert [r["tool"] for r in results] == ["tar", "tar"]
+    # Curated tools aren't repeated from tldr
+    assert [r.get("source") for r in provider.search_examples("python")] == [None]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
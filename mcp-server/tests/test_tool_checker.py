@@ -0,0 +1,119 @@
+"""Tests for tool checker."""
+
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+import pytest
+from src.tool_checker import ToolChecker
+
+
+@pytest.fixture
+def fake_path(fake_bin, make_tool, monkeypatch):
+    """PATH containing only fake tools plus the system shell utilities."""
+    make_tool(fake_bin, "bat", "echo 'bat 0.24.0 (fc954a4)'")
+    make_tool(fake_bin, "jq", "echo 'jq-1.7.1'")
+    make_tool(fake_bin, "fzf", "exit 1")
+    make_tool(fake_bin, "rg", "sleep 30")
+    monkeypatch.setattr(
+        ToolChecker,
+        "SIMPLEMINDED_TOOLS",
+        {name: ToolChecker.SIMPLEMINDED_TOOLS[name] for name in ["bat", "jq", "fzf", "rg", "zellij"]},
+    )
+    return fake_bin
+
+
+def test_batched_probe(fake_path):
+    """Test one batched probe resolves paths and versions."""
+    checker = ToolChecker(probe_timeout=0.5)
+    results = checker._probe_batch(["bat", "jq", "fzf", "zellij"])
+
+    assert results["bat"].installed
+    assert results["bat"].version == "0.24.0"
+    assert results["bat"].path == str(fake_path / "bat")
+    assert results["jq"].version == "1.7"
+    assert results["fzf"].installed and results["fzf"].version is None
+    assert not results["zellij"].installed
+    assert results["zellij"].brew_package == "zellij"
+
+
+def test_hanging_tool_falls_back(fake_path, monkeypatch):
+    """Test a tool killed by the watchdog is re-probed individually."""
+    checker = ToolChecker(probe_timeout=0.5)
+    fallback = []
+    original = ToolChecker._check_uncached
+
+    def check_uncached(self, tool_name):
+        fallback.append(tool_name)
+        return original(self, tool_name)
+
+    monkeypatch.setattr(ToolChecker, "_get_version", lambda self, name, config: None)
+    monkeypatch.setattr(ToolChecker, "_check_uncached", check_uncached)
+    results = checker._probe_batch(["bat", "rg"])
+
+    assert fallback == ["rg"]
+    assert results["rg"].installed
+    assert results["bat"].version == "0.24.0"
+
+
+def test_watchdog_fallback_leaves_no_sleep(fake_path, tmp_path_factory, monkeypatch):
+    """Test that without `timeout` the watchdog cuts off hung tools and cleans up its sleep."""
+    pgrep = shutil.which("pgrep")
+    if not pgrep:
+        pytest.skip("pgrep not available")
+    utils = tmp_path_factory.mktemp("utils")
+    for name in ("sh", "sleep"):
+        os.symlink(shutil.which(name), utils / name)
+    monkeypatch.setenv("PATH", f"{fake_path}{os.pathsep}{utils}")
+    monkeypatch.setattr(ToolChecker, "_check_uncached", lambda self, name: None)
+
+    checker = ToolChecker(probe_timeout=0.75)
+    started = time.monotonic()
+    results = checker._probe_batch(["bat", "rg"])
+
+    assert results["bat"].version == "0.24.0"
+    assert results["rg"] is None
+    assert time.monotonic() - started < 5
+    leftover = subprocess.run([pgrep, "-f", "sleep 0.75"], capture_output=True, text=True)
+    assert leftover.stdout == ""
+
+
+def test_batched_matches_per_tool(fake_path, monkeypatch):
+    """Test batched and per-tool checks agree."""
+    monkeypatch.setattr(
+        ToolChecker,
+        "SIMPLEMINDED_TOOLS",
+        {name: ToolChecker.SIMPLEMINDED_TOOLS[name] for name in ["bat", "jq", "fzf", "zellij"]},
+    )
+    batched = ToolChecker(batch_probe=True).check_all_tools()
+    single = ToolChecker(batch_probe=False).check_all_tools()
+
+    assert batched == single
+
+
+def test_concurrent_checks_probe_once(fake_path, monkeypatch):
+    """Test concurrent checks of one tool share a single probe."""
+    checker = ToolChecker()
+    probes = []
+    original = ToolChecker._get_command_path
+
+    def get_command_path(self, command):
+        probes.append(command)
+        time.sleep(0.1)
+        return original(self, command)
+
+    monkeypatch.setattr(ToolChecker, "_get_command_path", get_command_path)
+    threads = [threading.Thread(target=checker.check_tool, args=("bat",)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert probes == ["bat"]
+    assert checker._flight.get_stats()["shared"] == 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
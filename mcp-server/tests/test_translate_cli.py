@@ -0,0 +1,134 @@
+"""Tests for the script translation CLI."""
+
+import io
+
+import pytest
+from src.translate_cli import is_script, run, translate_file, translate_line
+
+SCRIPT = """\
+#!/bin/bash
+# grep -r in a comment stays
+grep -r "foo" . | wc -l
+  ls -a
+find . -name "*.py" \\
+  -type f
+grep -Z x
+"""
+
+
+def test_translate_line_keeps_indentation():
+    """Test indentation and trailing comments survive."""
+    new, rules, skipped = translate_line('    grep -ri "x" .  # search\n', False)
+    assert new == '    rg -uu -i "x" . # search\n'
+    assert rules == ["grep", "grep -r", "grep -i"]
+    assert not skipped
+
+
+def test_makefile_recipes_only(tmp_path):
+    """Test only recipe lines of a Makefile are translated."""
+    makefile = tmp_path / "Makefile"
+    makefile.write_text('SRC = $(shell find . -name "*.c")\nall:\n\t@grep -rn TODO src\n')
+
+    result = translate_file(str(makefile))
+    assert result.changed_lines == 1
+    assert "+\t@rg -uu -n TODO src" in result.diff
+
+
+def test_script_translation(tmp_path):
+    """Test scripts are diffed; continuations and unknown flags are skipped."""
+    script = tmp_path / "run.sh"
+    script.write_text(SCRIPT)
+
+    result = translate_file(str(script))
+    assert result.changed_lines == 2
+    assert len(result.skipped) == 2
+    assert '+rg -uu "foo" . | wc -l' in result.diff
+    # Aliases aren't expanded in scripts
+    assert "+  eza -a" in result.diff
+    assert script.read_text() == SCRIPT
+
+
+def test_in_place(tmp_path):
+    """Test --in-place rewrites the file and keeps its mode."""
+    script = tmp_path / "run.sh"
+    script.write_text("cat -s file\n")
+    script.chmod(0o755)
+
+    translate_file(str(script), in_place=True)
+    assert script.read_text() == "bat -pp --squeeze-blank file\n"
+    assert script.stat().st_mode & 0o777 == 0o755
+
+
+def test_redirections_and_end_of_options_left_alone(tmp_path):
+    """Test lines with redirections or -- are skipped, not rewritten."""
+    script = tmp_path / "run.sh"
+    text = "grep foo f >/dev/null 2>&1\ngrep -- -v file\necho done > log\ngrep -r foo .\n"
+    script.write_text(text)
+
+    result = translate_file(str(script), in_place=True)
+    assert result.changed_lines == 1
+    assert len(result.skipped) == 2
+    assert script.read_text() == text.replace("grep -r foo .", "rg -uu foo .")
+
+
+def test_heredoc_bodies_are_not_translated(tmp_path):
+    """Test lines inside a heredoc are copied until its delimiter."""
+    script = tmp_path / "run.sh"
+    script.write_text(
+        "cat <<'EOF' > notes.txt\ngrep -r foo .\nEOF\n"
+        "\tcat <<-END\n\tls -a\n\tEND\n"
+        "ls -a\n"
+    )
+
+    result = translate_file(str(script))
+    assert result.changed_lines == 1
+    added = [line for line in result.diff.splitlines() if line.startswith("+") and not line.startswith("+++")]
+    assert added == ["+eza -a"]
+
+
+def test_only_exact_translations_are_written(tmp_path, capsys):
+    """Test fd/rg search what find/grep would, and approximations are listed."""
+    script = tmp_path / "run.sh"
+    script.write_text(
+        "find . -mtime +1 -name build\n"
+        "ls -l\n"
+        "find . -name '*.log' -exec gzip {} \\;\n"
+    )
+
+    run([str(script)], in_place=True, jobs=1)
+    lines = script.read_text().splitlines()
+    assert lines[0] == "fd --hidden --no-ignore --changed-before 2d -g build ."
+    assert lines[1:] == ["ls -l", "find . -name '*.log' -exec gzip {} \\;"]
+    err = capsys.readouterr().err
+    assert f"{script}:2: left as is: ls -l" in err
+    assert f"{script}:3: left as is" in err
+
+
+def test_is_script(tmp_path):
+    """Test scripts are recognized by name, suffix or shebang."""
+    (tmp_path / "tool").write_text("#!/usr/bin/env bash\n")
+    (tmp_path / "notes").write_text("grep -r x .\n")
+    assert is_script(tmp_path / "tool")
+    assert not is_script(tmp_path / "notes")
+    assert is_script(tmp_path / "Makefile")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_streams_diffs_and_counts(tmp_path, jobs):
+    """Test a tree is translated with rule hit counts, serially or in a pool."""
+    for i in range(5):
+        (tmp_path / f"s{i}.sh").write_text("grep -r foo .\nls -a\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "x.sh").write_text("grep -r foo .\n")
+
+    out = io.StringIO()
+    files, lines, counts = run([str(tmp_path)], jobs=jobs, out=out)
+
+    assert (files, lines) == (5, 10)
+    assert counts["grep -r"] == 5
+    assert counts["ls -a"] == 5
+    assert out.getvalue().count("+rg -uu foo .") == 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
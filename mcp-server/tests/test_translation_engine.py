@@ -0,0 +1,108 @@
+"""Tests for the flag-level translation engine."""
+
+import pytest
+from src.command_translator import CommandTranslator
+from src.translation_engine import compile_rule, tokenize
+
+
+@pytest.fixture
+def translator():
+    """A translator without flag validation."""
+    return CommandTranslator()
+
+
+def test_tokenize_keeps_raw_text():
+    """Test tokens keep their quoting and operators are split out."""
+    tokens = tokenize('grep -e "a b" it\\\'s|wc -l')
+    assert [t.raw for t in tokens] == ["grep", "-e", '"a b"', "it\\'s", "|", "wc", "-l"]
+    assert tokens[2].value == "a b"
+    assert tokens[3].value == "it's"
+    assert tokens[4].operator
+
+
+def test_tokenize_keeps_redirections_whole():
+    """Test &-redirections aren't split into background operators."""
+    tokens = tokenize("grep foo f >/dev/null 2>&1 &>>log | less")
+    assert [t.raw for t in tokens] == ["grep", "foo", "f", ">/dev/null", "2>&1", "&>>log", "|", "less"]
+    assert [t.redirect for t in tokens[3:6]] == [">", "2>&", "&>>"]
+    assert [t.raw for t in tokenize("a>b >& c")] == ["a", ">b", ">&", "c"]
+
+
+def test_tokenize_unterminated_quote():
+    """Test an unterminated quote is rejected."""
+    with pytest.raises(ValueError):
+        tokenize("grep 'oops")
+
+
+def test_compile_rule_arity():
+    """Test templates compile to words, arity and converters."""
+    assert compile_rule("-r", "").words == ()
+    assert compile_rule("-A", "-A {}").arity == 1
+    assert compile_rule("-mtime", "{days}").converter == "days"
+    with pytest.raises(ValueError):
+        compile_rule("-x", "{nope}")
+
+
+@pytest.mark.parametrize("command, modern", [
+    ('grep -rin "TODO" src', 'rg -i -n "TODO" src'),
+    ("grep -A3 foo file", "rg -A 3 foo file"),
+    ('grep -e foo -r .', "rg -e foo"),
+    ("grep --exclude-dir=node_modules -r foo .", "rg -g '!node_modules/' foo"),
+    ('grep -h "x" a b', 'rg --no-filename "x" a b'),
+    ("find . -type f -mtime -1", "fd -t f --changed-within 1d"),
+    ("find . -mmin +30", "fd --changed-before 30min"),
+    ("find . -mtime +1", "fd --changed-before 2d"),
+    ("find src -size +10M", "fd -S +10mi . src"),
+    ('find . -iname "readme*"', 'fd -i -g "readme*"'),
+    ("find . -maxdepth 2 -type d -name build", "fd -d 2 -t d -g build"),
+    ('find . -name "*.js" -exec grep -l "TODO" {} +', 'fd -e js -X rg --files-with-matches "TODO" {}'),
+    ("ls -lt", "eza -l --sort=modified --reverse"),
+    ("ls -ltr", "eza -l --sort=modified"),
+    ("ls -S", "eza --sort=size --reverse"),
+    ("grep --color foo file.txt", "rg --color auto foo file.txt"),
+    ("grep --color=never foo", "rg --color never foo"),
+    ("ls -la ~/src", "ll ~/src"),
+    ("cat -n a.py", "bat --number a.py"),
+    ("grep foo f 2>&1 | less", "rg foo f 2>&1 | less"),
+    ("grep -rn TODO . > out 2>&1", "rg -n TODO > out 2>&1"),
+    ("grep -- -v file", "rg -- -v file"),
+    ("cat -- -file", "bat -- -file"),
+    ("find . -type f -a -name x", "fd -t f -g x"),
+])
+def test_flag_translation(translator, command, modern):
+    """Test flags are mapped one by one."""
+    assert translator.translate(command).modern == modern
+
+
+def test_pipeline_stages(translator):
+    """Test each stage is translated and others are kept verbatim."""
+    result = translator.translate("cat app.log | grep -v DEBUG | sort -u && ls -la")
+    assert result.modern == "bat app.log | rg -v DEBUG | sort -u && ll"
+    assert result.tool == "bat"
+    assert result.rules == ["cat", "grep", "grep -v", "ls", "ls ll"]
+
+
+@pytest.mark.parametrize("command", [
+    "find . -name foo -o -name bar",
+    'find . ! -name "*.py"',
+    "find . -not -name x",
+    "find . \\( -name a \\)",
+    'find . -name "*.pyc" -delete',
+    "grep foo >",
+    "find . -mtime 3",
+    "find . -size 10k",
+])
+def test_untranslatable_commands(translator, command):
+    """Test commands whose meaning fd/rg can't keep get no translation."""
+    assert translator.translate(command) is None
+
+
+def test_unknown_flags_reported(translator):
+    """Test flags without a mapping are kept and reported."""
+    result = translator.translate("grep -Zi foo")
+    assert result.modern == "rg -Z -i foo"
+    assert result.unsupported_flags == ["-Z"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])